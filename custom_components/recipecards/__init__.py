@@ -2,22 +2,80 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.components import frontend
 from pathlib import Path
 import json
+import logging
 import shutil
 
-from .const import DOMAIN
-from .storage import RecipeStorage
+from .const import (
+    CONF_PERFORMANCE_METRICS,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_ENGINE,
+    DATA_PERFORMANCE_SENSOR,
+    DATA_REMOVED_REVISION,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_STORAGE_ENGINE,
+    DOMAIN,
+    UPDATE_COOLDOWN,
+)
+from .images import ImageStore
+from .metrics import async_disable_metrics, async_enable_metrics, measure
+from .storage import RecipeStorage, next_revision
 from .services import async_register_services, async_remove_services
 from .models import Recipe
+from .sensor import async_move_performance_sensor
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import slugify
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
+_LOGGER = logging.getLogger(__name__)
+
+
+def _push_updates(
+    hass: HomeAssistant, storage: RecipeStorage, coordinator: DataUpdateCoordinator
+) -> Debouncer:
+    """Hand an entry's changes straight to its own coordinator.
+
+    The collection is already in memory, so nothing is re-read from disk.
+    The first change is pushed at once and any further ones within
+    UPDATE_COOLDOWN are merged into a single update.
+    """
+
+    @callback
+    def _push() -> None:
+        with measure(hass, "coordinator_refresh"):
+            coordinator.async_set_updated_data(storage.snapshot())
+
+    debouncer = Debouncer(hass, _LOGGER, cooldown=UPDATE_COOLDOWN, immediate=True, function=_push)
+    storage.set_update_callback(debouncer.async_call)
+    return debouncer
+
+
+def _get_image_store(hass: HomeAssistant) -> ImageStore:
+    """Return the image store shared by all entries, creating it on first use."""
+    images = hass.data[DOMAIN].get("images")
+    if images is None:
+        images = ImageStore(hass)
+
+        def _referenced_image_ids() -> set[str] | None:
+            # Only sweep when every entry's recipes are in memory; otherwise
+            # blobs owned by an entry that is still loading would look orphaned
+            referenced: set[str] = set()
+            for config_entry in hass.config_entries.async_entries(DOMAIN):
+                entry_data = hass.data[DOMAIN].get(config_entry.entry_id)
+                if not isinstance(entry_data, dict) or not entry_data["storage"].loaded:
+                    return None
+                referenced |= entry_data["storage"].image_ids()
+            return referenced
+
+        images.set_reference_provider(_referenced_image_ids)
+        hass.data[DOMAIN]["images"] = images
+    return images
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -28,15 +86,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not hass.data[DOMAIN].get("api_registered"):
         # Lazy import to avoid import-time side effects during config flow discovery
         from .api import register_api  # noqa: WPS433 (local import by design)
+        from .views import register_views  # noqa: WPS433
         register_api(hass)
+        register_views(hass)
         hass.data[DOMAIN]["api_registered"] = True
     
+    if entry.options.get(CONF_PERFORMANCE_METRICS):
+        async_enable_metrics(hass)
+
     # Initialize storage
-    storage = RecipeStorage(hass, entry.entry_id)
+    storage = RecipeStorage(
+        hass,
+        entry.entry_id,
+        save_delay=entry.options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY),
+        images=_get_image_store(hass),
+        engine=entry.options.get(CONF_STORAGE_ENGINE, DEFAULT_STORAGE_ENGINE),
+    )
     
     async def async_update_data():
         """Fetch data from storage."""
-        return await storage.async_load_recipes()
+        with measure(hass, "coordinator_refresh"):
+            await storage.async_load_recipes()
+            return storage.snapshot()
 
     coordinator = DataUpdateCoordinator(
         hass,
@@ -50,13 +121,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id] = {
         "storage": storage,
         "coordinator": coordinator,
+        CONF_PERFORMANCE_METRICS: bool(entry.options.get(CONF_PERFORMANCE_METRICS)),
     }
 
-    # Let storage trigger coordinator refreshes on any write
-    storage.set_update_callback(coordinator.async_request_refresh)
+    push_updates = _push_updates(hass, storage, coordinator)
+    entry.async_on_unload(push_updates.async_shutdown)
     
     await coordinator.async_config_entry_first_refresh()
 
+    # Write any coalesced edits before Home Assistant shuts down
+    async def _async_flush_on_stop(_event: Event) -> None:
+        await storage.async_flush()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop)
+    )
+
+    # Sweep image blobs left behind by deleted recipes once all entries are up
+    hass.data[DOMAIN]["images"].async_schedule_collect()
+
     # No default recipe creation; entries represent empty sections
     
     # Register services
@@ -185,23 +268,43 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        # Persist edits still waiting on the save delay and close the engine
+        await entry_data["storage"].async_close()
+        # Clients syncing with since_revision must drop this entry's recipes
+        hass.data[DOMAIN][DATA_REMOVED_REVISION] = next_revision()
+        # Metrics stay on while any loaded entry asks for them
+        collecting = [
+            entry_id for entry_id, v in hass.data[DOMAIN].items()
+            if isinstance(v, dict) and v.get(CONF_PERFORMANCE_METRICS)
+        ]
+        if not collecting:
+            async_disable_metrics(hass)
+        if hass.data[DOMAIN].get(DATA_PERFORMANCE_SENSOR) == entry.entry_id:
+            # Hand the performance sensor to an entry still collecting metrics
+            del hass.data[DOMAIN][DATA_PERFORMANCE_SENSOR]
+            async_move_performance_sensor(hass, collecting)
         # Remove services if this is the last entry
-        if not hass.data[DOMAIN]:
+        if not any(isinstance(v, dict) and "storage" in v for v in hass.data[DOMAIN].values()):
             await async_remove_services(hass)
+            images = hass.data[DOMAIN].pop("images", None)
+            if images is not None:
+                images.async_cancel_collect()
     return unload_ok
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Recipe Cards domain.
 
-    Registers the WebSocket API and prepares the domain storage.
+    Registers the WebSocket API and HTTP views and prepares the domain storage.
     """
     hass.data.setdefault(DOMAIN, {})
     if not hass.data[DOMAIN].get("api_registered"):
         # Lazy import to avoid import-time side effects during config flow discovery
         from .api import register_api  # noqa: WPS433 (local import by design)
-        # Register WebSocket API commands (idempotent via our flag)
+        from .views import register_views  # noqa: WPS433
+        # Register WebSocket API commands and HTTP views (idempotent via our flag)
         register_api(hass)
+        register_views(hass)
         hass.data[DOMAIN]["api_registered"] = True
     return True
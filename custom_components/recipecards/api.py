@@ -1,12 +1,27 @@
 """WebSocket API for Recipe Cards integration."""
+import asyncio
+import base64
 import logging
-from typing import Any
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from functools import wraps
+from typing import Any, Optional
 import voluptuous as vol
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.components import websocket_api
-from .const import DOMAIN
+from homeassistant.components.websocket_api.messages import construct_result_message
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+from .const import DATA_REMOVED_REVISION, DATA_RESPONSE_CACHE, DOMAIN, SIGNAL_RECIPES_CHANGED
+from .images import IMAGE_SIZES, image_id_from_ref
+from .metrics import get_metrics
 from .models import Recipe
-from .services import cleanup_recipe_entities
+from .pantry import DEFAULT_PANTRY_LIMIT
+from .services import async_pantry_matches, cleanup_recipe_entities
+from .storage import CHANGE_REMOVED, CHANGE_RESET, RecipeChange, RecipeStorage, locate_recipe
+from .views import SIGN_EXPIRATION, async_signed_image_url
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,53 +31,349 @@ RECIPE_ADD_TYPE = "recipecards/recipe_add"
 RECIPE_UPDATE_TYPE = "recipecards/recipe_update"
 RECIPE_DELETE_TYPE = "recipecards/recipe_delete"
 RECIPE_SEARCH_TYPE = "recipecards/recipe_search"
+RECIPE_BATCH_TYPE = "recipecards/recipe_batch"
+WHAT_CAN_I_MAKE_TYPE = "recipecards/what_can_i_make"
+SUBSCRIBE_TYPE = "recipecards/subscribe"
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 1000
 
-async def _update_coordinator(hass: HomeAssistant) -> None:
-    """Update the data coordinator to refresh sensors."""
-    for entry_id, entry_data in hass.data[DOMAIN].items():
-        if isinstance(entry_data, dict) and "coordinator" in entry_data:
-            await entry_data["coordinator"].async_request_refresh()
+# Encoded recipe_list/recipe_search replies kept, least recently used out
+RESPONSE_CACHE_SIZE = 32
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Replies carry signed image URLs; reuse them only while those stay fresh
+RESPONSE_CACHE_TTL = SIGN_EXPIRATION.total_seconds() / 2
 
-def _all_storages(hass: HomeAssistant):
-    """Yield all RecipeStorage instances for this domain."""
+BATCH_ADD = "add"
+BATCH_UPDATE = "update"
+BATCH_DELETE = "delete"
+
+
+def _image_urls(hass: HomeAssistant, image_id: str, refresh_token_id: Optional[str]) -> dict[str, str]:
+    """Return the ``image``/``image_<size>`` fields for a stored image."""
+    urls = {"image": async_signed_image_url(hass, image_id, refresh_token_id=refresh_token_id)}
+    for size in IMAGE_SIZES:
+        urls[f"image_{size}"] = async_signed_image_url(hass, image_id, size, refresh_token_id)
+    return urls
+
+def _attach_image_urls(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, items: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Replace stored-image references in response dicts with signed URLs.
+
+    ``image`` points at the original and ``image_thumb``/``image_card`` at
+    the resized variants, all served by the cached image view.
+    """
+    refresh_token_id = getattr(connection, "refresh_token_id", None)
+    for d in items:
+        image_id = image_id_from_ref(d.get("image"))
+        if image_id is not None:
+            d.update(_image_urls(hass, image_id, refresh_token_id))
+    return items
+
+def _all_storages(hass: HomeAssistant, entry_id: Optional[str] = None):
+    """Yield all RecipeStorage instances for this domain, optionally for one entry."""
     if DOMAIN not in hass.data:
         return []
     storages = []
-    for entry_id, entry_data in hass.data[DOMAIN].items():
+    for storage_entry_id, entry_data in hass.data[DOMAIN].items():
+        if entry_id is not None and storage_entry_id != entry_id:
+            continue
         if isinstance(entry_data, dict) and "storage" in entry_data:
-            storages.append((entry_id, entry_data["storage"]))
+            storages.append((storage_entry_id, entry_data["storage"]))
     return storages
 
+def _locate(hass: HomeAssistant, recipe_id: str) -> Optional[tuple[str, RecipeStorage]]:
+    """Return (entry_id, storage) holding a recipe, via the domain-wide locator."""
+    entry_id = locate_recipe(hass, recipe_id)
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id) if entry_id is not None else None
+    if isinstance(entry_data, dict) and "storage" in entry_data and entry_data["storage"].contains(recipe_id):
+        return entry_id, entry_data["storage"]
+    return None
+
+def _entry_title(hass: HomeAssistant, entry_id: str) -> Optional[str]:
+    try:
+        ce = hass.config_entries.async_get_entry(entry_id)
+        return getattr(ce, "title", None)
+    except Exception:  # noqa: BLE001
+        return None
+
+def _encode_cursor(payload: dict[str, Any]) -> str:
+    """Return an opaque page cursor."""
+    return base64.urlsafe_b64encode(json_bytes(payload)).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a cursor made by ``_encode_cursor``; raise ValueError if malformed."""
+    payload = json_loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+def _project(items: list[dict[str, Any]], fields: Optional[list[str]]) -> list[dict[str, Any]]:
+    """Keep only the requested fields, plus ``id`` and ``_``-prefixed metadata."""
+    if fields is None:
+        return items
+    keep = set(fields) | {"id"}
+    return [{k: v for k, v in d.items() if k in keep or k.startswith("_")} for d in items]
+
+def _recipe_data(recipe: Recipe, entry_id: str, entry_title: Optional[str]) -> dict[str, Any]:
+    data = recipe.to_dict()
+    data["_entry_id"] = entry_id
+    if entry_title:
+        data["_entry_title"] = entry_title
+    return data
+
+def _is_paged(msg: dict[str, Any]) -> bool:
+    """Return True if the client asked for the paged response shape."""
+    return "limit" in msg or "cursor" in msg
+
+class _ResponseCache:
+    """Encoded list/search replies by request, least recently used first."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: tuple, payload: bytes) -> None:
+        if len(payload) > RESPONSE_CACHE_MAX_BYTES:
+            return
+        self._drop(key)
+        self._entries[key] = (payload, time.monotonic() + RESPONSE_CACHE_TTL)
+        self._size += len(payload)
+        while len(self._entries) > RESPONSE_CACHE_SIZE or self._size > RESPONSE_CACHE_MAX_BYTES:
+            _, (dropped, _) = self._entries.popitem(last=False)
+            self._size -= len(dropped)
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+def _response_cache(hass: HomeAssistant) -> _ResponseCache:
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_RESPONSE_CACHE, _ResponseCache())
+
+def _response_key(
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+    storages: list[tuple[str, RecipeStorage]],
+    titles: dict[str, Optional[str]],
+) -> tuple:
+    """Key a reply by its parameters, the collections' revisions and the client.
+
+    Image URLs are signed for the client's refresh token, so replies are
+    not shared between clients. Search results are ranked only once the
+    search index is built, which does not change the revision, so index
+    readiness is part of the key.
+    """
+    params = tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in msg.items() if k != "id"
+    ))
+    revisions = tuple(
+        (entry_id, storage.revision, storage.index_ready, titles[entry_id]) for entry_id, storage in storages
+    )
+    return params, revisions, getattr(connection, "refresh_token_id", None)
+
+def _encode_recipes(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+    rows: list[tuple[str, RecipeStorage, Recipe, Optional[dict[str, Any]]]],
+    titles: dict[str, Optional[str]],
+) -> bytes:
+    """Return the JSON array for (entry_id, storage, recipe, extra fields) rows.
+
+    Each recipe is spliced in from its storage's cached encoding; only the
+    entry fields, extra fields and signed image URLs are encoded per call.
+    A ``fields`` projection goes through dicts instead.
+    """
+    if msg.get("fields") is not None:
+        items = []
+        for entry_id, _storage, recipe, extra in rows:
+            data = _recipe_data(recipe, entry_id, titles[entry_id])
+            if extra:
+                data.update(extra)
+            items.append(data)
+        return json_bytes(_project(_attach_image_urls(hass, connection, items), msg["fields"]))
+    refresh_token_id = getattr(connection, "refresh_token_id", None)
+    # '"_entry_id":...}' per entry: the encoded recipe's closing brace is swapped for it
+    suffixes: dict[str, bytes] = {}
+    parts = []
+    for entry_id, storage, recipe, extra in rows:
+        suffix = suffixes.get(entry_id) if not extra else None
+        if suffix is None:
+            meta: dict[str, Any] = {"_entry_id": entry_id}
+            if titles[entry_id]:
+                meta["_entry_title"] = titles[entry_id]
+            if extra:
+                meta.update(extra)
+            suffix = json_bytes(meta)[1:]
+            if not extra:
+                suffixes[entry_id] = suffix
+        encoded = storage.recipe_json(recipe.id) or recipe.to_json()
+        image_id = image_id_from_ref(recipe.image)
+        if image_id is None:
+            parts.append(b"".join((encoded[:-1], b",", suffix)))
+        else:
+            urls = json_bytes(_image_urls(hass, image_id, refresh_token_id))
+            parts.append(b"".join((encoded[:-1], b",", urls[1:-1], b",", suffix)))
+    return b"[" + b",".join(parts) + b"]"
+
+def _send_payload(
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+    recipes: bytes,
+    next_cursor: Optional[str] = None,
+) -> bytes:
+    """Send an encoded recipe array in the requested shape and return the result.
+
+    Paged requests get ``{"recipes": [...], "next_cursor": ...}``; others
+    keep the plain list response.
+    """
+    if _is_paged(msg):
+        recipes = b"".join((b'{"recipes":', recipes, b',"next_cursor":', json_bytes(next_cursor), b"}"))
+    connection.send_message(construct_result_message(msg["id"], recipes))
+    return recipes
+
+def _send_cached(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any], key: tuple
+) -> bool:
+    """Send a cached reply for ``key`` if there is one."""
+    payload = _response_cache(hass).get(key)
+    if payload is None:
+        return False
+    connection.send_message(construct_result_message(msg["id"], payload))
+    return True
+
+# Options shared by recipe_list and recipe_search
+PAGING_SCHEMA = {
+    vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)),
+    vol.Optional("cursor"): str,
+    vol.Optional("fields"): [str],
+    vol.Optional("entry_id"): str,
+}
+
+
+async def _async_sync_recipes(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Answer a ``since_revision`` request with the cheapest sufficient reply.
+
+    ``unchanged`` when nothing changed, ``delta`` with the changed recipes
+    and removed ids when every collection's changelog reaches back to the
+    client's revision, and ``snapshot`` with all recipes otherwise.
+    """
+    since = msg["since_revision"]
+    storages = _all_storages(hass, msg.get("entry_id"))
+    for _entry_id, storage in storages:
+        await storage.async_load_recipes()
+    removed_revision = hass.data.get(DOMAIN, {}).get(DATA_REMOVED_REVISION, 0)
+    revision = max([removed_revision, *(storage.revision for _, storage in storages)])
 
-@websocket_api.websocket_command({vol.Required("type"): RECIPE_LIST_TYPE})
+    changes = None
+    if removed_revision <= since:
+        changes = [(entry_id, storage, storage.changes_since(since)) for entry_id, storage in storages]
+        if any(changed is None for _, _, changed in changes):
+            changes = None
+    if changes is None:
+        items = []
+        for entry_id, storage in storages:
+            entry_title = _entry_title(hass, entry_id)
+            items.extend(_recipe_data(r, entry_id, entry_title) for r in storage.recipes)
+        recipes = _project(_attach_image_urls(hass, connection, items), msg.get("fields"))
+        connection.send_result(msg["id"], {"status": "snapshot", "revision": revision, "recipes": recipes})
+        return
+    if not any(changed for _, _, changed in changes):
+        connection.send_result(msg["id"], {"status": "unchanged", "revision": max(revision, since)})
+        return
+    items = []
+    removed = []
+    for entry_id, storage, changed in changes:
+        entry_title = _entry_title(hass, entry_id)
+        for recipe_id in changed:
+            recipe = storage.get(recipe_id)
+            if recipe is None:
+                removed.append(recipe_id)
+            else:
+                items.append(_recipe_data(recipe, entry_id, entry_title))
+    # A recipe moved between entries is removed from one and present in another
+    present = {d["id"] for d in items}
+    removed = [recipe_id for recipe_id in removed if recipe_id not in present]
+    recipes = _project(_attach_image_urls(hass, connection, items), msg.get("fields"))
+    connection.send_result(
+        msg["id"], {"status": "delta", "revision": revision, "recipes": recipes, "removed": removed}
+    )
+
+@websocket_api.websocket_command({
+    vol.Required("type"): RECIPE_LIST_TYPE,
+    vol.Optional("since_revision"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    **PAGING_SCHEMA,
+})
 async def async_list_recipes(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
-    """List all recipes."""
-    if DOMAIN not in hass.data or not hass.data[DOMAIN]:
-        connection.send_result(msg["id"], [])
+    """List recipes, optionally one page at a time or as changes since a revision.
+
+    Pages follow (entry_id, insertion sequence) order and the cursor points
+    past the last recipe sent, so edits between pages never shift them.
+    """
+    if "since_revision" in msg:
+        if _is_paged(msg):
+            connection.send_error(msg["id"], "invalid_format", "since_revision cannot be combined with paging")
+        else:
+            await _async_sync_recipes(hass, connection, msg)
         return
-    
-    storages = _all_storages(hass)
-    if not storages:
-        connection.send_result(msg["id"], [])
+    try:
+        cursor = _decode_cursor(msg["cursor"]) if "cursor" in msg else None
+        after_entry = str(cursor["e"]) if cursor is not None else None
+        after_seq = int(cursor["s"]) if cursor is not None else 0
+    except (KeyError, TypeError, ValueError):
+        connection.send_error(msg["id"], "invalid_cursor", "Invalid cursor")
         return
-    combined = []
-    for entry_id, storage in storages:
-        entry_title = None
-        try:
-            ce = hass.config_entries.async_get_entry(entry_id)
-            entry_title = getattr(ce, "title", None)
-        except Exception:  # noqa: BLE001
-            entry_title = None
-        recipes = await storage.async_load_recipes()
+    storages = _all_storages(hass, msg.get("entry_id"))
+    for _entry_id, storage in storages:
+        await storage.async_load_recipes()
+    titles = {entry_id: _entry_title(hass, entry_id) for entry_id, _ in storages}
+    cache_key = _response_key(connection, msg, storages, titles)
+    if _send_cached(hass, connection, msg, cache_key):
+        return
+
+    if not _is_paged(msg):
         # annotate entry_id so UIs can target a specific collection if needed
-        for r in recipes:
-            data = r.to_dict()
-            data["_entry_id"] = entry_id
-            if entry_title:
-                data["_entry_title"] = entry_title
-            combined.append(data)
-    connection.send_result(msg["id"], combined)
+        rows = [(entry_id, storage, r, None) for entry_id, storage in storages for r in storage.recipes]
+        _response_cache(hass).put(cache_key, _send_payload(connection, msg, _encode_recipes(hass, connection, msg, rows, titles)))
+        return
+
+    limit = msg.get("limit", DEFAULT_PAGE_SIZE)
+    page: list[tuple[str, int, RecipeStorage, Recipe]] = []
+    for entry_id, storage in sorted(storages, key=lambda item: item[0]):
+        if after_entry is not None and entry_id < after_entry:
+            continue
+        after = 0
+        if entry_id == after_entry:
+            # Resume after the last recipe even if sequences were renumbered
+            after = storage.seq(str(cursor.get("id"))) or after_seq
+        # One extra recipe tells whether there is a next page
+        for seq, recipe in storage.page(after, limit + 1 - len(page)):
+            page.append((entry_id, seq, storage, recipe))
+        if len(page) > limit:
+            break
+    next_cursor = None
+    if len(page) > limit:
+        del page[limit:]
+        entry_id, seq, _storage, recipe = page[-1]
+        next_cursor = _encode_cursor({"e": entry_id, "s": seq, "id": recipe.id})
+    rows = [(entry_id, storage, recipe, None) for entry_id, _seq, storage, recipe in page]
+    payload = _send_payload(connection, msg, _encode_recipes(hass, connection, msg, rows, titles), next_cursor)
+    _response_cache(hass).put(cache_key, payload)
 
 @websocket_api.websocket_command({
     vol.Required("type"): RECIPE_GET_TYPE,
@@ -74,23 +385,15 @@ async def async_get_recipe(hass: HomeAssistant, connection: websocket_api.Active
         connection.send_error(msg["id"], "not_found", "Integration not configured")
         return
     
-    # Search across all storages
     recipe_id = msg["recipe_id"]
-    for entry_id, storage in _all_storages(hass):
-        recipes = await storage.async_load_recipes()
-        for recipe in recipes:
-            if recipe.id == recipe_id:
-                data = recipe.to_dict()
-                data["_entry_id"] = entry_id
-                try:
-                    ce = hass.config_entries.async_get_entry(entry_id)
-                    if ce and getattr(ce, "title", None):
-                        data["_entry_title"] = ce.title
-                except Exception:  # noqa: BLE001
-                    pass
-                connection.send_result(msg["id"], data)
-                return
-    connection.send_error(msg["id"], "not_found", "Recipe not found")
+    located = _locate(hass, recipe_id)
+    if located is None:
+        connection.send_error(msg["id"], "not_found", "Recipe not found")
+        return
+    entry_id, storage = located
+    data = _recipe_data(storage.get(recipe_id), entry_id, _entry_title(hass, entry_id))
+    _attach_image_urls(hass, connection, [data])
+    connection.send_result(msg["id"], data)
 
 @websocket_api.websocket_command({
     vol.Required("type"): RECIPE_ADD_TYPE,
@@ -117,12 +420,10 @@ async def async_add_recipe(hass: HomeAssistant, connection: websocket_api.Active
     data = msg["recipe"]
     recipe = Recipe.from_dict(data)
     await storage.async_add_recipe(recipe)
-    
-    # Update coordinator
-    await _update_coordinator(hass)
-    
+
     data = recipe.to_dict()
     data["_entry_id"] = target_entry_id
+    _attach_image_urls(hass, connection, [data])
     connection.send_result(msg["id"], data)
 
 @websocket_api.websocket_command({
@@ -136,19 +437,16 @@ async def async_update_recipe(hass: HomeAssistant, connection: websocket_api.Act
         connection.send_error(msg["id"], "not_found", "Integration not configured")
         return
     
-    # Update across storages; stop at the first match
     recipe_id = msg["recipe_id"]
-    data = msg["recipe"]
-    updated_recipe = Recipe.from_dict(data)
-    for entry_id, storage in _all_storages(hass):
-        ok = await storage.async_update_recipe(recipe_id, updated_recipe)
-        if ok:
-            await _update_coordinator(hass)
-            result = updated_recipe.to_dict()
-            result["_entry_id"] = entry_id
-            connection.send_result(msg["id"], result)
-            return
-    connection.send_error(msg["id"], "not_found", "Recipe not found")
+    located = _locate(hass, recipe_id)
+    updated_recipe = Recipe.from_dict(msg["recipe"])
+    if located is None or not await located[1].async_update_recipe(recipe_id, updated_recipe):
+        connection.send_error(msg["id"], "not_found", "Recipe not found")
+        return
+    result = updated_recipe.to_dict()
+    result["_entry_id"] = located[0]
+    _attach_image_urls(hass, connection, [result])
+    connection.send_result(msg["id"], result)
 
 @websocket_api.websocket_command({
     vol.Required("type"): RECIPE_DELETE_TYPE,
@@ -160,70 +458,345 @@ async def async_delete_recipe(hass: HomeAssistant, connection: websocket_api.Act
         connection.send_error(msg["id"], "not_found", "Integration not configured")
         return
     
-    # Delete across storages; stop at the first match
     recipe_id = msg["recipe_id"]
+    located = _locate(hass, recipe_id)
+    if located is None:
+        connection.send_error(msg["id"], "not_found", "Recipe not found")
+        return
+    entry_id, storage = located
+    await storage.async_delete_recipe(recipe_id)
+    # Also remove the entity for this recipe
+    cleanup_recipe_entities(hass, entry_id, recipe_id)
+    connection.send_result(msg["id"], True)
+
+def _plan_batch(hass: HomeAssistant, operations: list[dict[str, Any]]):
+    """Validate batch operations against the collections as they will be.
+
+    Returns ``(plan, results)``: plan items are ``(op, entry_id, storage,
+    recipe_id, recipe)`` and results hold one dict per operation, with
+    ``error`` set on the invalid ones.
+    """
+    storages = _all_storages(hass)
+    by_entry = dict(storages)
+    # Ids added or deleted by earlier operations of this batch, per entry
+    added: dict[str, set[str]] = {}
+    deleted: dict[str, set[str]] = {}
+
+    def _exists(entry_id: str, recipe_id: str) -> bool:
+        if recipe_id in added.get(entry_id, ()):
+            return True
+        return by_entry[entry_id].contains(recipe_id) and recipe_id not in deleted.get(entry_id, ())
+
+    plan = []
+    results: list[dict[str, Any]] = []
+    for op in operations:
+        kind = op["op"]
+        target = op.get("entry_id")
+        if target is not None and target not in by_entry:
+            results.append({"ok": False, "error": "not_found", "message": "Unknown entry_id"})
+            continue
+        if kind == BATCH_ADD:
+            if "recipe" not in op:
+                results.append({"ok": False, "error": "invalid_format", "message": "recipe is required"})
+                continue
+            entry_id = target if target is not None else (storages[0][0] if storages else None)
+            if entry_id is None:
+                results.append({"ok": False, "error": "not_found", "message": "No storage instance found"})
+                continue
+            recipe = Recipe.from_dict(op["recipe"])
+            recipe_id = recipe.id
+            added.setdefault(entry_id, set()).add(recipe_id)
+            deleted.get(entry_id, set()).discard(recipe_id)
+        else:
+            recipe_id = op.get("recipe_id")
+            if recipe_id is None or (kind == BATCH_UPDATE and "recipe" not in op):
+                required = "recipe_id and recipe are" if kind == BATCH_UPDATE else "recipe_id is"
+                results.append({"ok": False, "error": "invalid_format", "message": f"{required} required"})
+                continue
+            candidates = [target] if target is not None else [e for e, _ in storages]
+            entry_id = next((e for e in candidates if _exists(e, recipe_id)), None)
+            if entry_id is None:
+                results.append({"ok": False, "error": "not_found", "message": "Recipe not found"})
+                continue
+            recipe = None
+            if kind == BATCH_UPDATE:
+                recipe = Recipe.from_dict(op["recipe"])
+            else:
+                added.get(entry_id, set()).discard(recipe_id)
+                deleted.setdefault(entry_id, set()).add(recipe_id)
+        plan.append((kind, entry_id, by_entry[entry_id], recipe_id, recipe))
+        results.append({"ok": True, "entry_id": entry_id, "recipe_id": recipe_id})
+    return plan, results
+
+@websocket_api.websocket_command({
+    vol.Required("type"): RECIPE_BATCH_TYPE,
+    vol.Required("operations"): vol.All(
+        [{
+            vol.Required("op"): vol.In([BATCH_ADD, BATCH_UPDATE, BATCH_DELETE]),
+            vol.Optional("recipe"): dict,
+            vol.Optional("recipe_id"): str,
+            vol.Optional("entry_id"): str,
+        }],
+        vol.Length(min=1, max=MAX_BATCH_SIZE),
+    ),
+})
+async def async_batch_recipes(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Apply many adds, updates and deletes as one transaction.
+
+    Every operation is validated first; if any is invalid nothing is
+    applied and ``applied`` is False. Inline images are then stored before
+    anything changes, so a failed write also leaves every collection as it
+    was. Applying the prepared operations does no I/O: each touched
+    collection is changed in one batch, written together and refreshes its
+    own sensors once. ``results`` has one entry per operation, in order.
+    """
     for _entry_id, storage in _all_storages(hass):
-        recipes = await storage.async_load_recipes()
-        if any(r.id == recipe_id for r in recipes):
-            await storage.async_delete_recipe(recipe_id)
-            await _update_coordinator(hass)
-            # Also remove the entity for this recipe
-            cleanup_recipe_entities(hass, _entry_id, recipe_id)
-            connection.send_result(msg["id"], True)
+        await storage.async_load_recipes()
+    plan, results = _plan_batch(hass, msg["operations"])
+    if len(plan) != len(results):
+        connection.send_result(msg["id"], {"applied": False, "results": results})
+        return
+
+    touched = list({entry_id: storage for _kind, entry_id, storage, _recipe_id, _recipe in plan}.values())
+    try:
+        try:
+            for _kind, _entry_id, storage, _recipe_id, recipe in plan:
+                if recipe is not None:
+                    await storage.async_prepare_recipe(recipe)
+        except OSError as err:
+            _LOGGER.error("Error storing images for a recipe batch: %s", err)
+            connection.send_error(msg["id"], "storage_error", f"Could not store images: {err}")
             return
-    connection.send_error(msg["id"], "not_found", "Recipe not found")
+
+        async with AsyncExitStack() as stack:
+            for storage in touched:
+                await stack.enter_async_context(storage.async_batch())
+            for kind, entry_id, storage, recipe_id, recipe in plan:
+                if kind == BATCH_ADD:
+                    await storage.async_add_recipe(recipe)
+                elif kind == BATCH_UPDATE:
+                    await storage.async_update_recipe(recipe_id, recipe)
+                else:
+                    await storage.async_delete_recipe(recipe_id)
+                    cleanup_recipe_entities(hass, entry_id, recipe_id)
+    finally:
+        for storage in touched:
+            storage.release_prepared()
+    connection.send_result(msg["id"], {"applied": True, "results": results})
 
 @websocket_api.websocket_command({
     vol.Required("type"): RECIPE_SEARCH_TYPE,
     vol.Optional("query", default=""): str,
     vol.Optional("max_time", default=None): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+    **PAGING_SCHEMA,
 })
 async def async_search_recipes(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
-    """Search recipes by query and optional max total time."""
-    if DOMAIN not in hass.data or not hass.data[DOMAIN]:
-        connection.send_result(msg["id"], [])
-        return
-    
-    query = msg.get("query", "").lower()
+    """Search recipes by query and optional max total time.
+
+    Results are ordered by score, then entry and insertion sequence; paged
+    requests continue after the sort key stored in the cursor. Scores
+    depend on the whole collection, so a cursor holds the revision and
+    index state it was ranked against and is refused once those change.
+    """
+    query = msg.get("query", "")
     max_time = msg.get("max_time")
     
-    storages = _all_storages(hass)
-    if not storages:
-        connection.send_result(msg["id"], [])
+    try:
+        cursor = _decode_cursor(msg["cursor"]) if "cursor" in msg else None
+        after = None
+        if cursor is not None:
+            score, entry_id, seq = cursor["k"]
+            after = (float(score), str(entry_id), int(seq))
+    except (KeyError, TypeError, ValueError):
+        connection.send_error(msg["id"], "invalid_cursor", "Invalid cursor")
         return
-    
-    combined = []
+    storages = _all_storages(hass, msg.get("entry_id"))
+    for _entry_id, storage in storages:
+        await storage.async_load_recipes()
+    ranked_against = [
+        [entry_id, storage.revision, storage.index_ready]
+        for entry_id, storage in sorted(storages, key=lambda item: item[0])
+    ]
+    if cursor is not None and cursor.get("v") != ranked_against:
+        connection.send_error(msg["id"], "stale_cursor", "Recipes changed since the first page; search again")
+        return
+    titles = {entry_id: _entry_title(hass, entry_id) for entry_id, _ in storages}
+    cache_key = _response_key(connection, msg, storages, titles)
+    if _send_cached(hass, connection, msg, cache_key):
+        return
+
+    ranked = []
     for entry_id, storage in storages:
-        entry_title = None
-        try:
-            ce = hass.config_entries.async_get_entry(entry_id)
-            entry_title = getattr(ce, "title", None)
-        except Exception:  # noqa: BLE001
-            entry_title = None
-        recipes = await storage.async_load_recipes()
-        for r in recipes:
-            data = r.to_dict()
-            data["_entry_id"] = entry_id
-            if entry_title:
-                data["_entry_title"] = entry_title
-            
-            # Filter by query
-            if query and query not in data["title"].lower() and query not in (data.get("description", "") or "").lower():
-                continue
-            
-            # Filter by max_time
-            if max_time is not None and data.get("total_time", 0) > max_time:
-                continue
-            
-            combined.append(data)
+        # Only matching recipes come back; the index did the filtering
+        for result in await storage.async_search(query, max_time):
+            score = None if result.score is None else round(result.score, 4)
+            key = (-(score or 0.0), entry_id, storage.seq(result.recipe.id) or 0)
+            if after is None or key > after:
+                ranked.append((key, entry_id, storage, score, result))
+    ranked.sort(key=lambda item: item[0])
+
+    next_cursor = None
+    if _is_paged(msg):
+        limit = msg.get("limit", DEFAULT_PAGE_SIZE)
+        if len(ranked) > limit:
+            del ranked[limit:]
+            next_cursor = _encode_cursor({"k": list(ranked[-1][0]), "v": ranked_against})
+
+    # Serialize only what is sent
+    rows = [
+        (entry_id, storage, result.recipe, {"_score": score, "_hits": result.hits})
+        for _key, entry_id, storage, score, result in ranked
+    ]
+    payload = _send_payload(connection, msg, _encode_recipes(hass, connection, msg, rows, titles), next_cursor)
+    _response_cache(hass).put(cache_key, payload)
+
+@websocket_api.websocket_command({
+    vol.Required("type"): WHAT_CAN_I_MAKE_TYPE,
+    vol.Required("ingredients"): [str],
+    vol.Optional("max_missing"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("limit", default=DEFAULT_PANTRY_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+    vol.Optional("entry_id"): str,
+})
+async def async_what_can_i_make(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Rank recipes by how many of their ingredients are missing from a pantry."""
+    matches = await async_pantry_matches(
+        hass, msg["ingredients"], msg.get("max_missing"), msg["limit"], msg.get("entry_id")
+    )
+    combined = []
+    for entry_id, recipe, match in matches:
+        data = recipe.to_dict()
+        data["_entry_id"] = entry_id
+        data["_missing_count"] = match.missing_count
+        data["_coverage"] = match.coverage
+        data["_matched"] = match.matched
+        data["_missing"] = match.missing
+        combined.append(data)
+    _attach_image_urls(hass, connection, combined)
     connection.send_result(msg["id"], combined)
 
+@callback
+@websocket_api.websocket_command({
+    vol.Required("type"): SUBSCRIBE_TYPE,
+    vol.Optional("fields"): [str],
+    vol.Optional("entry_id"): str,
+})
+def async_subscribe_recipes(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Send a snapshot of the recipes, then push each change as it happens.
+
+    Events: ``snapshot`` (all recipes plus per-entry revisions), ``added``
+    and ``updated`` (one recipe), ``removed`` (an id) and ``reset`` (all
+    recipes of an entry that was reloaded). Every change carries its
+    entry's revision, which only increases.
+    """
+    msg_id = msg["id"]
+    fields = msg.get("fields")
+    entry_filter = msg.get("entry_id")
+
+    def _serialize(entry_id: str, recipes) -> list[dict[str, Any]]:
+        title = _entry_title(hass, entry_id)
+        items = [_recipe_data(r, entry_id, title) for r in recipes]
+        return _project(_attach_image_urls(hass, connection, items), fields)
+
+    @callback
+    def _forward(entry_id: str, change: RecipeChange) -> None:
+        if entry_filter is not None and entry_id != entry_filter:
+            return
+        event: dict[str, Any] = {"type": change.kind, "entry_id": entry_id, "revision": change.revision}
+        if change.kind == CHANGE_REMOVED:
+            event["recipe_id"] = change.recipe_id
+        elif change.kind == CHANGE_RESET:
+            storage = hass.data.get(DOMAIN, {}).get(entry_id, {}).get("storage")
+            event["recipes"] = _serialize(entry_id, storage.recipes if storage else [])
+        else:
+            event["recipe"] = _serialize(entry_id, [change.recipe])[0]
+        connection.send_message(websocket_api.event_message(msg_id, event))
+
+    connection.subscriptions[msg_id] = async_dispatcher_connect(hass, SIGNAL_RECIPES_CHANGED, _forward)
+    connection.send_result(msg_id)
+
+    recipes: list[dict[str, Any]] = []
+    revisions: dict[str, int] = {}
+    for entry_id, storage in _all_storages(hass, entry_filter):
+        recipes.extend(_serialize(entry_id, storage.recipes))
+        revisions[entry_id] = storage.revision
+    connection.send_message(
+        websocket_api.event_message(msg_id, {"type": "snapshot", "recipes": recipes, "revisions": revisions})
+    )
+
+class _MeteredConnection:
+    """Counts the bytes a handler sends through a connection.
+
+    Results and events are encoded here rather than by the websocket
+    writer, so each is still encoded once.
+    """
+
+    def __init__(self, connection: websocket_api.ActiveConnection) -> None:
+        self._connection = connection
+        self.bytes_sent = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def send_message(self, message: Any) -> None:
+        if not isinstance(message, (bytes, str)):
+            message = json_bytes(message)
+        self.bytes_sent += len(message)
+        self._connection.send_message(message)
+
+    def send_result(self, msg_id: int, result: Any = None) -> None:
+        self.send_message(construct_result_message(msg_id, json_bytes(result)))
+
+
+def _metered(handler):
+    """Record the latency and reply size of a command handler while metrics are on.
+
+    Coroutine handlers come back wrapped in ``websocket_api.async_response``,
+    as the connection calls handlers without awaiting them.
+    """
+    if asyncio.iscoroutinefunction(handler):
+        @wraps(handler)
+        async def _async_metered(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+            metrics = get_metrics(hass)
+            if metrics is None:
+                await handler(hass, connection, msg)
+                return
+            metered = _MeteredConnection(connection)
+            with metrics.measure(msg.get("type", handler.__name__)) as measurement:
+                try:
+                    await handler(hass, metered, msg)
+                finally:
+                    measurement.size = metered.bytes_sent
+
+        return websocket_api.async_response(_async_metered)
+
+    @wraps(handler)
+    def _metered_handler(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+        metrics = get_metrics(hass)
+        if metrics is None:
+            handler(hass, connection, msg)
+            return
+        metered = _MeteredConnection(connection)
+        with metrics.measure(msg.get("type", handler.__name__)) as measurement:
+            try:
+                handler(hass, metered, msg)
+            finally:
+                measurement.size = metered.bytes_sent
+
+    return _metered_handler
+
+
 def register_api(hass: HomeAssistant) -> None:
     """Register the WebSocket API commands."""
     _LOGGER.info("Registering Recipe Cards WebSocket API")
-    websocket_api.async_register_command(hass, async_list_recipes)
-    websocket_api.async_register_command(hass, async_get_recipe)
-    websocket_api.async_register_command(hass, async_add_recipe)
-    websocket_api.async_register_command(hass, async_update_recipe)
-    websocket_api.async_register_command(hass, async_delete_recipe)
-    websocket_api.async_register_command(hass, async_search_recipes)
+    for handler in (
+        async_list_recipes,
+        async_get_recipe,
+        async_add_recipe,
+        async_update_recipe,
+        async_delete_recipe,
+        async_batch_recipes,
+        async_search_recipes,
+        async_what_can_i_make,
+        async_subscribe_recipes,
+    ):
+        websocket_api.async_register_command(hass, _metered(handler))
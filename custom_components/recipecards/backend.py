@@ -0,0 +1,67 @@
+"""Persistence engine interface for Recipe Cards storage."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+from .models import Recipe
+
+# Returns the whole collection as JSON-ready dicts, in display order
+SnapshotFunc = Callable[[], list[dict[str, Any]]]
+
+
+class StorageBackend(ABC):
+    """Persistence engine behind a ``RecipeStorage``.
+
+    ``RecipeStorage`` keeps the authoritative collection in memory and tells
+    the backend what changed; the backend decides when and how to write it.
+    Whole-collection writes go through the ``snapshot`` callable passed to
+    the constructor, so they always reflect the current in-memory state.
+    """
+
+    def __init__(self, snapshot: SnapshotFunc) -> None:
+        self._snapshot = snapshot
+
+    @property
+    @abstractmethod
+    def dirty(self) -> bool:
+        """Return True if some recorded change has not been written yet."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_load(self) -> Optional[list[dict[str, Any]]]:
+        """Return the stored collection, or None if this engine holds no data yet."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_upsert(self, recipe: Recipe) -> None:
+        """Note that a recipe was added or replaced."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_delete(self, recipe_id: str) -> None:
+        """Note that a recipe was removed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_flush(self) -> None:
+        """Write recorded changes that are still pending."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_save_all(self) -> None:
+        """Rewrite the whole collection from the snapshot now."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_import(self, data: list[dict[str, Any]]) -> None:
+        """Replace everything this engine stores with ``data``."""
+        raise NotImplementedError
+
+    async def async_search(self, query: str, max_time: Optional[int] = None) -> Optional[list[str]]:
+        """Return ids of matching recipes, best first, or None to search in memory."""
+        return None
+
+    async def async_close(self) -> None:
+        """Write pending changes and release any open resources."""
+        await self.async_flush()
@@ -8,7 +8,24 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN
+from .const import (
+    CONF_PERFORMANCE_METRICS,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_ENGINE,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_STORAGE_ENGINE,
+    DOMAIN,
+    ENGINE_JOURNAL,
+    ENGINE_JSON,
+    ENGINE_SQLITE,
+)
+
+STORAGE_ENGINES = {
+    ENGINE_JSON: "Single JSON file (default)",
+    ENGINE_JOURNAL: "Append-only journal (large collections)",
+    ENGINE_SQLITE: "SQLite with full-text search (large collections)",
+}
+
 def _validate_color(value) -> str:
     """Local color validator to avoid cross-module import during config flow.
 
@@ -89,6 +106,8 @@ class RecipeCardsOptionsFlow(config_entries.OptionsFlow):
                 "select_recipe": "Edit existing recipe",
                 "select_recipe_delete": "Delete recipe",
                 "rename_section": "Rename this section",
+                "storage_settings": "Storage settings",
+                "performance_settings": "Performance metrics",
                 "finish": "Finish",
             },
         )
@@ -132,7 +151,6 @@ class RecipeCardsOptionsFlow(config_entries.OptionsFlow):
             if storage and coordinator:
                 from .models import Recipe
                 await storage.async_add_recipe(Recipe.from_dict(recipe_data))
-                await coordinator.async_request_refresh()
         except Exception:  # noqa: BLE001
             pass
 
@@ -185,12 +203,11 @@ class RecipeCardsOptionsFlow(config_entries.OptionsFlow):
             return await self.async_step_select_recipe({"next": "edit"})
 
         rid = user_input["recipe_id"]
-        storage, coordinator = self._get_storage_and_coordinator()
+        storage, _ = self._get_storage_and_coordinator()
         if not storage:
             return await self.async_step_init()
 
-        recipes = await storage.async_load_recipes()
-        recipe = next((r for r in recipes if r.id == rid), None)
+        recipe = storage.get(rid)
         if not recipe:
             return await self.async_step_init()
 
@@ -219,8 +236,6 @@ class RecipeCardsOptionsFlow(config_entries.OptionsFlow):
             try:
                 from .models import Recipe
                 await storage.async_update_recipe(rid, Recipe.from_dict(updated))
-                if coordinator:
-                    await coordinator.async_request_refresh()
             except Exception:  # noqa: BLE001
                 pass
             return await self.async_step_init()
@@ -231,12 +246,10 @@ class RecipeCardsOptionsFlow(config_entries.OptionsFlow):
         if user_input is None or "recipe_id" not in user_input:
             return await self.async_step_select_recipe_delete()
         rid = user_input["recipe_id"]
-        storage, coordinator = self._get_storage_and_coordinator()
+        storage, _ = self._get_storage_and_coordinator()
         if storage:
             try:
                 await storage.async_delete_recipe(rid)
-                if coordinator:
-                    await coordinator.async_request_refresh()
             except Exception:  # noqa: BLE001
                 pass
         return await self.async_step_init()
@@ -253,5 +266,50 @@ class RecipeCardsOptionsFlow(config_entries.OptionsFlow):
             pass
         return await self.async_step_init()
 
+    async def async_step_storage_settings(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Choose the storage engine and write delay; changes reload the entry."""
+        options = self._config_entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_STORAGE_ENGINE,
+                default=options.get(CONF_STORAGE_ENGINE, DEFAULT_STORAGE_ENGINE),
+            ): vol.In(STORAGE_ENGINES),
+            vol.Required(
+                CONF_SAVE_DELAY,
+                default=options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+        })
+        if user_input is None:
+            return self.async_show_form(step_id="storage_settings", data_schema=schema)
+        new_options = {**options, **user_input}
+        if new_options != dict(options):
+            old_engine = options.get(CONF_STORAGE_ENGINE, DEFAULT_STORAGE_ENGINE)
+            new_engine = new_options[CONF_STORAGE_ENGINE]
+            entry_data = self.hass.data.get(DOMAIN, {}).get(self._config_entry.entry_id)
+            if new_engine != old_engine and isinstance(entry_data, dict) and "storage" in entry_data:
+                # Hand the current collection to the new engine; it is loaded on reload
+                await entry_data["storage"].async_migrate_to(new_engine)
+            self.hass.config_entries.async_update_entry(self._config_entry, options=new_options)
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+        return await self.async_step_init()
+
+    async def async_step_performance_settings(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Turn latency and payload-size metrics on or off; changes reload the entry."""
+        options = self._config_entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_PERFORMANCE_METRICS,
+                default=options.get(CONF_PERFORMANCE_METRICS, False),
+            ): bool,
+        })
+        if user_input is None:
+            return self.async_show_form(step_id="performance_settings", data_schema=schema)
+        new_options = {**options, **user_input}
+        if new_options != dict(options):
+            self.hass.config_entries.async_update_entry(self._config_entry, options=new_options)
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+        return await self.async_step_init()
+
     async def async_step_finish(self, user_input: dict[str, Any] | None = None) -> FlowResult:
-        return self.async_create_entry(title="", data={})
+        # Keep options saved by the storage and performance settings steps
+        return self.async_create_entry(title="", data=dict(self._config_entry.options))
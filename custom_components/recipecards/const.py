@@ -1,2 +1,36 @@
 """Constants for the Recipe Cards integration."""
-DOMAIN = "recipecards"
\ No newline at end of file
+DOMAIN = "recipecards"
+
+# Seconds to coalesce recipe writes before the collection is saved to disk
+CONF_SAVE_DELAY = "save_delay"
+DEFAULT_SAVE_DELAY = 1.0
+
+# Seconds within which an entry's changes are merged into one sensor update
+UPDATE_COOLDOWN = 0.5
+
+# Persistence engine used by each entry's RecipeStorage
+CONF_STORAGE_ENGINE = "storage_engine"
+ENGINE_JSON = "json"
+ENGINE_JOURNAL = "journal"
+ENGINE_SQLITE = "sqlite"
+DEFAULT_STORAGE_ENGINE = ENGINE_JSON
+
+# Collect per-operation latency and payload sizes (diagnostics and a sensor)
+CONF_PERFORMANCE_METRICS = "performance_metrics"
+
+# Dispatcher signal carrying (entry_id, RecipeChange) for every storage mutation
+SIGNAL_RECIPES_CHANGED = f"{DOMAIN}_recipes_changed"
+
+# Fired on the bus as a bulk import progresses
+EVENT_IMPORT_PROGRESS = f"{DOMAIN}_import_progress"
+
+# hass.data[DOMAIN] key of the RecipeLocator (recipe id -> entry id) kept by RecipeStorage
+DATA_RECIPE_LOCATOR = "recipe_locator"
+# hass.data[DOMAIN] key of the encoded recipe_list/recipe_search reply cache
+DATA_RESPONSE_CACHE = "response_cache"
+# hass.data[DOMAIN] key of the revision at which an entry was last unloaded
+DATA_REMOVED_REVISION = "removed_revision"
+# hass.data[DOMAIN] key of the PerformanceMetrics collector, while enabled
+DATA_METRICS = "metrics"
+# hass.data[DOMAIN] key of the id of the entry providing the one performance sensor
+DATA_PERFORMANCE_SENSOR = "performance_sensor"
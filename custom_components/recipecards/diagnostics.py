@@ -0,0 +1,32 @@
+"""Diagnostics support for Recipe Cards."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .metrics import get_metrics
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the entry's storage state and, when enabled, performance metrics.
+
+    Recipes themselves are left out; they are personal data and can be
+    exported from /api/recipecards/export.
+    """
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    storage = entry_data.get("storage") if isinstance(entry_data, dict) else None
+    metrics = get_metrics(hass)
+    return {
+        "options": dict(entry.options),
+        "storage": None if storage is None else {
+            "engine": storage.engine,
+            "loaded": storage.loaded,
+            "recipes": len(storage.recipes),
+            "revision": storage.revision,
+            "dirty": storage.dirty,
+        },
+        "performance": metrics.as_dict() if metrics is not None else None,
+    }
@@ -0,0 +1,98 @@
+"""Serialize recipe collections for export, a chunk at a time.
+
+Exports are produced lazily: recipes are encoded in chunks of
+``EXPORT_CHUNK_SIZE`` and each chunk is handed to the caller before the
+next is built, so a large collection is never held as one document.
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+
+from .const import DOMAIN
+from .images import display_image, image_id_from_ref
+from .importer import FORMAT_JSONLD, FORMAT_NDJSON
+from .models import Recipe
+from .storage import RecipeStorage
+
+EXPORT_FORMATS = (FORMAT_NDJSON, FORMAT_JSONLD)
+EXPORT_CHUNK_SIZE = 100
+
+
+def iso_duration(minutes: Optional[int]) -> Optional[str]:
+    """Return an ISO-8601 duration ("PT1H30M") for a number of minutes."""
+    if minutes is None:
+        return None
+    hours, minutes = divmod(int(minutes), 60)
+    if hours and minutes:
+        return f"PT{hours}H{minutes}M"
+    return f"PT{hours}H" if hours else f"PT{minutes}M"
+
+
+def recipe_to_schema_org(recipe: Recipe, image: Optional[str] = None) -> dict[str, Any]:
+    """Return a schema.org ``Recipe`` node; the importer reads it back."""
+    node: dict[str, Any] = {
+        "@context": "https://schema.org",
+        "@type": "Recipe",
+        "identifier": recipe.id,
+        "name": recipe.title,
+        "description": recipe.description or "",
+        "recipeIngredient": list(recipe.ingredients or ()),
+        "recipeInstructions": [{"@type": "HowToStep", "text": step} for step in recipe.instructions or ()],
+    }
+    for key, minutes in (
+        ("prepTime", recipe.prep_time),
+        ("cookTime", recipe.cook_time),
+        ("totalTime", recipe.total_time),
+    ):
+        duration = iso_duration(minutes)
+        if duration:
+            node[key] = duration
+    if image:
+        node["image"] = image
+    if recipe.notes:
+        node["comment"] = {"@type": "Comment", "text": recipe.notes}
+    return node
+
+
+async def async_iter_export(
+    hass: HomeAssistant,
+    storages: list[tuple[str, RecipeStorage]],
+    file_format: str,
+    inline_images: bool = False,
+) -> AsyncIterator[bytes]:
+    """Yield an export of ``storages`` as encoded chunks.
+
+    NDJSON lines are stored recipes plus ``_entry_id``; JSON-LD is one array
+    of schema.org nodes. Images are URLs of the image view, or data URLs
+    when ``inline_images`` is set (read from disk a chunk at a time).
+    """
+    images = hass.data.get(DOMAIN, {}).get("images") if inline_images else None
+    first = True
+    if file_format == FORMAT_JSONLD:
+        yield b"["
+    for entry_id, storage in storages:
+        recipes = await storage.async_load_recipes()
+        for start in range(0, len(recipes), EXPORT_CHUNK_SIZE):
+            chunk = recipes[start:start + EXPORT_CHUNK_SIZE]
+            data_urls: dict[str, str] = {}
+            if images is not None:
+                image_ids = {image_id_from_ref(r.image) for r in chunk} - {None}
+                if image_ids:
+                    data_urls = await images.async_data_urls(image_ids)
+            parts = []
+            for recipe in chunk:
+                image = data_urls.get(image_id_from_ref(recipe.image)) or display_image(recipe.image)
+                if file_format == FORMAT_NDJSON:
+                    data = recipe.to_dict()
+                    data["image"] = image
+                    data["_entry_id"] = entry_id
+                    parts.append(json_bytes(data) + b"\n")
+                else:
+                    parts.append((b"" if first else b",") + json_bytes(recipe_to_schema_org(recipe, image)))
+                    first = False
+            yield b"".join(parts)
+    if file_format == FORMAT_JSONLD:
+        yield b"]"
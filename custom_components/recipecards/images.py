@@ -0,0 +1,309 @@
+"""Content-addressed image store for Recipe Cards.
+
+Uploaded ``data:image/...`` payloads are decoded once and written to
+``.storage/recipecards_images/<sha256>.<ext>``. Recipes keep only a short
+reference (``recipecards-image:<sha256>``) instead of the base64 string,
+and clients fetch the bytes from ``/api/recipecards/image/<sha256>``.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import logging
+import io
+import os
+import uuid
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+IMAGES_DIR = "recipecards_images"
+IMAGE_REF_PREFIX = "recipecards-image:"
+IMAGE_URL_PREFIX = "/api/recipecards/image/"
+
+# Named variants served by the image view: longest edge in pixels
+IMAGE_SIZES = {"thumb": 160, "card": 640}
+
+# Wait a little after the last change before sweeping unreferenced blobs
+GC_DELAY = 30
+
+_MIME_TO_EXT = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+_EXT_TO_MIME = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "gif": "image/gif",
+    "webp": "image/webp",
+}
+
+
+def is_inline_image(value: Optional[str]) -> bool:
+    """Return True for a base64 ``data:image/...`` URL."""
+    return isinstance(value, str) and value.startswith("data:image/")
+
+
+def image_id_from_ref(value: Optional[str]) -> Optional[str]:
+    """Return the image id of a stored-image reference, or None."""
+    if isinstance(value, str) and value.startswith(IMAGE_REF_PREFIX):
+        return value[len(IMAGE_REF_PREFIX):] or None
+    return None
+
+
+def make_ref(image_id: str) -> str:
+    """Build the reference stored on a recipe for an image id."""
+    return f"{IMAGE_REF_PREFIX}{image_id}"
+
+
+def image_path(image_id: str, size: Optional[str] = None) -> str:
+    """Return the (unsigned) URL path of a stored image or one of its variants."""
+    path = f"{IMAGE_URL_PREFIX}{image_id}"
+    return f"{path}?size={size}" if size else path
+
+
+def ref_from_image_url(value: Optional[str]) -> Optional[str]:
+    """Map an image URL we handed out back to its stored reference.
+
+    Clients echo the ``image`` value they received when saving a recipe, so
+    this keeps an unchanged image pointing at the same blob.
+    """
+    if not isinstance(value, str) or IMAGE_URL_PREFIX not in value:
+        return None
+    path = URL(value).path
+    if not path.startswith(IMAGE_URL_PREFIX):
+        return None
+    image_id = path[len(IMAGE_URL_PREFIX):]
+    return make_ref(image_id) if image_id else None
+
+
+def display_image(value: Optional[str]) -> Optional[str]:
+    """Return what clients should see for a recipe's ``image`` field."""
+    image_id = image_id_from_ref(value)
+    return image_path(image_id) if image_id else value
+
+
+def _decode_data_url(data_url: str) -> Optional[tuple[bytes, str]]:
+    """Split a base64 data URL into (bytes, extension)."""
+    header, sep, payload = data_url.partition(",")
+    if not sep or not header.endswith(";base64"):
+        return None
+    mime = header[len("data:"):-len(";base64")].lower()
+    ext = _MIME_TO_EXT.get(mime)
+    if ext is None:
+        return None
+    try:
+        raw = base64.b64decode("".join(payload.split()), validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    return (raw, ext) if raw else None
+
+
+class ImageStore:
+    """Blob store for recipe images keyed by the SHA-256 of their bytes."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._path = Path(hass.config.path(".storage", IMAGES_DIR))
+        # image id -> file name; filled lazily from the directory listing
+        self._files: Optional[dict[str, str]] = None
+        self._lock = asyncio.Lock()
+        self._reference_provider: Optional[Callable[[], Optional[set[str]]]] = None
+        self._unsub_collect: Optional[Callable[[], None]] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def set_reference_provider(self, provider: Callable[[], Optional[set[str]]]) -> None:
+        """Set the callable returning every referenced image id.
+
+        It should return None while the referenced set is not known for sure
+        (e.g. some entries are still loading), which skips garbage collection.
+        """
+        self._reference_provider = provider
+
+    def _list_files(self) -> dict[str, str]:
+        files: dict[str, str] = {}
+        if self._path.is_dir():
+            for name in os.listdir(self._path):
+                # Variants are named <id>.<size>.<ext> and are skipped here
+                image_id, dot, ext = name.partition(".")
+                if dot and ext in _EXT_TO_MIME:
+                    files[image_id] = name
+        return files
+
+    def _atomic_write(self, target: Path, raw: bytes) -> None:
+        self._path.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, target)
+
+    async def _async_files(self) -> dict[str, str]:
+        if self._files is None:
+            self._files = await self._hass.async_add_executor_job(self._list_files)
+        return self._files
+
+    def _write_blob(self, data_url: str) -> Optional[tuple[str, str]]:
+        """Decode and store a data URL; return (image id, file name)."""
+        decoded = _decode_data_url(data_url)
+        if decoded is None:
+            return None
+        raw, ext = decoded
+        image_id = hashlib.sha256(raw).hexdigest()
+        name = f"{image_id}.{ext}"
+        target = self._path / name
+        if not target.exists():
+            self._atomic_write(target, raw)
+        return image_id, name
+
+    async def async_put_data_url(self, data_url: str) -> Optional[str]:
+        """Store an inline image and return its reference.
+
+        Returns None if the payload is not a base64 image we can decode; the
+        caller keeps the original value in that case.
+        """
+        async with self._lock:
+            files = await self._async_files()
+            result = await self._hass.async_add_executor_job(self._write_blob, data_url)
+            if result is None:
+                return None
+            image_id, name = result
+            files[image_id] = name
+        return make_ref(image_id)
+
+    def _read_blob(self, name: str) -> Optional[bytes]:
+        try:
+            return (self._path / name).read_bytes()
+        except OSError:
+            return None
+
+    async def async_read(self, image_id: str) -> Optional[tuple[bytes, str]]:
+        """Return (bytes, content type) for a stored image, or None."""
+        name = (await self._async_files()).get(image_id)
+        if name is None:
+            return None
+        raw = await self._hass.async_add_executor_job(self._read_blob, name)
+        if raw is None:
+            return None
+        return raw, _EXT_TO_MIME[name.rsplit(".", 1)[1]]
+
+    def _read_variant(self, name: str, size: str) -> Optional[bytes]:
+        """Return a resized copy of a blob, generating and caching it on disk."""
+        image_id, _, ext = name.partition(".")
+        target = self._path / f"{image_id}.{size}.{ext}"
+        try:
+            return target.read_bytes()
+        except FileNotFoundError:
+            pass
+        raw = self._read_blob(name)
+        if raw is None:
+            return None
+        try:
+            from PIL import Image  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            # Pillow is optional; fall back to the original bytes
+            return raw
+        edge = IMAGE_SIZES[size]
+        try:
+            with Image.open(io.BytesIO(raw)) as img:
+                if max(img.size) <= edge:
+                    return raw
+                fmt = img.format
+                img.thumbnail((edge, edge))
+                out = io.BytesIO()
+                img.save(out, format=fmt)
+        except (OSError, ValueError) as err:
+            _LOGGER.debug("Cannot resize image %s: %s", image_id, err)
+            return raw
+        resized = out.getvalue()
+        self._atomic_write(target, resized)
+        return resized
+
+    async def async_read_variant(self, image_id: str, size: str) -> Optional[tuple[bytes, str]]:
+        """Return (bytes, content type) for a named size variant of an image."""
+        name = (await self._async_files()).get(image_id)
+        if name is None:
+            return None
+        raw = await self._hass.async_add_executor_job(self._read_variant, name, size)
+        if raw is None:
+            return None
+        return raw, _EXT_TO_MIME[name.rsplit(".", 1)[1]]
+
+    def _read_data_urls(self, names: dict[str, str]) -> dict[str, str]:
+        urls: dict[str, str] = {}
+        for image_id, name in names.items():
+            raw = self._read_blob(name)
+            if raw is not None:
+                mime = _EXT_TO_MIME[name.rsplit(".", 1)[1]]
+                urls[image_id] = f"data:{mime};base64,{base64.b64encode(raw).decode('ascii')}"
+        return urls
+
+    async def async_data_urls(self, image_ids: Iterable[str]) -> dict[str, str]:
+        """Re-encode stored images as data URLs in a single executor job."""
+        files = await self._async_files()
+        names = {i: files[i] for i in set(image_ids) if i in files}
+        if not names:
+            return {}
+        return await self._hass.async_add_executor_job(self._read_data_urls, names)
+
+    def _remove_files(self, names: list[str]) -> None:
+        for name in names:
+            image_id, _, ext = name.partition(".")
+            variants = [f"{image_id}.{size}.{ext}" for size in IMAGE_SIZES]
+            for path in (name, *variants):
+                try:
+                    os.remove(self._path / path)
+                except FileNotFoundError:
+                    pass
+
+    async def _async_remove_unreferenced(self, referenced: set[str]) -> int:
+        files = await self._async_files()
+        stale = [i for i in files if i not in referenced]
+        if not stale:
+            return 0
+        await self._hass.async_add_executor_job(self._remove_files, [files[i] for i in stale])
+        for image_id in stale:
+            files.pop(image_id, None)
+        _LOGGER.debug("Removed %s unreferenced recipe image(s)", len(stale))
+        return len(stale)
+
+    async def async_collect_garbage(self, referenced: set[str]) -> int:
+        """Delete blobs whose id is not in ``referenced``; return the count."""
+        async with self._lock:
+            return await self._async_remove_unreferenced(referenced)
+
+    @callback
+    def async_schedule_collect(self) -> None:
+        """Run garbage collection once things have settled."""
+        if self._unsub_collect is None:
+            self._unsub_collect = async_call_later(self._hass, GC_DELAY, self._async_collect_later)
+
+    async def _async_collect_later(self, _now) -> None:
+        self._unsub_collect = None
+        if self._reference_provider is None:
+            return
+        # Hold the lock while computing references so an image stored
+        # concurrently is either referenced already or not yet on disk
+        async with self._lock:
+            referenced = self._reference_provider()
+            if referenced is None:
+                return
+            await self._async_remove_unreferenced(referenced)
+
+    @callback
+    def async_cancel_collect(self) -> None:
+        """Cancel a pending garbage collection run."""
+        if self._unsub_collect is not None:
+            self._unsub_collect()
+            self._unsub_collect = None
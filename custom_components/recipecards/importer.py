@@ -0,0 +1,408 @@
+"""Bulk import of recipes from local files.
+
+Supported formats:
+
+- ``ndjson``: one JSON object per line.
+- ``jsonld``: a JSON array of objects, a single object, or a JSON-LD
+  document with an ``@graph``.
+- ``paprika``: a Paprika ``.paprikarecipes`` export (a zip of gzipped JSON
+  recipes) or a single ``.paprikarecipe`` file.
+
+Objects may be schema.org ``Recipe`` nodes, Paprika recipes or recipes as
+Recipe Cards stores them. Files are read incrementally in the executor and
+handed to the event loop in chunks, so memory use does not grow with the
+file size.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from .models import Recipe
+from .times import parse_duration
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_JSONLD = "jsonld"
+FORMAT_PAPRIKA = "paprika"
+FORMATS = (FORMAT_NDJSON, FORMAT_JSONLD, FORMAT_PAPRIKA)
+
+IMPORT_CHUNK_SIZE = 200
+# Error messages kept for the service response
+MAX_REPORTED_ERRORS = 20
+
+_EXTENSIONS = {
+    ".ndjson": FORMAT_NDJSON,
+    ".jsonl": FORMAT_NDJSON,
+    ".json": FORMAT_JSONLD,
+    ".jsonld": FORMAT_JSONLD,
+    ".paprikarecipes": FORMAT_PAPRIKA,
+    ".paprikarecipe": FORMAT_PAPRIKA,
+    ".zip": FORMAT_PAPRIKA,
+}
+_READ_SIZE = 1 << 16
+# Largest single value read into memory (characters); inline images make up most of it
+_MAX_ELEMENT_SIZE = 1 << 25
+# Truncated input fails at most this far before the end of the buffer (a cut-off literal or escape)
+_TRUNCATION_SLACK = 12
+_WHITESPACE = " \t\r\n"
+
+@dataclass
+class ImportItem:
+    """One parsed entry of an import file: a recipe or why it was skipped."""
+
+    recipe: Optional[Recipe] = None
+    content_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportSummary:
+    """Counts reported while and after importing a file."""
+
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def add_error(self, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "errors": list(self.errors),
+        }
+
+
+def detect_format(path: str) -> Optional[str]:
+    """Guess the import format from the file extension."""
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def content_hash(recipe: Recipe) -> str:
+    """Return a digest of what makes two recipes the same dish.
+
+    Title, ingredients and instructions are compared case- and
+    whitespace-insensitively; ids, colours and images are ignored.
+    """
+    def _norm(text: Any) -> str:
+        return " ".join(str(text).casefold().split())
+
+    payload = json.dumps(
+        [
+            _norm(recipe.title or ""),
+            [_norm(i) for i in recipe.ingredients or ()],
+            [_norm(i) for i in recipe.instructions or ()],
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode(), usedforsecurity=False).hexdigest()
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "\n".join(_text(v) for v in value if v)
+    if isinstance(value, dict):
+        return _text(value.get("text") or value.get("name"))
+    return str(value).strip()
+
+
+def _lines(value: Any) -> list[str]:
+    """Return non-empty lines from a string or a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [line.strip() for line in value.splitlines() if line.strip()]
+    lines: list[str] = []
+    for item in value:
+        lines.extend(_lines(item) if isinstance(item, (str, list)) else _lines(_text(item)))
+    return lines
+
+
+def _instructions(value: Any) -> list[str]:
+    """Flatten schema.org recipeInstructions (text, HowToStep, HowToSection)."""
+    if isinstance(value, (str, type(None))):
+        return _lines(value)
+    if isinstance(value, dict):
+        value = [value]
+    steps: list[str] = []
+    for item in value:
+        if isinstance(item, dict) and "itemListElement" in item:
+            steps.extend(_instructions(item["itemListElement"]))
+        else:
+            steps.extend(_lines(_text(item)))
+    return steps
+
+
+def _image(value: Any) -> Optional[str]:
+    """Return the first http(s) or data: image URL of a schema.org image."""
+    if isinstance(value, list):
+        for item in value:
+            url = _image(item)
+            if url:
+                return url
+        return None
+    if isinstance(value, dict):
+        return _image(value.get("url") or value.get("contentUrl"))
+    if isinstance(value, str) and value.startswith(("http://", "https://", "data:image/")):
+        return value
+    return None
+
+
+def _is_schema_recipe(obj: dict[str, Any]) -> bool:
+    kind = obj.get("@type")
+    if isinstance(kind, list):
+        return any(str(k).rsplit("/", 1)[-1] == "Recipe" for k in kind)
+    return isinstance(kind, str) and kind.rsplit("/", 1)[-1] == "Recipe"
+
+
+def recipe_from_object(obj: Any) -> Recipe:
+    """Map a schema.org Recipe, Paprika recipe or stored recipe onto ``Recipe``.
+
+    Imported recipes always get a new id. Raises ValueError if the object
+    is not a recipe.
+    """
+    if not isinstance(obj, dict):
+        raise ValueError("Not a JSON object")
+    if _is_schema_recipe(obj):
+        title = _text(obj.get("name"))
+        ingredients = _lines(obj.get("recipeIngredient") or obj.get("ingredients"))
+        instructions = _instructions(obj.get("recipeInstructions"))
+        description = _text(obj.get("description"))
+        notes = _text(obj.get("comment"))
+        image = _image(obj.get("image"))
+        times = (obj.get("prepTime"), obj.get("cookTime"), obj.get("totalTime"))
+    elif "directions" in obj or "photo_data" in obj or ("name" in obj and "title" not in obj):
+        # Paprika
+        title = _text(obj.get("name"))
+        ingredients = _lines(obj.get("ingredients"))
+        instructions = _lines(obj.get("directions"))
+        description = _text(obj.get("description"))
+        notes = _text(obj.get("notes"))
+        image = f"data:image/jpeg;base64,{obj['photo_data']}" if obj.get("photo_data") else None
+        times = (obj.get("prep_time"), obj.get("cook_time"), obj.get("total_time"))
+    elif "title" in obj:
+        title = _text(obj.get("title"))
+        ingredients = _lines(obj.get("ingredients"))
+        instructions = _lines(obj.get("instructions"))
+        description = _text(obj.get("description"))
+        notes = _text(obj.get("notes"))
+        image = _image(obj.get("image"))
+        times = (obj.get("prep_time"), obj.get("cook_time"), obj.get("total_time"))
+    else:
+        raise ValueError("Not a recipe")
+    if not title:
+        raise ValueError("Recipe has no name")
+    prep_time, cook_time, total_time = (parse_duration(t) for t in times)
+    if total_time is None and (prep_time or cook_time):
+        total_time = (prep_time or 0) + (cook_time or 0)
+    recipe = Recipe.from_dict({
+        "title": title,
+        "description": description,
+        "ingredients": ingredients,
+        "notes": notes,
+        "instructions": instructions,
+        "image": image,
+        "prep_time": prep_time,
+        "cook_time": cook_time,
+        "total_time": total_time,
+    })
+    if isinstance(obj.get("color"), str) and re.match(r"^#[0-9A-Fa-f]{6}$", obj["color"]):
+        recipe.color = obj["color"]
+    return recipe
+
+
+class _JsonStream:
+    """Incremental decoder of one JSON document read from a text file.
+
+    Values are decoded from a bounded buffer that grows only while a single
+    value does not fit, up to _MAX_ELEMENT_SIZE.
+    """
+
+    def __init__(self, fp: IO[str]) -> None:
+        self._fp = fp
+        self._decoder = json.JSONDecoder()
+        self._buf = fp.read(_READ_SIZE).lstrip(_WHITESPACE + "\ufeff")
+        self._pos = 0
+
+    def peek(self, separators: str = "") -> str:
+        """Skip whitespace and separators; return the next character, or "" at the end."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] in separators):
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            self._buf, self._pos = self._fp.read(_READ_SIZE), 0
+            if not self._buf:
+                return ""
+
+    def skip(self) -> None:
+        """Step over the character returned by peek."""
+        self._pos += 1
+
+    def decode(self, label: str) -> Any:
+        """Decode the value at the current position; errors are prefixed with label."""
+        while True:
+            buf, pos = self._buf, self._pos
+            try:
+                value, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as err:
+                pending = len(buf) - pos
+                if not err.msg.startswith("Unterminated string") and err.pos < len(buf) - _TRUNCATION_SLACK:
+                    # Fails before the end of the buffer: more input cannot fix it
+                    raise ValueError(f"{label}: {err.msg}") from None
+                if pending >= _MAX_ELEMENT_SIZE:
+                    raise ValueError(f"{label}: larger than {_MAX_ELEMENT_SIZE} characters") from None
+                # The value continues past the buffer: read at least as much again
+                more = self._fp.read(min(max(_READ_SIZE, pending), _MAX_ELEMENT_SIZE - pending))
+                if not more:
+                    raise ValueError(f"{label}: {err.msg}") from None
+                self._buf, self._pos = buf[pos:] + more, 0
+                continue
+            self._pos = end
+            if end > _READ_SIZE:
+                self._buf, self._pos = buf[end:], 0
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the elements of the array at the current position one at a time."""
+        self.skip()
+        number = 1
+        while True:
+            char = self.peek(",")
+            if not char:
+                raise ValueError("Unexpected end of file")
+            if char == "]":
+                self.skip()
+                return
+            yield self.decode(f"Item {number}")
+            number += 1
+
+    def iter_graph(self) -> Iterator[Any]:
+        """Yield the ``@graph`` elements of the object at the current position.
+
+        The graph array is streamed like a top-level array; the other
+        members are decoded whole. An object without a graph array is
+        yielded itself.
+        """
+        self.skip()
+        members: dict[str, Any] = {}
+        streamed = False
+        while True:
+            char = self.peek(",")
+            if char == "}":
+                self.skip()
+                break
+            if char != '"':
+                raise ValueError("Unexpected end of file" if not char else f"Expected a member name, got {char!r}")
+            key = self.decode("Member name")
+            if self.peek() != ":":
+                raise ValueError(f"Member {key!r}: expected ':'")
+            self.skip()
+            if self.peek() == "[" and key == "@graph":
+                yield from self.iter_array()
+                streamed = True
+            else:
+                members[key] = self.decode(f"Member {key!r}")
+        if not streamed:
+            yield members
+
+
+def _iter_json_document(fp: IO[str]) -> Iterator[Any]:
+    """Yield the values of a top-level JSON document one at a time.
+
+    The elements of a top-level array, or of the ``@graph`` array of a
+    top-level object, are decoded one by one; any other document is yielded
+    whole. Raises ValueError, naming the element, for invalid JSON or a
+    value over _MAX_ELEMENT_SIZE, so even a single-recipe document is
+    capped at that size.
+    """
+    stream = _JsonStream(fp)
+    char = stream.peek()
+    if char == "[":
+        yield from stream.iter_array()
+    elif char == "{":
+        yield from stream.iter_graph()
+    else:
+        yield stream.decode("Document")
+
+
+def _iter_jsonld(path: str) -> Iterator[Any]:
+    with open(path, encoding="utf-8") as fp:
+        for value in _iter_json_document(fp):
+            if isinstance(value, dict) and isinstance(value.get("@graph"), list):
+                yield from value["@graph"]
+            else:
+                yield value
+
+
+def _iter_ndjson(path: str) -> Iterator[Any]:
+    with open(path, encoding="utf-8") as fp:
+        for number, line in enumerate(fp, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as err:
+                yield ValueError(f"Line {number}: {err}")
+
+
+def _iter_paprika(path: str) -> Iterator[Any]:
+    if not zipfile.is_zipfile(path):
+        with gzip.open(path, "rt", encoding="utf-8") as fp:
+            yield json.load(fp)
+        return
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            try:
+                data = archive.read(info)
+                if data[:2] == b"\x1f\x8b":
+                    data = gzip.decompress(data)
+                yield json.loads(data)
+            except (OSError, ValueError, zipfile.BadZipFile) as err:
+                yield ValueError(f"{info.filename}: {err}")
+
+
+def iter_import_file(path: str, file_format: str) -> Iterator[ImportItem]:
+    """Yield one ImportItem per object in the file. Blocking; run in the executor."""
+    readers = {FORMAT_NDJSON: _iter_ndjson, FORMAT_JSONLD: _iter_jsonld, FORMAT_PAPRIKA: _iter_paprika}
+    for number, obj in enumerate(readers[file_format](path), 1):
+        if isinstance(obj, Exception):
+            yield ImportItem(error=str(obj))
+            continue
+        if isinstance(obj, dict) and obj.get("@type") and not _is_schema_recipe(obj):
+            # Other JSON-LD nodes (WebPage, Person, ...) are not errors
+            continue
+        try:
+            recipe = recipe_from_object(obj)
+        except ValueError as err:
+            yield ImportItem(error=f"Item {number}: {err}")
+            continue
+        yield ImportItem(recipe, content_hash(recipe))
+
+
+def next_chunk(items: Iterator[ImportItem], size: Optional[int] = None) -> list[ImportItem]:
+    """Return up to ``size`` (IMPORT_CHUNK_SIZE) items. Blocking; run in the executor."""
+    return list(itertools.islice(items, size or IMPORT_CHUNK_SIZE))
+
+
+def existing_hashes(recipes: Iterable[Recipe]) -> set[str]:
+    """Return the content hashes of a collection, for deduplication."""
+    return {content_hash(recipe) for recipe in recipes}
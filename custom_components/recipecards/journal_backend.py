@@ -0,0 +1,282 @@
+"""Append-only journal storage engine for Recipe Cards.
+
+Each change is appended to ``.storage/recipecards_<entry>.journal`` as one
+JSON line, so an edit costs a write proportional to the record instead of
+the whole collection. The regular ``recipecards_<entry>.json`` Store file is
+the snapshot the journal is replayed over on load. Once the journal grows
+past a size or ratio threshold it is compacted in the background: the
+snapshot is rewritten and the journal truncated.
+
+Crash safety comes from ordering: the snapshot Store writes atomically
+(``atomic_writes``), journal appends are fsynced, and a torn trailing line
+is dropped on load. A compaction snapshot is taken when every record so
+far is in the journal and none is pending, so if the process dies before
+the journal is truncated, replaying it over the new snapshot yields that
+same snapshot.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Optional
+
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .backend import SnapshotFunc, StorageBackend
+from .models import Recipe
+
+_LOGGER = logging.getLogger(__name__)
+
+# Compact once the journal reaches this many bytes...
+JOURNAL_COMPACT_BYTES = 1_048_576
+# ...or grows this much larger than the snapshot it is replayed over
+JOURNAL_COMPACT_RATIO = 1.0
+JOURNAL_COMPACT_MIN_BYTES = 65_536
+
+
+def journal_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the journal file path for a config entry."""
+    return hass.config.path(".storage", f"recipecards_{entry_id}.journal")
+
+
+def read_journal(path: str) -> tuple[list[dict[str, Any]], int]:
+    """Read journal records; return them with the byte length of the valid prefix.
+
+    A trailing line without a newline is an interrupted append and is not
+    part of the valid prefix.
+    """
+    records: list[dict[str, Any]] = []
+    valid = 0
+    try:
+        with open(path, "rb") as journal:
+            for line in journal:
+                if not line.endswith(b"\n"):
+                    break
+                valid += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    _LOGGER.warning("Skipping unreadable journal record in %s", path)
+                    continue
+                if isinstance(record, dict):
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+    return records, valid
+
+
+def apply_records(data: list[dict[str, Any]], records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Replay journal records over a snapshot, keeping display order."""
+    by_id = {d.get("id") or f"_{i}": d for i, d in enumerate(data)}
+    for record in records:
+        op = record.get("op")
+        if op == "put" and isinstance(record.get("recipe"), dict):
+            by_id[record["recipe"].get("id")] = record["recipe"]
+        elif op == "del":
+            by_id.pop(record.get("id"), None)
+    return list(by_id.values())
+
+
+def _append(path: str, chunk: bytes) -> int:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "ab") as journal:
+        journal.write(chunk)
+        journal.flush()
+        os.fsync(journal.fileno())
+        return journal.tell()
+
+
+def _truncate(path: str, size: int = 0) -> None:
+    try:
+        with open(path, "r+b") as journal:
+            journal.truncate(size)
+            journal.flush()
+            os.fsync(journal.fileno())
+    except FileNotFoundError:
+        pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _file_size(path: Optional[str]) -> int:
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+async def async_consume_journal(
+    hass: HomeAssistant, entry_id: str, data: list[dict[str, Any]]
+) -> Optional[list[dict[str, Any]]]:
+    """Fold a leftover journal into ``data`` when switching to another engine.
+
+    Returns the merged collection, or None if there is no journal. The caller
+    must persist the result before calling ``async_remove_journal``.
+    """
+    path = journal_path(hass, entry_id)
+    if not await hass.async_add_executor_job(os.path.exists, path):
+        return None
+    records, _ = await hass.async_add_executor_job(read_journal, path)
+    return apply_records(data, records)
+
+
+async def async_remove_journal(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the journal file of a config entry."""
+    await hass.async_add_executor_job(_remove, journal_path(hass, entry_id))
+
+
+class JournalBackend(StorageBackend):
+    """Store snapshot plus an append-only journal of per-recipe records."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        snapshot: SnapshotFunc,
+        store: StorageBackend,
+        save_delay: float,
+    ) -> None:
+        super().__init__(snapshot)
+        self._hass = hass
+        # Backend writing the JSON snapshot (the same file the json engine uses)
+        self._store = store
+        self._path = journal_path(hass, entry_id)
+        self._save_delay = save_delay
+        self._pending: list[bytes] = []
+        self._write_lock = asyncio.Lock()
+        self._write_handle: Optional[asyncio.TimerHandle] = None
+        self._compact_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    @property
+    def journal_bytes(self) -> int:
+        """Return the size of the journal on disk."""
+        return self._journal_bytes
+
+    async def async_load(self) -> Optional[list[dict[str, Any]]]:
+        data = await self._store.async_load()
+        records, valid = await self._hass.async_add_executor_job(read_journal, self._path)
+        size = await self._hass.async_add_executor_job(_file_size, self._path)
+        if size != valid:
+            _LOGGER.warning("Dropping interrupted trailing record from %s", self._path)
+            await self._hass.async_add_executor_job(_truncate, self._path, valid)
+        self._journal_bytes = valid
+        self._snapshot_bytes = await self._hass.async_add_executor_job(
+            _file_size, getattr(self._store, "path", None)
+        )
+        return apply_records(data or [], records)
+
+    def _append_record(self, record: dict[str, Any]) -> None:
+        self._pending.append(json_bytes(record) + b"\n")
+        if self._write_handle is None:
+            self._write_handle = self._hass.loop.call_later(self._save_delay, self._start_write)
+
+    def _start_write(self) -> None:
+        self._write_handle = None
+        self._hass.async_create_task(self.async_flush())
+
+    def record_upsert(self, recipe: Recipe) -> None:
+        self._append_record({"op": "put", "recipe": recipe.to_dict()})
+
+    def record_delete(self, recipe_id: str) -> None:
+        self._append_record({"op": "del", "id": recipe_id})
+
+    async def _async_write_pending(self) -> bool:
+        """Append pending records; the write lock must be held. Return False on error."""
+        if not self._pending:
+            return True
+        records, self._pending = self._pending, []
+        try:
+            self._journal_bytes = await self._hass.async_add_executor_job(
+                _append, self._path, b"".join(records)
+            )
+        except OSError as err:
+            _LOGGER.error("Error appending to %s: %s", self._path, err)
+            self._pending[:0] = records
+            return False
+        return True
+
+    async def async_flush(self) -> None:
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._write_handle = None
+        async with self._write_lock:
+            await self._async_write_pending()
+        self._maybe_compact()
+
+    def _needs_compaction(self) -> bool:
+        if self._journal_bytes >= JOURNAL_COMPACT_BYTES:
+            return True
+        return (
+            self._journal_bytes >= JOURNAL_COMPACT_MIN_BYTES
+            and self._journal_bytes >= JOURNAL_COMPACT_RATIO * self._snapshot_bytes
+        )
+
+    def _maybe_compact(self) -> None:
+        if (
+            self._compact_task is None
+            and not self._closing
+            and self._hass.state is CoreState.running
+            and self._needs_compaction()
+        ):
+            self._compact_task = self._hass.async_create_background_task(
+                self._async_compact(), f"recipecards journal compaction {self._path}"
+            )
+
+    async def _async_rewrite_snapshot(self) -> None:
+        """Save a fresh snapshot and empty the journal; the write lock must be held."""
+        # Records can be queued while an append is in flight; take the
+        # snapshot only once the journal holds every one of them, so it is
+        # exactly the snapshot on disk with the journal replayed over it
+        while self._pending:
+            if not await self._async_write_pending():
+                return
+        data = self._snapshot()
+        # Records added while it is being saved stay pending and land after the truncation
+        await self._store.async_import(data)
+        await self._hass.async_add_executor_job(_truncate, self._path)
+        self._journal_bytes = 0
+        self._snapshot_bytes = await self._hass.async_add_executor_job(
+            _file_size, getattr(self._store, "path", None)
+        )
+
+    async def _async_compact(self) -> None:
+        try:
+            async with self._write_lock:
+                await self._async_rewrite_snapshot()
+        finally:
+            self._compact_task = None
+
+    async def async_save_all(self) -> None:
+        async with self._write_lock:
+            await self._async_rewrite_snapshot()
+
+    async def async_close(self) -> None:
+        self._closing = True
+        if self._compact_task is not None:
+            # Let a running compaction finish before the entry goes away
+            await asyncio.wait([self._compact_task])
+        await self.async_flush()
+
+    async def async_import(self, data: list[dict[str, Any]]) -> None:
+        async with self._write_lock:
+            self._pending.clear()
+            await self._store.async_import(data)
+            await self._hass.async_add_executor_job(_truncate, self._path)
+            self._journal_bytes = 0
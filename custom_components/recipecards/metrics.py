@@ -0,0 +1,160 @@
+"""Latency and payload-size counters for websocket commands, services and storage.
+
+Metrics are collected only while a config entry has them enabled: the
+collector then lives in ``hass.data[DOMAIN]`` and instrumented code looks
+it up per call, so with metrics off an operation costs one dict lookup and
+a no-op context manager.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_METRICS, DOMAIN
+
+# Recent samples kept per operation for the percentiles
+METRICS_WINDOW = 1000
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class OperationStats:
+    """Totals for one operation, plus a rolling window of its latest samples."""
+
+    __slots__ = ("calls", "errors", "bytes", "_durations", "_sizes")
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self._durations: deque[float] = deque(maxlen=window)
+        self._sizes: deque[int] = deque(maxlen=window)
+
+    def add(self, seconds: float, size: Optional[int] = None, error: bool = False) -> None:
+        self.calls += 1
+        self._durations.append(seconds)
+        if error:
+            self.errors += 1
+        if size is not None:
+            self.bytes += size
+            self._sizes.append(size)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counts, latency percentiles (ms) and payload sizes (bytes)."""
+        durations = sorted(self._durations)
+        data: dict[str, Any] = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_ms": round(_percentile(durations, 0.5) * 1000, 3),
+            "p95_ms": round(_percentile(durations, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(durations, 0.99) * 1000, 3),
+            "max_ms": round(durations[-1] * 1000, 3),
+        }
+        if self._sizes:
+            sizes = sorted(self._sizes)
+            data.update({
+                "bytes_total": self.bytes,
+                "bytes_p50": _percentile(sizes, 0.5),
+                "bytes_p95": _percentile(sizes, 0.95),
+                "bytes_max": sizes[-1],
+            })
+        return data
+
+
+class Measurement:
+    """Times a ``with`` block into PerformanceMetrics; set ``size`` to record bytes."""
+
+    __slots__ = ("_metrics", "_operation", "_start", "size")
+
+    def __init__(self, metrics: "PerformanceMetrics", operation: str) -> None:
+        self._metrics = metrics
+        self._operation = operation
+        self._start = 0.0
+        self.size: Optional[int] = None
+
+    def __enter__(self) -> "Measurement":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._metrics.record(
+            self._operation, time.perf_counter() - self._start, self.size, exc_type is not None
+        )
+
+
+class _NullMeasurement:
+    """Stands in for Measurement while metrics are off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullMeasurement":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    @property
+    def size(self) -> None:
+        return None
+
+    @size.setter
+    def size(self, value: Optional[int]) -> None:
+        pass
+
+
+_NULL_MEASUREMENT = _NullMeasurement()
+
+
+class PerformanceMetrics:
+    """Per-operation call counts, errors, latencies and bytes serialized."""
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        self._window = window
+        self._operations: dict[str, OperationStats] = {}
+
+    def record(self, operation: str, seconds: float, size: Optional[int] = None, error: bool = False) -> None:
+        stats = self._operations.get(operation)
+        if stats is None:
+            stats = self._operations[operation] = OperationStats(self._window)
+        stats.add(seconds, size, error)
+
+    def measure(self, operation: str) -> Measurement:
+        return Measurement(self, operation)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the stats of every operation seen, by name."""
+        return {name: self._operations[name].as_dict() for name in sorted(self._operations)}
+
+    def reset(self) -> None:
+        self._operations.clear()
+
+
+def get_metrics(hass: HomeAssistant) -> Optional[PerformanceMetrics]:
+    """Return the collector, or None while metrics are off."""
+    metrics = hass.data.get(DOMAIN, {}).get(DATA_METRICS)
+    return metrics if isinstance(metrics, PerformanceMetrics) else None
+
+
+def measure(hass: HomeAssistant, operation: str) -> Measurement | _NullMeasurement:
+    """Return a context manager timing ``operation``; a no-op while metrics are off."""
+    metrics = get_metrics(hass)
+    return _NULL_MEASUREMENT if metrics is None else Measurement(metrics, operation)
+
+
+def async_enable_metrics(hass: HomeAssistant) -> PerformanceMetrics:
+    """Start collecting metrics, keeping any collected so far."""
+    metrics = get_metrics(hass)
+    if metrics is None:
+        metrics = hass.data.setdefault(DOMAIN, {})[DATA_METRICS] = PerformanceMetrics()
+    return metrics
+
+
+def async_disable_metrics(hass: HomeAssistant) -> None:
+    """Stop collecting metrics and drop what was collected."""
+    hass.data.get(DOMAIN, {}).pop(DATA_METRICS, None)
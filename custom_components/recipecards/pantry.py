@@ -0,0 +1,203 @@
+"""Ingredient index for "what can I make?" queries.
+
+Ingredient lines are reduced to a normalized name ("2 large tomatoes,
+diced" -> "tomato") and each name keeps a sorted array of the recipe slots
+using it. A pantry query counts, per recipe, how many of its ingredients
+the pantry covers by walking only the posting arrays of covered names, so
+the cost follows the number of matches rather than the collection size.
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import re
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .models import Recipe
+from .search import stem, tokenize
+
+DEFAULT_PANTRY_LIMIT = 20
+
+_PARENTHESES_RE = re.compile(r"\([^)]*\)")
+_SPLIT_RE = re.compile(r"\s+(?:and|&)\s+|\s*\+\s*")
+_UNITS = frozenset((
+    "c", "cup", "cups", "tbsp", "tbs", "tablespoon", "tablespoons", "tsp", "teaspoon",
+    "teaspoons", "g", "gr", "gram", "grams", "kg", "mg", "ml", "cl", "dl", "l", "litre",
+    "litres", "liter", "liters", "oz", "ounce", "ounces", "lb", "lbs", "pound", "pounds",
+    "pinch", "pinches", "dash", "dashes", "handful", "handfuls", "can", "cans", "tin",
+    "tins", "jar", "jars", "packet", "packets", "pack", "bunch", "bunches", "sprig",
+    "sprigs", "clove", "cloves", "slice", "slices", "piece", "pieces", "stick", "sticks",
+    "x",
+))
+_DESCRIPTORS = frozenset((
+    "a", "an", "the", "of", "some", "about", "approx", "approximately", "optional",
+    "large", "small", "medium", "big", "fresh", "freshly", "chopped", "diced", "minced",
+    "sliced", "grated", "ground", "finely", "roughly", "thinly", "coarsely", "peeled",
+    "crushed", "whole", "halved", "quartered", "softened", "melted", "cold", "warm",
+    "hot", "dried", "frozen", "raw", "boneless", "skinless", "cooked", "packed",
+    "heaped", "level", "extra", "virgin", "ripe", "organic", "taste", "to", "for",
+    "serving", "garnish", "room", "temperature", "plus", "more", "needed",
+))
+
+
+def normalize_ingredients(line: str) -> list[str]:
+    """Return the normalized ingredient names in one ingredient line.
+
+    Quantities, units and preparation words are dropped and the rest is
+    stemmed; "salt and pepper" yields two names.
+    """
+    text = _PARENTHESES_RE.sub(" ", str(line).casefold()).split(",")[0]
+    names = []
+    for part in _SPLIT_RE.split(text):
+        # Quantities: "2", "200g", "½"
+        words = [w for w in tokenize(part) if not w[0].isnumeric()]
+        kept = [w for w in words if w not in _UNITS and w not in _DESCRIPTORS]
+        if not kept and words:
+            # Everything looked like a unit ("whole cloves"): keep the noun
+            kept = words[-1:]
+        if kept:
+            names.append(" ".join(stem(w) for w in kept))
+    return names
+
+
+@dataclass
+class PantryMatch:
+    """How well a pantry covers one recipe."""
+
+    recipe_id: str
+    missing_count: int
+    coverage: float
+    # Original ingredient lines, split by whether the pantry has them
+    matched: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+
+
+class PantryIndex:
+    """Normalized ingredient name -> sorted array of recipe slots."""
+
+    def __init__(self) -> None:
+        self._postings: dict[str, array] = {}
+        # Names by their last word, so "tomato" also finds "cherry tomato"
+        self._by_head: dict[str, set[str]] = {}
+        self._slots: dict[str, int] = {}
+        # slot -> (recipe id, its ingredient names, name -> original lines)
+        self._docs: list[Optional[tuple[str, tuple[str, ...], dict[str, list[str]]]]] = []
+        self._free = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, recipe_id: object) -> bool:
+        return recipe_id in self._slots
+
+    def clear(self) -> None:
+        """Drop every indexed recipe."""
+        self.__init__()
+
+    def add(self, recipe: Recipe) -> None:
+        """Index a recipe's ingredients, replacing any previous version."""
+        self.remove(recipe.id)
+        lines: dict[str, list[str]] = {}
+        for line in recipe.ingredients or ():
+            for name in normalize_ingredients(line):
+                lines.setdefault(name, []).append(str(line))
+        if not lines:
+            return
+        # Slots only grow, so appending keeps every posting array sorted
+        slot = len(self._docs)
+        self._docs.append((recipe.id, tuple(lines), lines))
+        self._slots[recipe.id] = slot
+        for name in lines:
+            postings = self._postings.get(name)
+            if postings is None:
+                postings = self._postings[name] = array("l")
+                self._by_head.setdefault(name.rsplit(" ", 1)[-1], set()).add(name)
+            postings.append(slot)
+
+    def remove(self, recipe_id: str) -> None:
+        """Unindex a recipe if present."""
+        slot = self._slots.pop(recipe_id, None)
+        if slot is None:
+            return
+        _, names, _ = self._docs[slot]
+        self._docs[slot] = None
+        self._free += 1
+        for name in names:
+            postings = self._postings[name]
+            del postings[bisect.bisect_left(postings, slot)]
+            if not postings:
+                del self._postings[name]
+                head = name.rsplit(" ", 1)[-1]
+                self._by_head[head].discard(name)
+                if not self._by_head[head]:
+                    del self._by_head[head]
+        if self._free > 1024 and self._free > len(self._slots):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Renumber slots once most of them belong to removed recipes."""
+        docs = [doc for doc in self._docs if doc is not None]
+        self._postings = {}
+        self._slots = {}
+        self._docs = []
+        self._free = 0
+        for recipe_id, names, lines in docs:
+            slot = len(self._docs)
+            self._docs.append((recipe_id, names, lines))
+            self._slots[recipe_id] = slot
+            for name in names:
+                self._postings.setdefault(name, array("l")).append(slot)
+
+    def add_all(self, recipes: Iterable[Recipe]) -> None:
+        """Index several recipes."""
+        for recipe in recipes:
+            self.add(recipe)
+
+    def _covered_names(self, pantry: Iterable[str]) -> set[str]:
+        covered: set[str] = set()
+        for item in pantry:
+            for name in normalize_ingredients(item):
+                for candidate in self._by_head.get(name.rsplit(" ", 1)[-1], ()):
+                    if candidate == name or candidate.endswith(" " + name):
+                        covered.add(candidate)
+        return covered
+
+    def query(
+        self,
+        pantry: Iterable[str],
+        max_missing: Optional[int] = None,
+        limit: Optional[int] = DEFAULT_PANTRY_LIMIT,
+    ) -> list[PantryMatch]:
+        """Rank recipes by how few ingredients are missing from ``pantry``.
+
+        Only recipes using at least one pantry ingredient are returned; ties
+        go to the recipe with the larger covered fraction.
+        """
+        covered = self._covered_names(pantry)
+        if not covered:
+            return []
+        counts: Counter[int] = Counter()
+        for name in covered:
+            counts.update(self._postings[name])
+        docs = self._docs
+        ranked = []
+        for slot, have in counts.items():
+            total = len(docs[slot][1])
+            missing = total - have
+            if max_missing is None or missing <= max_missing:
+                ranked.append((missing, -have / total, slot))
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked)
+        else:
+            ranked.sort()
+        matches = []
+        for missing, negative_coverage, slot in ranked:
+            recipe_id, names, lines = docs[slot]
+            match = PantryMatch(recipe_id, missing, round(-negative_coverage, 4))
+            for name in names:
+                (match.matched if name in covered else match.missing).extend(lines[name])
+            matches.append(match)
+        return matches
@@ -0,0 +1,257 @@
+"""In-memory inverted index for recipe search.
+
+Text from every searchable field is tokenized, case folded and lightly
+stemmed. Each term maps to the recipes containing it with per-field term
+frequencies, so a query only touches the postings of its own terms: a
+selective query costs the same on 100 recipes as on 50,000. Query terms
+are ANDed, each matching its stem or, for partial words, any indexed term
+it is a prefix of. Matches are ranked with BM25F.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .models import Recipe
+
+FIELDS = ("title", "description", "ingredients", "instructions", "notes")
+# Relative importance of a hit in each field, in FIELDS order
+FIELD_WEIGHTS = (3.0, 1.5, 1.5, 1.0, 1.0)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Cap on indexed terms a single partial word may expand to
+MAX_PREFIX_TERMS = 64
+MIN_PREFIX_LENGTH = 2
+
+_TOKEN_RE = re.compile(r"\w+")
+_VOWELS = frozenset("aeiouy")
+
+
+def stem(token: str) -> str:
+    """Strip common English inflections ("tomatoes", "baked", "chopping")."""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith(("ches", "shes", "sses", "xes", "zes", "oes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    for suffix in ("ing", "ed"):
+        base = token[: -len(suffix)]
+        if token.endswith(suffix) and len(base) >= 3 and _VOWELS.intersection(base):
+            token = base
+            # "chopped" -> "chop", but "added" stays "add"
+            if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lszaeiou":
+                token = token[:-1]
+            break
+    # "bake", "baked" and "baking" all become "bak"
+    if len(token) > 3 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into case-folded words."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def analyze(text: str) -> list[str]:
+    """Return the index terms for a piece of text."""
+    return [stem(token) for token in tokenize(text)]
+
+
+def recipe_fields(recipe: Recipe) -> tuple[str, ...]:
+    """Return the searchable text of a recipe, in FIELDS order."""
+    return (
+        recipe.title or "",
+        recipe.description or "",
+        "\n".join(str(i) for i in recipe.ingredients or ()),
+        "\n".join(str(i) for i in recipe.instructions or ()),
+        recipe.notes or "",
+    )
+
+
+@dataclass
+class SearchResult:
+    """A matching recipe with its relevance and the fields each term hit."""
+
+    recipe: Recipe
+    score: Optional[float] = None
+    # field name -> query words found in it
+    hits: dict[str, list[str]] = field(default_factory=dict)
+
+
+def match_recipe(recipe: Recipe, query: str) -> Optional[dict[str, list[str]]]:
+    """Match one recipe without an index; return per-field hits or None.
+
+    Uses the same rules as ``SearchIndex.search`` and serves as the linear
+    fallback while the index is being built.
+    """
+    words = tokenize(query)
+    if not words:
+        return {}
+    field_terms = [analyze(text) for text in recipe_fields(recipe)]
+    hits: dict[str, list[str]] = {}
+    for word in words:
+        term = stem(word)
+        found = False
+        for name, terms in zip(FIELDS, field_terms):
+            if any(t == term or (len(word) >= MIN_PREFIX_LENGTH and t.startswith(word)) for t in terms):
+                hits.setdefault(name, []).append(word)
+                found = True
+        if not found:
+            return None
+    return hits
+
+
+class SearchIndex:
+    """Term -> recipe postings with per-field frequencies, updated in place."""
+
+    def __init__(self) -> None:
+        # term -> recipe id -> term frequency per field
+        self._postings: dict[str, dict[str, tuple[int, ...]]] = {}
+        # recipe id -> its distinct terms (to unindex it) and field lengths
+        self._doc_terms: dict[str, tuple[str, ...]] = {}
+        self._doc_lengths: dict[str, tuple[int, ...]] = {}
+        self._total_lengths = [0] * len(FIELDS)
+        # Sorted terms for prefix lookups; removed terms are skipped lazily
+        # and new ones merged in on the next prefix query
+        self._vocabulary: list[str] = []
+        self._new_terms: set[str] = set()
+        self._stale_terms = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, recipe_id: object) -> bool:
+        return recipe_id in self._doc_terms
+
+    def clear(self) -> None:
+        """Drop every indexed recipe."""
+        self.__init__()
+
+    def add(self, recipe: Recipe) -> None:
+        """Index a recipe, replacing any previous version with the same id."""
+        recipe_id = recipe.id
+        self.remove(recipe_id)
+        counts: dict[str, list[int]] = {}
+        lengths = []
+        for position, text in enumerate(recipe_fields(recipe)):
+            terms = analyze(text)
+            lengths.append(len(terms))
+            self._total_lengths[position] += len(terms)
+            for term in terms:
+                tf = counts.get(term)
+                if tf is None:
+                    tf = counts[term] = [0] * len(FIELDS)
+                tf[position] += 1
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._new_terms.add(term)
+            postings[recipe_id] = tuple(tf)
+        self._doc_terms[recipe_id] = tuple(counts)
+        self._doc_lengths[recipe_id] = tuple(lengths)
+
+    def remove(self, recipe_id: str) -> None:
+        """Unindex a recipe if present."""
+        terms = self._doc_terms.pop(recipe_id, None)
+        if terms is None:
+            return
+        for position, length in enumerate(self._doc_lengths.pop(recipe_id)):
+            self._total_lengths[position] -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[recipe_id]
+            if not postings:
+                del self._postings[term]
+                if term in self._new_terms:
+                    self._new_terms.discard(term)
+                else:
+                    self._stale_terms += 1
+
+    def add_all(self, recipes: Iterable[Recipe]) -> None:
+        """Index several recipes."""
+        for recipe in recipes:
+            self.add(recipe)
+
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        if self._new_terms or self._stale_terms > len(self._postings):
+            if len(self._new_terms) > MAX_PREFIX_TERMS or self._stale_terms > len(self._postings):
+                self._vocabulary = sorted(self._postings)
+                self._stale_terms = 0
+            else:
+                for term in self._new_terms:
+                    position = bisect.bisect_left(self._vocabulary, term)
+                    # A term removed earlier may still be listed
+                    if position == len(self._vocabulary) or self._vocabulary[position] != term:
+                        self._vocabulary.insert(position, term)
+            self._new_terms.clear()
+        vocabulary = self._vocabulary
+        found: list[str] = []
+        for position in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            term = vocabulary[position]
+            if not term.startswith(prefix) or len(found) >= MAX_PREFIX_TERMS:
+                break
+            if term in self._postings:
+                found.append(term)
+        return found
+
+    def _word_postings(self, word: str) -> dict[str, tuple[int, ...]]:
+        """Return recipe id -> per-field frequencies for everything ``word`` matches."""
+        terms = {stem(word)}
+        if len(word) >= MIN_PREFIX_LENGTH:
+            terms.update(self._prefix_terms(word))
+        matched = [self._postings[t] for t in terms if t in self._postings]
+        if len(matched) == 1:
+            return matched[0]
+        merged: dict[str, tuple[int, ...]] = {}
+        for postings in matched:
+            for recipe_id, tf in postings.items():
+                previous = merged.get(recipe_id)
+                merged[recipe_id] = tf if previous is None else tuple(map(sum, zip(previous, tf)))
+        return merged
+
+    def search(self, query: str) -> Optional[list[tuple[str, float, dict[str, list[str]]]]]:
+        """Return ``(recipe id, score, hits)`` for recipes matching every word.
+
+        Best matches come first. Returns None when the query has no words.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return None
+        groups = [(word, self._word_postings(word)) for word in words]
+        # Walk the rarest word's postings and probe the others
+        by_size = sorted((postings for _, postings in groups), key=len)
+        matches = [rid for rid in by_size[0] if all(rid in postings for postings in by_size[1:])]
+        if not matches:
+            return []
+
+        total_docs = len(self._doc_terms)
+        averages = [max(total / total_docs, 1.0) for total in self._total_lengths]
+        idfs = [
+            math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for _, postings in groups
+        ]
+        results = []
+        for recipe_id in matches:
+            lengths = self._doc_lengths[recipe_id]
+            score = 0.0
+            hits: dict[str, list[str]] = {}
+            for (word, postings), idf in zip(groups, idfs):
+                weighted = 0.0
+                for position, tf in enumerate(postings[recipe_id]):
+                    if not tf:
+                        continue
+                    norm = 1 - BM25_B + BM25_B * lengths[position] / averages[position]
+                    weighted += FIELD_WEIGHTS[position] * tf / norm
+                    hits.setdefault(FIELDS[position], []).append(word)
+                score += idf * weighted * (BM25_K1 + 1) / (BM25_K1 + weighted)
+            results.append((recipe_id, score, hits))
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results
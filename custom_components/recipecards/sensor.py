@@ -2,16 +2,21 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from collections import Counter
+from typing import Any, Iterable, Optional
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN
+from .const import CONF_PERFORMANCE_METRICS, DATA_PERFORMANCE_SENSOR, DOMAIN
+from .images import display_image
+from .metrics import get_metrics
+from .models import Recipe
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,9 +29,17 @@ async def async_setup_entry(
     """Set up Recipe Cards sensor entities."""
     entry_data = hass.data[DOMAIN][config_entry.entry_id]
     coordinator = entry_data["coordinator"]
+    # Kept so the performance sensor can move to this entry later
+    entry_data["add_sensors"] = async_add_entities
     
     # Always expose the collection sensor for backward compatibility
     entities: list[SensorEntity] = [RecipeCardsCollectionSensor(coordinator, config_entry)]
+    # The metrics are domain-wide, so only one entry provides their sensor
+    if config_entry.options.get(CONF_PERFORMANCE_METRICS) and hass.data[DOMAIN].get(
+        DATA_PERFORMANCE_SENSOR, config_entry.entry_id
+    ) == config_entry.entry_id:
+        hass.data[DOMAIN][DATA_PERFORMANCE_SENSOR] = config_entry.entry_id
+        entities.append(RecipeCardsPerformanceSensor())
 
     # Track and add one sensor per recipe so each appears as its own device
     known_ids: set[str] = set()
@@ -51,8 +64,37 @@ async def async_setup_entry(
     coordinator.async_add_listener(_handle_update)
 
 
+def collection_stats(recipes: Iterable[Recipe]) -> dict[str, Any]:
+    """Summarize a collection: time ranges and recipes per colour.
+
+    Averages, minimums and maximums only count recipes that have the time
+    set; they are None when none do.
+    """
+    times: dict[str, list[int]] = {"prep_time": [], "cook_time": [], "total_time": []}
+    colors: Counter[str] = Counter()
+    for recipe in recipes:
+        colors[recipe.color] += 1
+        for key, values in times.items():
+            value = getattr(recipe, key)
+            if value is not None:
+                values.append(value)
+    stats: dict[str, Any] = {}
+    for key, values in times.items():
+        stats[f"avg_{key}"] = round(sum(values) / len(values), 1) if values else None
+        stats[f"min_{key}"] = min(values, default=None)
+        stats[f"max_{key}"] = max(values, default=None)
+    stats["color_counts"] = dict(colors)
+    return stats
+
+
 class RecipeCardsCollectionSensor(CoordinatorEntity, SensorEntity):
-    """Sensor that represents the collection for this config entry."""
+    """Sensor that represents the collection for this config entry.
+
+    Its attributes are summary statistics only; the recipes themselves are
+    served by the WebSocket API.
+    """
+
+    _unrecorded_attributes = frozenset({"color_counts"})
 
     def __init__(
         self,
@@ -84,24 +126,77 @@ class RecipeCardsCollectionSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return additional state attributes."""
-        if self.coordinator.data is None:
-            return {"recipes": []}
-        
-        return {
-            "recipes": [recipe.to_dict() for recipe in self.coordinator.data],
-            "avg_prep_time": sum(r.prep_time or 0 for r in self.coordinator.data) / len(self.coordinator.data) if self.coordinator.data else 0,
-        }
+        """Return summary statistics of the collection."""
+        attributes = collection_stats(self.coordinator.data or [])
+        attributes["recipe_count"] = len(self.coordinator.data or [])
+        attributes["revision"] = getattr(self.coordinator.data, "revision", None)
+        return attributes
+
+
+class RecipeCardsPerformanceSensor(SensorEntity):
+    """Slowest p95 latency across operations, with every operation's stats.
+
+    The metrics are domain-wide, so there is one of these however many
+    entries enable them; it belongs to the first such entry set up. It is
+    polled, so the metrics are read at most once per scan interval.
+    """
+
+    _attr_should_poll = True
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:speedometer"
+    _unrecorded_attributes = frozenset({"operations"})
+
+    _attr_name = "Recipe Cards performance"
+    _attr_unique_id = f"{DOMAIN}_performance"
+
+    @property
+    def available(self) -> bool:  # type: ignore[override]
+        return get_metrics(self.hass) is not None
+
+    @property
+    def native_value(self) -> Optional[float]:
+        metrics = get_metrics(self.hass)
+        operations = metrics.as_dict() if metrics is not None else {}
+        return max((stats["p95_ms"] for stats in operations.values()), default=None)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        metrics = get_metrics(self.hass)
+        return {"operations": metrics.as_dict() if metrics is not None else {}}
+
+
+@callback
+def async_move_performance_sensor(hass: HomeAssistant, entry_ids: Iterable[str]) -> None:
+    """Add the performance sensor through the first of entry_ids with its sensors set up.
+
+    Called after the entry that provided it unloads, so the sensor moves to
+    another entry collecting metrics without reloading that entry.
+    """
+    for entry_id in entry_ids:
+        add_sensors = hass.data[DOMAIN][entry_id].get("add_sensors")
+        if add_sensors is not None:
+            hass.data[DOMAIN][DATA_PERFORMANCE_SENSOR] = entry_id
+            add_sensors([RecipeCardsPerformanceSensor()])
+            return
 
 
 class RecipeSensor(CoordinatorEntity, SensorEntity):
     """One sensor per recipe so each appears as its own device."""
 
+    # The recipe text is in the state machine for templates and cards but
+    # kept out of the recorder database
+    _unrecorded_attributes = frozenset({"description", "ingredients", "instructions", "notes", "image"})
+
     def __init__(self, coordinator, config_entry: ConfigEntry, recipe_id: str) -> None:
         super().__init__(coordinator)
         self._config_entry = config_entry
         self._recipe_id = recipe_id
 
+        # What the last written state was based on; see _handle_coordinator_update
+        self._written = self._state_key()
+
         # Names and IDs fill in from current data at init; will update on refresh
         recipe = self._find()
         title = recipe.title if recipe else "Recipe"
@@ -110,13 +205,24 @@ class RecipeSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{config_entry.entry_id}_{recipe_id}"
         self._attr_icon = "mdi:note-text"
 
-    def _find(self):
+    def _find(self) -> Optional[Recipe]:
         if self.coordinator.data is None:
             return None
-        for r in self.coordinator.data:
-            if r.id == self._recipe_id:
-                return r
-        return None
+        return self.coordinator.data.get(self._recipe_id)
+
+    def _state_key(self) -> tuple[Optional[int], bool]:
+        data = self.coordinator.data
+        fingerprint = data.fingerprint(self._recipe_id) if data is not None else None
+        return fingerprint, self.coordinator.last_update_success
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this entity's recipe (or availability) changed."""
+        key = self._state_key()
+        if key == self._written:
+            return
+        self._written = key
+        self.async_write_ha_state()
 
     @property
     def name(self) -> str:  # type: ignore[override]
@@ -158,7 +264,7 @@ class RecipeSensor(CoordinatorEntity, SensorEntity):
         if recipe:
             data = recipe.to_dict()
             data.update({
-                "image": recipe.image,
+                "image": display_image(recipe.image),
                 "prep_time": recipe.prep_time,
                 "cook_time": recipe.cook_time,
                 "total_time": recipe.total_time,
@@ -1,19 +1,31 @@
 """Service calls for Recipe Cards integration."""
+import heapq
 import logging
+import os
+import zipfile
 import voluptuous as vol
 import uuid
+from functools import wraps
 from typing import Optional
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
-from .const import DOMAIN
+from homeassistant.helpers.json import json_bytes
+from .const import DOMAIN, EVENT_IMPORT_PROGRESS
+from .metrics import get_metrics
+from .importer import FORMATS, ImportSummary, detect_format, existing_hashes, iter_import_file, next_chunk
 from .models import Recipe
+from .pantry import DEFAULT_PANTRY_LIMIT, PantryMatch
+from .storage import locate_recipe
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_ADD_RECIPE = "add_recipe"
 SERVICE_UPDATE_RECIPE = "update_recipe"
 SERVICE_DELETE_RECIPE = "delete_recipe"
+SERVICE_WHAT_CAN_I_MAKE = "what_can_i_make"
+SERVICE_IMPORT_RECIPES = "import_recipes"
 
 ATTR_TITLE = "title"
 ATTR_DESCRIPTION = "description"
@@ -23,6 +35,10 @@ ATTR_INSTRUCTIONS = "instructions"
 ATTR_COLOR = "color"
 ATTR_RECIPE_ID = "recipe_id"
 ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_MAX_MISSING = "max_missing"
+ATTR_LIMIT = "limit"
+ATTR_PATH = "path"
+ATTR_FORMAT = "format"
 
 def validate_color(value) -> str:
     """Validate/normalize color to hex string.
@@ -110,6 +126,19 @@ DELETE_RECIPE_SCHEMA = vol.Schema({
     vol.Required(ATTR_RECIPE_ID): cv.string,
 })
 
+WHAT_CAN_I_MAKE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Required(ATTR_INGREDIENTS): vol.All(cv.ensure_list, [vol.All(cv.string, vol.Length(max=200))]),
+    vol.Optional(ATTR_MAX_MISSING): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(ATTR_LIMIT, default=DEFAULT_PANTRY_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+})
+
+IMPORT_RECIPES_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Required(ATTR_PATH): cv.string,
+    vol.Optional(ATTR_FORMAT): vol.In(FORMATS),
+})
+
 def _get_storage_and_coordinator(hass: HomeAssistant, config_entry_id: Optional[str] = None):
     """Get the storage and coordinator for a specific config entry or auto-detect.
 
@@ -158,6 +187,29 @@ def cleanup_recipe_entities(hass: HomeAssistant, entry_id: str, recipe_id: str)
         # Best-effort cleanup
         pass
 
+async def async_pantry_matches(
+    hass: HomeAssistant,
+    ingredients: list[str],
+    max_missing: Optional[int] = None,
+    limit: int = DEFAULT_PANTRY_LIMIT,
+    config_entry_id: Optional[str] = None,
+) -> list[tuple[str, Recipe, PantryMatch]]:
+    """Rank recipes of all (or one) recipe lists by missing ingredients.
+
+    Returns (entry_id, recipe, match) tuples, fewest missing first.
+    """
+    ranked = []
+    for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+        if not isinstance(entry_data, dict) or "storage" not in entry_data:
+            continue
+        if config_entry_id and entry_id != config_entry_id:
+            continue
+        matches = await entry_data["storage"].async_what_can_i_make(ingredients, max_missing, limit)
+        ranked.extend((entry_id, recipe, match) for recipe, match in matches)
+    return heapq.nsmallest(
+        limit, ranked, key=lambda item: (item[2].missing_count, -item[2].coverage)
+    )
+
 async def async_add_recipe(call: ServiceCall) -> None:
     """Handle add recipe service call."""
     config_entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
@@ -190,12 +242,11 @@ async def async_add_recipe(call: ServiceCall) -> None:
     )
     
     await storage.async_add_recipe(recipe)
-    await coordinator.async_request_refresh()
     _LOGGER.info("Added recipe: %s", recipe.title)
 
 async def async_update_recipe(call: ServiceCall) -> None:
     """Handle update recipe service call."""
-    config_entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    config_entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID) or locate_recipe(call.hass, call.data[ATTR_RECIPE_ID])
     storage, coordinator, entry_id = _get_storage_and_coordinator(call.hass, config_entry_id)
 
     if not storage or not coordinator:
@@ -206,8 +257,7 @@ async def async_update_recipe(call: ServiceCall) -> None:
         return
 
     recipe_id = call.data[ATTR_RECIPE_ID]
-    recipes = await storage.async_load_recipes()
-    existing_recipe = next((r for r in recipes if r.id == recipe_id), None)
+    existing_recipe = storage.get(recipe_id)
     
     if not existing_recipe:
         _LOGGER.error("Recipe not found: %s", recipe_id)
@@ -227,12 +277,11 @@ async def async_update_recipe(call: ServiceCall) -> None:
     updated_recipe = Recipe.from_dict(updated_recipe_data)
     
     await storage.async_update_recipe(recipe_id, updated_recipe)
-    await coordinator.async_request_refresh()
     _LOGGER.info("Updated recipe: %s", recipe_id)
 
 async def async_delete_recipe(call: ServiceCall) -> None:
     """Handle delete recipe service call."""
-    config_entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    config_entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID) or locate_recipe(call.hass, call.data[ATTR_RECIPE_ID])
     storage, coordinator, entry_id = _get_storage_and_coordinator(call.hass, config_entry_id)
 
     if not storage or not coordinator:
@@ -247,9 +296,108 @@ async def async_delete_recipe(call: ServiceCall) -> None:
     # Remove the per-recipe entity if present
     if entry_id:
         cleanup_recipe_entities(call.hass, entry_id, recipe_id)
-    await coordinator.async_request_refresh()
     _LOGGER.info("Deleted recipe: %s", recipe_id)
 
+async def async_what_can_i_make(call: ServiceCall) -> ServiceResponse:
+    """Handle the what-can-I-make service call and return the ranked recipes."""
+    matches = await async_pantry_matches(
+        call.hass,
+        call.data[ATTR_INGREDIENTS],
+        call.data.get(ATTR_MAX_MISSING),
+        call.data[ATTR_LIMIT],
+        call.data.get(ATTR_CONFIG_ENTRY_ID),
+    )
+    return {
+        "recipes": [
+            {
+                "recipe_id": recipe.id,
+                "title": recipe.title,
+                "config_entry_id": entry_id,
+                "missing_count": match.missing_count,
+                "coverage": match.coverage,
+                "matched": match.matched,
+                "missing": match.missing,
+            }
+            for entry_id, recipe, match in matches
+        ]
+    }
+
+async def async_import_recipes(call: ServiceCall) -> ServiceResponse:
+    """Handle the import service call: stream a local file into a recipe list.
+
+    The file is parsed in the executor a chunk at a time. Recipes whose
+    content matches one already in the list (or earlier in the file) are
+    skipped. Each chunk is one storage batch: it is saved, listeners are
+    notified once and progress is fired on the bus before the next is read.
+    """
+    hass = call.hass
+    path = call.data[ATTR_PATH]
+    if not hass.config.is_allowed_path(path):
+        raise ServiceValidationError(f"Access to {path} is not allowed; add it to allowlist_external_dirs")
+    file_format = call.data.get(ATTR_FORMAT) or detect_format(path)
+    if file_format is None:
+        raise ServiceValidationError(f"Cannot tell the format of {path}; pass one of {', '.join(FORMATS)}")
+    if not await hass.async_add_executor_job(os.path.isfile, path):
+        raise ServiceValidationError(f"File not found: {path}")
+    storage, _coordinator, entry_id = _get_storage_and_coordinator(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+    if not storage:
+        raise ServiceValidationError("No RecipeCards recipe list found")
+
+    recipes = await storage.async_load_recipes()
+    seen = await hass.async_add_executor_job(existing_hashes, recipes)
+    summary = ImportSummary()
+
+    def _progress(done: bool) -> None:
+        hass.bus.async_fire(
+            EVENT_IMPORT_PROGRESS,
+            {"path": path, "config_entry_id": entry_id, "done": done, **summary.as_dict()},
+        )
+
+    items = iter_import_file(path, file_format)
+    try:
+        while chunk := await hass.async_add_executor_job(next_chunk, items):
+            async with storage.async_batch():
+                for item in chunk:
+                    if item.error is not None:
+                        summary.add_error(item.error)
+                    elif item.content_hash in seen:
+                        summary.duplicates += 1
+                    else:
+                        seen.add(item.content_hash)
+                        # Imported durations win; the text only fills the missing ones
+                        await storage.async_add_recipe(item.recipe, keep_times=True)
+                        summary.imported += 1
+            # What the progress event reports is saved and visible to sensors
+            await storage.async_flush()
+            _progress(False)
+    except (OSError, ValueError, zipfile.BadZipFile) as err:
+        # The file itself is unreadable past this point; keep what was imported
+        _LOGGER.error("Import of %s stopped: %s", path, err)
+        summary.add_error(str(err))
+    finally:
+        await hass.async_add_executor_job(items.close)
+    _progress(True)
+    _LOGGER.info(
+        "Imported %s recipes from %s (%s duplicates, %s failed)",
+        summary.imported, path, summary.duplicates, summary.failed,
+    )
+    return {"config_entry_id": entry_id, **summary.as_dict()}
+
+def _metered(service: str, handler):
+    """Record the latency and response size of a service while metrics are on."""
+    @wraps(handler)
+    async def _async_metered(call: ServiceCall):
+        metrics = get_metrics(call.hass)
+        if metrics is None:
+            return await handler(call)
+        with metrics.measure(f"{DOMAIN}.{service}") as measurement:
+            response = await handler(call)
+            if response is not None:
+                measurement.size = len(json_bytes(response))
+        return response
+
+    return _async_metered
+
 async def async_register_services(hass: HomeAssistant) -> None:
     """Register Recipe Cards services."""
     if hass.services.has_service(DOMAIN, SERVICE_ADD_RECIPE):
@@ -258,13 +406,27 @@ async def async_register_services(hass: HomeAssistant) -> None:
     _LOGGER.info("Registering Recipe Cards services")
     
     hass.services.async_register(
-        DOMAIN, SERVICE_ADD_RECIPE, async_add_recipe, schema=ADD_RECIPE_SCHEMA
+        DOMAIN, SERVICE_ADD_RECIPE, _metered(SERVICE_ADD_RECIPE, async_add_recipe), schema=ADD_RECIPE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_UPDATE_RECIPE, _metered(SERVICE_UPDATE_RECIPE, async_update_recipe), schema=UPDATE_RECIPE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DELETE_RECIPE, _metered(SERVICE_DELETE_RECIPE, async_delete_recipe), schema=DELETE_RECIPE_SCHEMA
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_UPDATE_RECIPE, async_update_recipe, schema=UPDATE_RECIPE_SCHEMA
+        DOMAIN,
+        SERVICE_WHAT_CAN_I_MAKE,
+        _metered(SERVICE_WHAT_CAN_I_MAKE, async_what_can_i_make),
+        schema=WHAT_CAN_I_MAKE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_DELETE_RECIPE, async_delete_recipe, schema=DELETE_RECIPE_SCHEMA
+        DOMAIN,
+        SERVICE_IMPORT_RECIPES,
+        _metered(SERVICE_IMPORT_RECIPES, async_import_recipes),
+        schema=IMPORT_RECIPES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
 async def async_remove_services(hass: HomeAssistant) -> None:
@@ -276,3 +438,5 @@ async def async_remove_services(hass: HomeAssistant) -> None:
     hass.services.async_remove(DOMAIN, SERVICE_ADD_RECIPE)
     hass.services.async_remove(DOMAIN, SERVICE_UPDATE_RECIPE)
     hass.services.async_remove(DOMAIN, SERVICE_DELETE_RECIPE)
+    hass.services.async_remove(DOMAIN, SERVICE_WHAT_CAN_I_MAKE)
+    hass.services.async_remove(DOMAIN, SERVICE_IMPORT_RECIPES)
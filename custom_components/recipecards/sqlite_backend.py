@@ -0,0 +1,304 @@
+"""SQLite storage engine for Recipe Cards.
+
+Recipes live in ``.storage/recipecards_<entry>.db``: one row per recipe with
+indexed id, title and time columns next to the full JSON document, plus an
+FTS5 table over the text fields for ranked search. Changes are coalesced
+per recipe and written in a single transaction after ``save_delay``
+seconds. The connection is only used from executor jobs, one at a time.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .backend import SnapshotFunc, StorageBackend
+from .models import Recipe
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS recipes (
+        rowid INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        position INTEGER NOT NULL,
+        title TEXT NOT NULL DEFAULT '',
+        prep_time INTEGER,
+        cook_time INTEGER,
+        total_time INTEGER,
+        data TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS recipes_position ON recipes(position)",
+    "CREATE INDEX IF NOT EXISTS recipes_title ON recipes(title COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS recipes_prep_time ON recipes(prep_time)",
+    "CREATE INDEX IF NOT EXISTS recipes_cook_time ON recipes(cook_time)",
+    "CREATE INDEX IF NOT EXISTS recipes_total_time ON recipes(total_time)",
+)
+# FTS rows share the rowid of their recipes row
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5("
+    "title, description, ingredients, instructions, notes, "
+    "tokenize='porter unicode61')"
+)
+
+_UPSERT = """INSERT INTO recipes (id, position, title, prep_time, cook_time, total_time, data)
+    VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM recipes), ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title,
+        prep_time = excluded.prep_time,
+        cook_time = excluded.cook_time,
+        total_time = excluded.total_time,
+        data = excluded.data"""
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def database_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the SQLite database path for a config entry."""
+    return hass.config.path(".storage", f"recipecards_{entry_id}.db")
+
+
+def fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every term must match as a prefix."""
+    return " AND ".join(f'"{term}"*' for term in _TERM_RE.findall(query.casefold()))
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _columns(data: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the indexed column values for a recipe dict."""
+    return (
+        str(data.get("title") or ""),
+        _int_or_none(data.get("prep_time")),
+        _int_or_none(data.get("cook_time")),
+        _int_or_none(data.get("total_time")),
+    )
+
+
+def _fts_columns(data: dict[str, Any]) -> tuple[str, ...]:
+    """Return the full-text column values for a recipe dict."""
+    return (
+        str(data.get("title") or ""),
+        str(data.get("description") or ""),
+        "\n".join(str(i) for i in data.get("ingredients") or []),
+        "\n".join(str(i) for i in data.get("instructions") or []),
+        str(data.get("notes") or ""),
+    )
+
+
+class SqliteBackend(StorageBackend):
+    """One SQLite database per config entry, with FTS5 search."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        snapshot: SnapshotFunc,
+        save_delay: float,
+    ) -> None:
+        super().__init__(snapshot)
+        self._hass = hass
+        self._path = database_path(hass, entry_id)
+        self._save_delay = save_delay
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fts = False
+        # id -> (delete the stored row first, serialized recipe or None for
+        # a delete); the latest change wins
+        self._pending: dict[str, tuple[bool, Optional[bytes]]] = {}
+        self._lock = asyncio.Lock()
+        self._write_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    @property
+    def path(self) -> str:
+        """Return the database file path."""
+        return self._path
+
+    @property
+    def full_text(self) -> bool:
+        """Return True if the SQLite build supports the FTS5 index."""
+        return self._fts
+
+    # -- executor side -------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                try:
+                    conn.execute(_FTS_SCHEMA)
+                    self._fts = True
+                except sqlite3.OperationalError:
+                    _LOGGER.warning("SQLite has no FTS5 support; recipe search will scan titles")
+            self._conn = conn
+        return self._conn
+
+    def _load(self) -> Optional[list[dict[str, Any]]]:
+        if self._conn is None and not os.path.exists(self._path):
+            return None
+        conn = self._connect()
+        return [json_loads(row[0]) for row in conn.execute("SELECT data FROM recipes ORDER BY position")]
+
+    def _put(self, conn: sqlite3.Connection, recipe_id: str, raw: bytes, position: Optional[int] = None) -> None:
+        data = json_loads(raw)
+        if position is None:
+            conn.execute(_UPSERT, (recipe_id, *_columns(data), raw.decode()))
+        else:
+            conn.execute(
+                "INSERT INTO recipes (id, position, title, prep_time, cook_time, total_time, data)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (recipe_id, position, *_columns(data), raw.decode()),
+            )
+        if self._fts:
+            (rowid,) = conn.execute("SELECT rowid FROM recipes WHERE id = ?", (recipe_id,)).fetchone()
+            conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", (rowid,))
+            conn.execute(
+                "INSERT INTO recipes_fts (rowid, title, description, ingredients, instructions, notes)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (rowid, *_fts_columns(data)),
+            )
+
+    def _delete(self, conn: sqlite3.Connection, recipe_id: str) -> None:
+        row = conn.execute("SELECT rowid FROM recipes WHERE id = ?", (recipe_id,)).fetchone()
+        if row is None:
+            return
+        if self._fts:
+            conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", row)
+        conn.execute("DELETE FROM recipes WHERE rowid = ?", row)
+
+    def _write(self, changes: list[tuple[str, tuple[bool, Optional[bytes]]]]) -> None:
+        conn = self._connect()
+        with conn:
+            for recipe_id, (delete, raw) in changes:
+                if delete:
+                    self._delete(conn, recipe_id)
+                if raw is not None:
+                    self._put(conn, recipe_id, raw)
+
+    def _replace_all(self, rows: list[tuple[str, bytes]]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM recipes")
+            if self._fts:
+                conn.execute("DELETE FROM recipes_fts")
+            for position, (recipe_id, raw) in enumerate(rows):
+                self._put(conn, recipe_id, raw, position)
+
+    def _search(self, query: str, max_time: Optional[int]) -> list[str]:
+        conn = self._connect()
+        params: list[Any] = []
+        where: list[str] = []
+        if max_time is not None:
+            # Recipes without a parsed total time count as quick, as before
+            where.append("(r.total_time IS NULL OR r.total_time <= ?)")
+        match = fts_query(query)
+        if match and self._fts:
+            sql = "SELECT r.id FROM recipes_fts JOIN recipes r ON r.rowid = recipes_fts.rowid WHERE recipes_fts MATCH ?"
+            params.append(match)
+            if where:
+                sql += " AND " + " AND ".join(where)
+            sql += " ORDER BY bm25(recipes_fts)"
+        else:
+            if query:
+                where.insert(0, "r.title LIKE ?")
+                params.append(f"%{query}%")
+            sql = "SELECT r.id FROM recipes r"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY r.position"
+        if max_time is not None:
+            params.append(max_time)
+        return [row[0] for row in conn.execute(sql, params)]
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # -- event loop side -----------------------------------------------
+
+    async def async_load(self) -> Optional[list[dict[str, Any]]]:
+        async with self._lock:
+            return await self._hass.async_add_executor_job(self._load)
+
+    def _record(self, recipe_id: str, raw: Optional[bytes]) -> None:
+        previous = self._pending.get(recipe_id)
+        if previous is not None and previous[1] is None:
+            # Deleted and re-added: goes to the end, as it does in memory
+            del self._pending[recipe_id]
+        delete = raw is None or (previous is not None and previous[0])
+        self._pending[recipe_id] = (delete, raw)
+        if self._write_handle is None:
+            self._write_handle = self._hass.loop.call_later(self._save_delay, self._start_write)
+
+    def _start_write(self) -> None:
+        self._write_handle = None
+        self._hass.async_create_task(self.async_flush())
+
+    def record_upsert(self, recipe: Recipe) -> None:
+        self._record(recipe.id, recipe.to_json())
+
+    def record_delete(self, recipe_id: str) -> None:
+        self._record(recipe_id, None)
+
+    async def async_flush(self) -> None:
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._write_handle = None
+        async with self._lock:
+            if not self._pending:
+                return
+            changes = list(self._pending.items())
+            self._pending = {}
+            try:
+                await self._hass.async_add_executor_job(self._write, changes)
+            except sqlite3.Error as err:
+                _LOGGER.error("Error writing recipes to %s: %s", self._path, err)
+                # Keep the failed changes unless newer ones superseded them
+                for recipe_id, change in changes:
+                    self._pending.setdefault(recipe_id, change)
+
+    async def async_save_all(self) -> None:
+        async with self._lock:
+            self._pending.clear()
+            await self._async_replace_all(self._snapshot())
+
+    async def async_import(self, data: list[dict[str, Any]]) -> None:
+        async with self._lock:
+            self._pending.clear()
+            await self._async_replace_all(data)
+
+    async def _async_replace_all(self, data: list[dict[str, Any]]) -> None:
+        rows = [(str(d.get("id")), json_bytes(d)) for d in data if d.get("id")]
+        await self._hass.async_add_executor_job(self._replace_all, rows)
+
+    async def async_search(self, query: str, max_time: Optional[int] = None) -> list[str]:
+        """Return ids of matching recipes, best match first (FTS5 bm25)."""
+        await self.async_flush()
+        async with self._lock:
+            return await self._hass.async_add_executor_job(self._search, query, max_time)
+
+    async def async_close(self) -> None:
+        await self.async_flush()
+        async with self._lock:
+            await self._hass.async_add_executor_job(self._close)
@@ -1,25 +1,192 @@
-from typing import Awaitable, Callable, Optional
+import asyncio
+import bisect
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.storage import Store
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN
+from .backend import SnapshotFunc, StorageBackend
+from .const import (
+    DATA_RECIPE_LOCATOR,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_STORAGE_ENGINE,
+    DOMAIN,
+    ENGINE_JOURNAL,
+    ENGINE_SQLITE,
+    SIGNAL_RECIPES_CHANGED,
+)
+from .images import ImageStore, image_id_from_ref, is_inline_image, ref_from_image_url
+from .journal_backend import JournalBackend, async_consume_journal, async_remove_journal
+from .metrics import measure
 from .models import Recipe
+from .pantry import DEFAULT_PANTRY_LIMIT, PantryIndex, PantryMatch
+from .search import SearchIndex, SearchResult, match_recipe, tokenize
+from .sqlite_backend import SqliteBackend
 
 STORAGE_VERSION = 1
+# Collections up to this size are indexed for search right away on load;
+# larger ones in a background task, with a fallback until it is done
+INDEX_SYNC_LIMIT = 500
+INDEX_BATCH_SIZE = 250
+# Changes remembered per collection for since_revision delta replies
+CHANGELOG_SIZE = 1000
 
-class RecipeStorage:
-    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+CHANGE_ADDED = "added"
+CHANGE_UPDATED = "updated"
+CHANGE_REMOVED = "removed"
+# The whole collection was (re)loaded from disk
+CHANGE_RESET = "reset"
+
+# Revisions are shared by all collections and seeded from the clock, so a
+# revision from before a restart is always older than any handed out after
+_REVISIONS = itertools.count(time.time_ns() // 1_000_000)
+
+
+def next_revision() -> int:
+    """Return a revision newer than every one handed out so far."""
+    return next(_REVISIONS)
+
+
+class RecipeLocator:
+    """Recipe id -> id of the config entry holding it, across loaded entries.
+
+    Not a dict, so it is never mistaken for an entry's data in
+    ``hass.data[DOMAIN]``. With the same id in two entries only one is
+    mapped; lookups that miss fall back to a scan.
+    """
+
+    def __init__(self) -> None:
+        self._owners: dict[str, str] = {}
+
+    def get(self, recipe_id: str) -> Optional[str]:
+        return self._owners.get(recipe_id)
+
+    def assign(self, recipe_ids: Iterable[str], entry_id: str) -> None:
+        self._owners.update(dict.fromkeys(recipe_ids, entry_id))
+
+    def release(self, recipe_id: str, entry_id: str) -> None:
+        """Forget a recipe if ``entry_id`` is the entry it is mapped to."""
+        if self._owners.get(recipe_id) == entry_id:
+            del self._owners[recipe_id]
+
+    def as_dict(self) -> dict[str, str]:
+        return dict(self._owners)
+
+
+def get_locator(hass: HomeAssistant) -> RecipeLocator:
+    """Return the domain-wide RecipeLocator, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    locator = domain_data.get(DATA_RECIPE_LOCATOR)
+    if not isinstance(locator, RecipeLocator):
+        locator = domain_data[DATA_RECIPE_LOCATOR] = RecipeLocator()
+    return locator
+
+
+def locate_recipe(hass: HomeAssistant, recipe_id: str) -> Optional[str]:
+    """Return the id of the config entry holding a recipe, if it is loaded.
+
+    The locator maps an id to one entry only, so when that entry no longer
+    holds it (another entry with the same id lost it) the loaded entries
+    are scanned and the locator is pointed at the one found.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    locator = domain_data.get(DATA_RECIPE_LOCATOR)
+    entry_id = locator.get(recipe_id) if isinstance(locator, RecipeLocator) else None
+    if entry_id is not None and _holds(domain_data.get(entry_id), recipe_id):
+        return entry_id
+    for entry_id, entry_data in list(domain_data.items()):
+        if _holds(entry_data, recipe_id):
+            get_locator(hass).assign((recipe_id,), entry_id)
+            return entry_id
+    return None
+
+
+def _holds(entry_data: Any, recipe_id: str) -> bool:
+    return isinstance(entry_data, dict) and "storage" in entry_data and entry_data["storage"].contains(recipe_id)
+
+
+@dataclass(frozen=True)
+class RecipeChange:
+    """One mutation of a RecipeStorage, as sent on SIGNAL_RECIPES_CHANGED."""
+
+    kind: str
+    revision: int
+    recipe_id: Optional[str] = None
+    recipe: Optional[Recipe] = None
+
+
+@dataclass(frozen=True)
+class RecipeSnapshot:
+    """An immutable view of a collection, published as coordinator data.
+
+    Iterating yields the recipes in display order. ``fingerprints`` maps
+    each id to the revision at which that recipe last changed, so a
+    listener can tell whether its own recipe changed without comparing
+    contents.
+    """
+
+    revision: int
+    by_id: dict[str, Recipe]
+    fingerprints: dict[str, int]
+
+    def __iter__(self) -> Iterator[Recipe]:
+        return iter(self.by_id.values())
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, recipe_id: str) -> Optional[Recipe]:
+        """Return a recipe by id."""
+        return self.by_id.get(recipe_id)
+
+    def fingerprint(self, recipe_id: str) -> Optional[int]:
+        """Return the revision at which a recipe last changed, or None if absent."""
+        return self.fingerprints.get(recipe_id)
+
+
+class JsonStoreBackend(StorageBackend):
+    """The whole collection as one JSON document in a Home Assistant Store.
+
+    This is the default engine. Changes mark the document dirty and the
+    Store rewrites it after ``save_delay`` seconds, so bursts of edits cost
+    one write.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        snapshot: SnapshotFunc,
+        save_delay: float = DEFAULT_SAVE_DELAY,
+        fold_journal: bool = True,
+    ) -> None:
+        super().__init__(snapshot)
+        self._hass = hass
+        self._entry_id = entry_id
         # New preferred filename
-        self._store = Store(hass, STORAGE_VERSION, f"recipecards_{entry_id}.json")
+        # Written atomically: the journal engine replays over this file
+        self._store = Store(hass, STORAGE_VERSION, f"recipecards_{entry_id}.json", atomic_writes=True)
         # Legacy filename for migration support
         self._legacy_store = Store(hass, STORAGE_VERSION, f".{DOMAIN}.{entry_id}.json")
-        self._recipes: list[Recipe] = []
-        self._update_cb: Optional[Callable[[], Awaitable[None]]] = None
+        self._save_delay = save_delay
+        self._fold_journal = fold_journal
+        self._dirty = False
 
-    def set_update_callback(self, cb: Callable[[], Awaitable[None]]) -> None:
-        """Set a callback to be awaited whenever recipes change."""
-        self._update_cb = cb
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @property
+    def path(self) -> Optional[str]:
+        """Return the Store file path."""
+        return getattr(self._store, "path", None)
 
-    async def async_load_recipes(self) -> list[Recipe]:
+    async def async_load(self) -> Optional[list[dict[str, Any]]]:
         data = await self._store.async_load()
         # Migrate from legacy storage if needed
         if data is None:
@@ -28,53 +195,602 @@ class RecipeStorage:
             # Persist to new store if we loaded legacy data
             if legacy:
                 await self._store.async_save(legacy)
-        self._recipes = [Recipe.from_dict(d) for d in data]
-        return self._recipes
+        if self._fold_journal:
+            # Switching back from the journal engine: fold its records in
+            merged = await async_consume_journal(self._hass, self._entry_id, data)
+            if merged is not None:
+                await self._store.async_save(merged)
+                await async_remove_journal(self._hass, self._entry_id)
+                data = merged
+        return data
+
+    def _data_to_save(self) -> list[dict[str, Any]]:
+        """Serialize the collection; called by the Store when it writes."""
+        self._dirty = False
+        return self._snapshot()
+
+    def _schedule_save(self) -> None:
+        """Mark the document dirty and let the Store write it after the delay."""
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, self._save_delay)
+
+    def record_upsert(self, recipe: Recipe) -> None:
+        self._schedule_save()
+
+    def record_delete(self, recipe_id: str) -> None:
+        self._schedule_save()
+
+    async def async_flush(self) -> None:
+        if self._dirty:
+            await self.async_save_all()
+
+    async def async_save_all(self) -> None:
+        await self._store.async_save(self._data_to_save())
+
+    async def async_import(self, data: list[dict[str, Any]]) -> None:
+        self._dirty = False
+        await self._store.async_save(data)
+
+
+class RecipeStorage:
+    """In-memory recipe collection for one config entry.
+
+    Recipes are read from disk once (on first load) and then served from
+    memory. Mutations update the in-memory collection and report the change
+    to a storage engine, which persists it after ``save_delay`` seconds so
+    bursts of edits are coalesced. ``async_flush()`` writes pending changes
+    immediately and ``invalidate()`` forces the next load to hit the disk.
+
+    Engines: ``json`` (default) rewrites one Store document; ``journal``
+    appends per-recipe records and compacts in the background; ``sqlite``
+    keeps one row per recipe and answers searches from an FTS5 index.
+
+    Every mutation is announced as a ``RecipeChange`` on the
+    ``SIGNAL_RECIPES_CHANGED`` dispatcher signal, with the entry id.
+
+    A full-text ``SearchIndex`` and an ingredient ``PantryIndex`` over the
+    collection are kept in step with every mutation and rebuilt after each
+    load.
+
+    When an ``ImageStore`` is given, inline base64 images are moved into it
+    on add/update (and on load, for existing data) and recipes keep only a
+    reference to the stored blob.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        save_delay: float = DEFAULT_SAVE_DELAY,
+        images: Optional[ImageStore] = None,
+        engine: str = DEFAULT_STORAGE_ENGINE,
+    ) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
+        self._save_delay = save_delay
+        self._engine = engine
+        self._backend = self._create_backend(engine)
+        # Ordered id -> Recipe index; dict insertion order is the display order
+        self._recipes: dict[str, Recipe] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._revision = 0
+        # (revision, recipe id) per change since _changelog_floor, oldest first
+        self._changelog: deque[tuple[int, str]] = deque(maxlen=CHANGELOG_SIZE)
+        self._changelog_floor = 0
+        # Revision at which each recipe last changed (its fingerprint)
+        self._changed_at: dict[str, int] = {}
+        # Encoded recipes for API replies, dropped whenever the recipe changes
+        self._encoded: dict[str, bytes] = {}
+        self._images = images
+        # Stored images of recipes about to be added; see async_prepare_recipe
+        self._prepared_images: set[str] = set()
+        self._update_cb: Optional[Callable[[], Awaitable[None]]] = None
+        # Nesting depth of async_batch and whether it deferred a notification
+        self._batch_depth = 0
+        self._batch_changed = False
+        # Insertion sequence per recipe, for keyset pagination; the parallel
+        # lists are in sequence order and keep stale entries until compacted
+        self._seqs: dict[str, int] = {}
+        self._order_ids: list[str] = []
+        self._order_seqs: list[int] = []
+        self._next_seq = 0
+        self._index = SearchIndex()
+        self._pantry = PantryIndex()
+        self._index_ready = False
+        self._index_generation = 0
+
+    @property
+    def loaded(self) -> bool:
+        """Return True once recipes have been read from disk."""
+        return self._loaded
+
+    @property
+    def engine(self) -> str:
+        """Return the name of the storage engine in use."""
+        return self._engine
+
+    @property
+    def dirty(self) -> bool:
+        """Return True if there are changes not yet written to disk."""
+        return self._backend.dirty
+
+    @property
+    def revision(self) -> int:
+        """Return a counter that increases on every load or mutation."""
+        return self._revision
+
+    @property
+    def index_ready(self) -> bool:
+        """Return True once searches are answered (and ranked) by the search index."""
+        return self._index_ready
+
+    def changes_since(self, revision: int) -> Optional[list[str]]:
+        """Return the ids of recipes changed after ``revision``, oldest first.
+
+        Returns None when the changelog no longer reaches back that far (it
+        was truncated or the collection was reloaded); the caller then needs
+        the whole collection.
+        """
+        if revision < self._changelog_floor:
+            return None
+        changed: list[str] = []
+        for change_revision, recipe_id in reversed(self._changelog):
+            if change_revision <= revision:
+                break
+            changed.append(recipe_id)
+        return list(dict.fromkeys(reversed(changed)))
+
+    def _record(self, recipe_id: Optional[str]) -> None:
+        """Advance the revision and log which recipe changed (None: all of them)."""
+        self._revision = next_revision()
+        if recipe_id is None:
+            self._encoded.clear()
+            self._changed_at = dict.fromkeys(self._recipes, self._revision)
+            get_locator(self._hass).assign(self._recipes, self._entry_id)
+            self._changelog.clear()
+            self._changelog_floor = self._revision
+            return
+        self._encoded.pop(recipe_id, None)
+        locator = get_locator(self._hass)
+        if recipe_id in self._recipes:
+            self._changed_at[recipe_id] = self._revision
+            locator.assign((recipe_id,), self._entry_id)
+        else:
+            self._changed_at.pop(recipe_id, None)
+            locator.release(recipe_id, self._entry_id)
+        if len(self._changelog) == self._changelog.maxlen:
+            # The oldest change is about to drop out
+            self._changelog_floor = self._changelog[0][0]
+        self._changelog.append((self._revision, recipe_id))
+
+    def recipe_json(self, recipe_id: str) -> Optional[bytes]:
+        """Return a recipe encoded as a JSON object, cached until it changes.
+
+        A stored image is left out: its URL is signed per client.
+        """
+        encoded = self._encoded.get(recipe_id)
+        if encoded is None:
+            recipe = self._recipes.get(recipe_id)
+            if recipe is None:
+                return None
+            if image_id_from_ref(recipe.image) is None:
+                encoded = recipe.to_json()
+            else:
+                data = recipe.to_dict()
+                del data["image"]
+                encoded = json_bytes(data)
+            self._encoded[recipe_id] = encoded
+        return encoded
+
+    def snapshot(self) -> RecipeSnapshot:
+        """Return the cached collection as an immutable snapshot."""
+        return RecipeSnapshot(self._revision, dict(self._recipes), dict(self._changed_at))
+
+    def _unlocate_all(self) -> None:
+        """Drop this collection's recipes from the domain-wide map."""
+        locator = get_locator(self._hass)
+        for recipe_id in self._recipes:
+            locator.release(recipe_id, self._entry_id)
+
+    @property
+    def recipes(self) -> list[Recipe]:
+        """Return a snapshot of the cached recipes without touching disk."""
+        return list(self._recipes.values())
+
+    def get(self, recipe_id: str) -> Optional[Recipe]:
+        """Return the cached recipe with this id, or None."""
+        return self._recipes.get(recipe_id)
+
+    def contains(self, recipe_id: str) -> bool:
+        """Return True if a recipe with this id is cached."""
+        return recipe_id in self._recipes
+
+    def seq(self, recipe_id: str) -> Optional[int]:
+        """Return the insertion sequence number of a cached recipe."""
+        return self._seqs.get(recipe_id)
+
+    def page(self, after_seq: int = 0, limit: Optional[int] = None) -> list[tuple[int, Recipe]]:
+        """Return ``(seq, recipe)`` pairs after ``after_seq``, in display order.
+
+        Sequence numbers only grow and survive updates, so paging by the
+        last seen one neither repeats nor skips recipes when others are
+        added or removed in between.
+        """
+        page: list[tuple[int, Recipe]] = []
+        order_ids, order_seqs = self._order_ids, self._order_seqs
+        for position in range(bisect.bisect_right(order_seqs, after_seq), len(order_ids)):
+            recipe_id, seq = order_ids[position], order_seqs[position]
+            if self._seqs.get(recipe_id) != seq:
+                continue  # Removed, or re-added under a newer sequence
+            page.append((seq, self._recipes[recipe_id]))
+            if limit is not None and len(page) >= limit:
+                break
+        return page
+
+    def _assign_seq(self, recipe_id: str) -> None:
+        self._next_seq += 1
+        self._seqs[recipe_id] = self._next_seq
+        self._order_ids.append(recipe_id)
+        self._order_seqs.append(self._next_seq)
+
+    def _compact_order(self) -> None:
+        """Drop stale entries from the sequence order without renumbering."""
+        live = [
+            (recipe_id, seq)
+            for recipe_id, seq in zip(self._order_ids, self._order_seqs)
+            if self._seqs.get(recipe_id) == seq
+        ]
+        self._order_ids = [recipe_id for recipe_id, _ in live]
+        self._order_seqs = [seq for _, seq in live]
+
+    def _reset_seqs(self) -> None:
+        """Number the collection in display order, continuing the sequence."""
+        self._seqs = {}
+        self._order_ids = []
+        self._order_seqs = []
+        for recipe_id in self._recipes:
+            self._assign_seq(recipe_id)
+
+    def replace(self, recipe_id: str, recipe: Recipe) -> bool:
+        """Swap the cached recipe in place, keeping its position.
+
+        Only touches the in-memory index; use ``async_update_recipe`` to also
+        persist and notify listeners.
+        """
+        if recipe_id not in self._recipes:
+            return False
+        # The index is keyed by id, so the replacement keeps the original id
+        recipe.id = recipe_id
+        self._recipes[recipe_id] = recipe
+        self._index_recipe(recipe)
+        self._record(recipe_id)
+        return True
+
+    def remove(self, recipe_id: str) -> Optional[Recipe]:
+        """Drop a recipe from the in-memory index and return it, if present."""
+        recipe = self._recipes.pop(recipe_id, None)
+        if recipe is not None:
+            self._index.remove(recipe_id)
+            self._pantry.remove(recipe_id)
+            del self._seqs[recipe_id]
+            if len(self._order_ids) > 2 * len(self._seqs) + 64:
+                self._compact_order()
+            self._record(recipe_id)
+        return recipe
+
+    def _create_backend(self, engine: str) -> StorageBackend:
+        hass, entry_id, save_delay = self._hass, self._entry_id, self._save_delay
+        if engine == ENGINE_SQLITE:
+            return SqliteBackend(hass, entry_id, self._serialize, save_delay)
+        store = JsonStoreBackend(
+            hass, entry_id, self._serialize, save_delay, fold_journal=engine != ENGINE_JOURNAL
+        )
+        if engine == ENGINE_JOURNAL:
+            return JournalBackend(hass, entry_id, self._serialize, store, save_delay)
+        return store
+
+    def _serialize(self) -> list[dict[str, Any]]:
+        """Return the collection as JSON-ready dicts for whole-collection writes."""
+        with measure(self._hass, "storage_serialize"):
+            return [r.to_dict() for r in self._recipes.values()]
+
+    def image_ids(self) -> set[str]:
+        """Return the ids of stored images referenced by this collection."""
+        ids = set(self._prepared_images)
+        for recipe in self._recipes.values():
+            image_id = image_id_from_ref(recipe.image)
+            if image_id:
+                ids.add(image_id)
+        return ids
+
+    def set_update_callback(self, cb: Callable[[], Awaitable[None]]) -> None:
+        """Set a callback to be awaited whenever recipes change."""
+        self._update_cb = cb
+
+    def invalidate(self) -> None:
+        """Drop the cache so the next load re-reads the Store from disk."""
+        self._loaded = False
+
+    async def async_load_recipes(self, force: bool = False) -> list[Recipe]:
+        """Return all recipes, reading from disk only if not cached yet."""
+        if self._loaded and not force:
+            return self.recipes
+        async with self._load_lock:
+            # Another caller may have finished loading while we waited
+            if self._loaded and not force:
+                return self.recipes
+            with measure(self._hass, "storage_load"):
+                data = await self._backend.async_load()
+                if data is None:
+                    # First start on this engine: one-shot import from the JSON store
+                    data = await self._create_backend(DEFAULT_STORAGE_ENGINE).async_load()
+                    await self._backend.async_import(data or [])
+                recipes = (Recipe.from_dict(d) for d in (data or []))
+                self._unlocate_all()
+                self._recipes = {r.id: r for r in recipes}
+                # Move images saved inline by older versions into the blob store
+                for recipe in self._recipes.values():
+                    if await self._async_store_image(recipe):
+                        self._backend.record_upsert(recipe)
+            self._loaded = True
+            self._record(None)
+            self._reset_seqs()
+            self._rebuild_index()
+            self._emit(CHANGE_RESET)
+        return self.recipes
+
+    def _index_recipe(self, recipe: Recipe) -> None:
+        self._index.add(recipe)
+        self._pantry.add(recipe)
+
+    def _rebuild_index(self) -> None:
+        """Index the freshly loaded collection, in the background if it is large."""
+        self._index.clear()
+        self._pantry.clear()
+        self._index_ready = False
+        self._index_generation += 1
+        if len(self._recipes) <= INDEX_SYNC_LIMIT:
+            for recipe in self._recipes.values():
+                self._index_recipe(recipe)
+            self._index_ready = True
+            return
+        self._hass.async_create_background_task(
+            self._async_build_index(self._index_generation),
+            f"recipecards search index {self._entry_id}",
+        )
+
+    async def _async_build_index(self, generation: int) -> None:
+        """Index the collection in batches, yielding to the event loop between them."""
+        recipe_ids = list(self._recipes)
+        for start in range(0, len(recipe_ids), INDEX_BATCH_SIZE):
+            if generation != self._index_generation:
+                return  # Reloaded meanwhile; a newer build took over
+            for recipe_id in recipe_ids[start:start + INDEX_BATCH_SIZE]:
+                recipe = self._recipes.get(recipe_id)
+                # Recipes changed since the build started are indexed already
+                if recipe is not None and recipe_id not in self._index:
+                    self._index_recipe(recipe)
+            await asyncio.sleep(0)
+        if generation == self._index_generation:
+            self._index_ready = True
+
+    async def _async_ensure_loaded(self) -> None:
+        if not self._loaded:
+            await self.async_load_recipes()
 
     async def async_save_recipes(self) -> None:
-        await self._store.async_save([r.to_dict() for r in (self._recipes or [])])
+        """Write the whole collection to disk now."""
+        with measure(self._hass, "storage_save"):
+            await self._backend.async_save_all()
+
+    async def async_flush(self) -> None:
+        """Write pending changes now instead of waiting for the save delay."""
+        if not self._backend.dirty:
+            await self._backend.async_flush()
+            return
+        with measure(self._hass, "storage_save"):
+            await self._backend.async_flush()
+
+    async def async_close(self) -> None:
+        """Write pending changes and release the engine (on unload)."""
+        self._unlocate_all()
+        await self._backend.async_close()
+
+    async def async_migrate_to(self, engine: str) -> None:
+        """Copy the current collection into another engine before switching to it."""
+        await self._async_ensure_loaded()
+        await self._backend.async_flush()
+        target = self._create_backend(engine)
+        try:
+            await target.async_import(self._serialize())
+        finally:
+            await target.async_close()
+        if engine != ENGINE_JOURNAL:
+            # The target now holds everything; a journal left behind would be
+            # replayed over newer data by a later switch to the json engine
+            await async_remove_journal(self._hass, self._entry_id)
+
+    async def async_search(self, query: str = "", max_time: Optional[int] = None) -> list[SearchResult]:
+        """Return recipes matching every word of ``query`` within ``max_time`` minutes.
+
+        Answered from the search index, best match first. Until the index
+        is built the engine's own search (sqlite) or a linear scan is used.
+        """
+        await self._async_ensure_loaded()
+        if not tokenize(query):
+            results = [SearchResult(r) for r in self._recipes.values()]
+        elif self._index_ready:
+            results = [
+                SearchResult(self._recipes[recipe_id], score, hits)
+                for recipe_id, score, hits in self._index.search(query) or ()
+            ]
+        else:
+            ids = await self._backend.async_search(query, max_time)
+            candidates = self._recipes.values() if ids is None else (
+                self._recipes[i] for i in ids if i in self._recipes
+            )
+            results = []
+            for recipe in candidates:
+                hits = match_recipe(recipe, query)
+                if hits is not None or ids is not None:
+                    results.append(SearchResult(recipe, hits=hits or {}))
+        if max_time is not None:
+            # Recipes without a parsed total time count as quick
+            results = [r for r in results if (r.recipe.total_time or 0) <= max_time]
+        return results
 
-    async def async_add_recipe(self, recipe: Recipe) -> None:
-        await self.async_load_recipes()  # Ensure we have latest data
-        self._recipes.append(recipe)
-        await self.async_save_recipes()
+    async def async_what_can_i_make(
+        self,
+        pantry: list[str],
+        max_missing: Optional[int] = None,
+        limit: Optional[int] = DEFAULT_PANTRY_LIMIT,
+    ) -> list[tuple[Recipe, PantryMatch]]:
+        """Return recipes ranked by how few ingredients ``pantry`` lacks."""
+        await self._async_ensure_loaded()
+        index = self._pantry
+        if not self._index_ready:
+            # Still building in the background: answer from a throwaway index
+            index = PantryIndex()
+            index.add_all(self._recipes.values())
+        return [
+            (self._recipes[match.recipe_id], match)
+            for match in index.query(pantry, max_missing, limit)
+        ]
 
-        # Parse times from instructions and notes
+    @staticmethod
+    def _apply_parsed_times(recipe: Recipe, keep_given: bool = False) -> None:
+        """Fill prep/cook/total times from instructions and notes.
+
+        With ``keep_given`` (imports, which carry their own durations) the
+        times given win; the text only fills those the source left empty,
+        and a missing total is the sum of prep and cook.
+        """
         text = "\n".join(recipe.instructions) + "\n" + (recipe.notes or "")
         parsed = recipe.parse_times(text)
-        recipe.prep_time = parsed['prep_time']
-        recipe.cook_time = parsed['cook_time']
-        recipe.total_time = parsed['total_time']
-        await self.async_save_recipes()
+        if not keep_given:
+            recipe.prep_time = parsed['prep_time']
+            recipe.cook_time = parsed['cook_time']
+            recipe.total_time = parsed['total_time']
+            return
+        for key in ('prep_time', 'cook_time', 'total_time'):
+            if getattr(recipe, key) is None:
+                setattr(recipe, key, parsed[key])
+        if recipe.total_time is None and (recipe.prep_time is not None or recipe.cook_time is not None):
+            recipe.total_time = (recipe.prep_time or 0) + (recipe.cook_time or 0)
+
+    async def _async_store_image(self, recipe: Recipe) -> bool:
+        """Swap an inline image for a blob reference; return True if swapped."""
+        if self._images is None:
+            return False
+        # Clients send back the image URL they were given for unchanged images
+        ref = ref_from_image_url(recipe.image)
+        if ref is not None:
+            recipe.image = ref
+            return True
+        if not is_inline_image(recipe.image):
+            return False
+        ref = await self._images.async_put_data_url(recipe.image)
+        if ref is None:
+            return False
+        recipe.image = ref
+        return True
+
+    async def async_prepare_recipe(self, recipe: Recipe) -> None:
+        """Store a recipe's inline image ahead of adding or updating it.
+
+        Adding the prepared recipe then does no I/O. Its image counts as
+        referenced until ``release_prepared()``, so garbage collection does
+        not remove it meanwhile.
+        """
+        await self._async_ensure_loaded()
+        if await self._async_store_image(recipe):
+            self._prepared_images.add(image_id_from_ref(recipe.image))
 
+    def release_prepared(self) -> None:
+        """Stop holding images stored by ``async_prepare_recipe``."""
+        if self._prepared_images:
+            self._prepared_images.clear()
+            # Recipes that were not added after all leave their images behind
+            if self._images is not None:
+                self._images.async_schedule_collect()
+
+    def _release_image(self, old: Optional[Recipe], new: Optional[Recipe] = None) -> None:
+        """Schedule blob cleanup when a mutation drops an image reference."""
+        if self._images is None or old is None or image_id_from_ref(old.image) is None:
+            return
+        if new is None or new.image != old.image:
+            self._images.async_schedule_collect()
+
+    async def async_add_recipe(self, recipe: Recipe, keep_times: bool = False) -> None:
+        """Add (or replace) a recipe; ``keep_times`` keeps times the text does not state."""
+        await self._async_ensure_loaded()
+        # Nothing may await between storing the blob and indexing the recipe,
+        # so garbage collection never sees the image unreferenced
+        await self._async_store_image(recipe)
+        self._apply_parsed_times(recipe, keep_times)
+        old = self._recipes.get(recipe.id)
+        kind = CHANGE_UPDATED if old is not None else CHANGE_ADDED
+        if kind == CHANGE_ADDED:
+            self._assign_seq(recipe.id)
+        self._recipes[recipe.id] = recipe
+        self._index_recipe(recipe)
+        self._record(recipe.id)
+        self._release_image(old, recipe)
+        self._backend.record_upsert(recipe)
+        self._emit(kind, recipe)
         await self._notify_update()
 
     async def async_update_recipe(self, recipe_id: str, updated_recipe: Recipe) -> bool:
-        await self.async_load_recipes()  # Ensure we have latest data
-        for idx, recipe in enumerate(self._recipes):
-            if recipe.id == recipe_id:
-                self._recipes[idx] = updated_recipe
-                await self.async_save_recipes()
-
-                # Parse times from updated instructions and notes
-                text = "\n".join(updated_recipe.instructions) + "\n" + (updated_recipe.notes or "")
-                parsed = updated_recipe.parse_times(text)
-                updated_recipe.prep_time = parsed['prep_time']
-                updated_recipe.cook_time = parsed['cook_time']
-                updated_recipe.total_time = parsed['total_time']
-                await self.async_save_recipes()
-
-                await self._notify_update()
-                return True
-        return False
+        await self._async_ensure_loaded()
+        old = self.get(recipe_id)
+        if old is None:
+            return False
+        await self._async_store_image(updated_recipe)
+        self._apply_parsed_times(updated_recipe)
+        if not self.replace(recipe_id, updated_recipe):
+            return False
+        self._release_image(old, updated_recipe)
+        self._backend.record_upsert(updated_recipe)
+        self._emit(CHANGE_UPDATED, updated_recipe)
+        await self._notify_update()
+        return True
 
     async def async_delete_recipe(self, recipe_id: str) -> None:
-        await self.async_load_recipes()  # Ensure we have latest data
-        self._recipes = [r for r in self._recipes if r.id != recipe_id]
-        await self.async_save_recipes()
+        await self._async_ensure_loaded()
+        removed = self.remove(recipe_id)
+        if removed is None:
+            return
+        self._release_image(removed)
+        self._backend.record_delete(recipe_id)
+        self._emit(CHANGE_REMOVED, recipe_id=recipe_id)
         await self._notify_update()
 
+    def _emit(self, kind: str, recipe: Optional[Recipe] = None, recipe_id: Optional[str] = None) -> None:
+        """Announce a change to subscribers at the current revision."""
+        change = RecipeChange(kind, self._revision, recipe.id if recipe else recipe_id, recipe)
+        async_dispatcher_send(self._hass, SIGNAL_RECIPES_CHANGED, self._entry_id, change)
+
+    @asynccontextmanager
+    async def async_batch(self) -> AsyncIterator[None]:
+        """Group several changes so listeners are notified once, at the end.
+
+        Writes are coalesced by the backend's save delay as usual, so the
+        whole batch is persisted together.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_changed:
+                self._batch_changed = False
+                await self._notify_update()
+
     async def _notify_update(self) -> None:
         """Notify Home Assistant of recipe updates."""
+        if self._batch_depth:
+            self._batch_changed = True
+            return
         if self._update_cb is not None:
             await self._update_cb()
@@ -0,0 +1,224 @@
+"""Find preparation, cooking, resting and total times in recipe text.
+
+One precompiled pattern tokenizes the text into labels ("prep time:",
+"bake", "rest"), durations ("20–25 min", "1 hr 30 min", "1½ hours",
+``PT1H30M``) and clause breaks, and a small state machine walks the tokens
+once: a duration counts towards the label before it in the same clause, and
+adjacent durations ("1 hr 30 min") add up. Explicit labels ("Cook time:
+40 min") win over times gathered from instruction verbs ("bake for 25
+minutes"), which are summed across steps. Ranges count as their upper end.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+_FRACTIONS = {
+    "½": 0.5, "⅓": 1 / 3, "⅔": 2 / 3, "¼": 0.25, "¾": 0.75,
+    "⅕": 0.2, "⅙": 1 / 6, "⅛": 0.125, "⅜": 0.375, "⅝": 0.625, "⅞": 0.875,
+}
+_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "fifteen": 15, "twenty": 20, "thirty": 30, "forty": 40, "forty-five": 45, "ninety": 90,
+}
+_UNIT_MINUTES = {"h": 60.0, "m": 1.0, "s": 1 / 60}
+_LABEL_FORMS = {
+    "prep": ("prep", "preparation"),
+    "cook": (
+        "cook", "cooks", "cooked", "cooking", "bake", "bakes", "baked", "baking",
+        "roast", "roasts", "roasted", "roasting", "grill", "grills", "grilled", "grilling",
+        "fry", "fries", "fried", "frying", "simmer", "simmers", "simmered", "simmering",
+        "boil", "boils", "boiled", "boiling",
+    ),
+    "rest": (
+        "rest", "rests", "rested", "resting", "stand", "stands", "standing",
+        "chill", "chills", "chilled", "chilling", "marinate", "marinates", "marinated",
+        "marinating", "rise", "rises", "rising", "proof", "proofs", "proofed", "proofing",
+    ),
+    "total": ("total", "overall", "ready in"),
+}
+_LABEL_KINDS = {form: kind for kind, forms in _LABEL_FORMS.items() for form in forms}
+# Labels that name a time rather than describe a step
+_ALWAYS_EXPLICIT = frozenset(("total",))
+
+_FRACTION_CHARS = "".join(_FRACTIONS)
+_NUMBER = (
+    rf"(?:\d+\s+\d+/\d+|\d+/\d+|\d+(?:[.,]\d+)?(?:\s*[{_FRACTION_CHARS}])?|[{_FRACTION_CHARS}]"
+    rf"|\b(?:half(?:\s+an?)?|{'|'.join(sorted(_WORDS, key=len, reverse=True))})\b)"
+)
+_LABEL_WORDS = "|".join(sorted(_LABEL_KINDS, key=len, reverse=True)).replace(" ", r"\s+")
+_UNIT = r"(?:hours?|hrs?|h|minutes?|mins?|m|seconds?|secs?|s)\b"
+# Matched against lowercased text. Each match skips whole words up to the
+# next token, so the alternatives are only tried where a word starts; the
+# final match is an empty ``end`` token.
+_TOKEN_RE = re.compile(
+    rf"(?:[^\W\d{_FRACTION_CHARS}]+ ?|.)*?(?:"
+    # A sentence end is punctuation before a non-digit ("1 hr. 30 min" is one clause)
+    r"(?P<stop>[.;!?]+(?=\s+\D|\s*$)|\n)"
+    rf"|(?P<label>\b(?P<word>{_LABEL_WORDS})\b(?P<explicit>\s+time\b\s*:?|\s*:)?)"
+    # Compact hours and minutes: "1h30"
+    r"|(?P<clock>\b(?P<clock_h>\d+)\s*h\s*(?P<clock_m>\d{2})\b(?!\s*(?:min|m\b|s\b)))"
+    rf"|(?P<span>(?P<low>{_NUMBER})(?:\s*(?:-|–|—|to|or)\s*(?P<high>{_NUMBER}))?\s*(?P<unit>{_UNIT}))"
+    # ISO-8601: at least one component must follow the P
+    r"|(?P<iso>\bp(?=\d|t\d)(?:(?P<iso_d>\d+(?:[.,]\d+)?)d)?"
+    r"(?:t(?:(?P<iso_h>\d+(?:[.,]\d+)?)h)?(?:(?P<iso_m>\d+(?:[.,]\d+)?)m)?(?:(?P<iso_s>\d+(?:[.,]\d+)?)s)?)?\b)"
+    r"|(?P<end>$))",
+    re.DOTALL,
+)
+_DURATIONS = frozenset(("iso", "clock", "span"))
+# Every duration has a digit, a fraction or a spelled-out unit; text with
+# none of them is answered without a scan
+_DIGIT_RE = re.compile(rf"[\d{_FRACTION_CHARS}]")
+_UNIT_STEMS = ("hour", "hr", "min", "sec")
+# Characters allowed between two durations that add up: "1 hr 30 min", "1 hr. 30"
+_JOIN_CHARS = " \t,.&+"
+
+
+@dataclass(frozen=True)
+class RecipeTimes:
+    """Minutes found for each phase of a recipe; None when not found."""
+
+    prep: Optional[int] = None
+    cook: Optional[int] = None
+    rest: Optional[int] = None
+    total: Optional[int] = None
+
+    def as_recipe_fields(self) -> dict[str, Optional[int]]:
+        """Return the times keyed by Recipe field name."""
+        return {"prep_time": self.prep, "cook_time": self.cook, "total_time": self.total}
+
+
+NO_TIMES = RecipeTimes()
+
+
+def _number(text: str) -> float:
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        pass
+    if text in _WORDS:
+        return float(_WORDS[text])
+    if text.startswith("half"):
+        return 0.5
+    value = 0.0
+    for part in text.split():
+        if "/" in part:
+            numerator, _, denominator = part.partition("/")
+            value += int(numerator) / int(denominator) if int(denominator) else 0.0
+        elif part[-1] in _FRACTIONS:
+            value += _FRACTIONS[part[-1]] + (float(part[:-1].replace(",", ".")) if part[:-1] else 0.0)
+        else:
+            value += float(part.replace(",", "."))
+    return value
+
+
+def _token_minutes(match: re.Match, group: str) -> float:
+    """Minutes of a duration token (iso, clock or span)."""
+    if group == "span":
+        return _number(match.group("high") or match.group("low")) * _UNIT_MINUTES[match.group("unit")[0]]
+    if group == "clock":
+        return int(match.group("clock_h")) * 60.0 + int(match.group("clock_m"))
+    days, hours, minutes, seconds = match.group("iso_d", "iso_h", "iso_m", "iso_s")
+    return sum(
+        float(value.replace(",", ".")) * factor
+        for value, factor in ((days, 1440.0), (hours, 60.0), (minutes, 1.0), (seconds, 1 / 60))
+        if value
+    )
+
+
+def extract_times(text: Any) -> RecipeTimes:
+    """Return the prep, cook, rest and total times mentioned in ``text``.
+
+    Total is the stated total, or prep + cook (+ rest) when both prep and
+    cook were found.
+    """
+    if not text:
+        return NO_TIMES
+    text = (text if isinstance(text, str) else str(text)).lower()
+    if _DIGIT_RE.search(text) is None and not any(stem in text for stem in _UNIT_STEMS):
+        return NO_TIMES
+    explicit: dict[str, float] = {}
+    implicit: dict[str, float] = {}
+    kind: Optional[str] = None
+    is_explicit = False
+    # Minutes of the span being read, and where its last duration ended
+    pending = 0.0
+    last_end = 0
+    # Set once the label's span is complete; later durations are not its own
+    done = False
+
+    for match in _TOKEN_RE.finditer(text):
+        group = match.lastgroup
+        if group in _DURATIONS:
+            if kind is None or done:
+                continue
+            if pending:
+                if text[last_end:match.start(group)].strip(_JOIN_CHARS) not in ("", "and"):
+                    # A second, unrelated duration ("... or until golden, about 25 min")
+                    done = True
+                    continue
+            pending += _token_minutes(match, group)
+            last_end = match.end()
+            continue
+        # Any other token ends the span being read
+        if pending:
+            if is_explicit:
+                explicit.setdefault(kind, pending)
+            else:
+                implicit[kind] = implicit.get(kind, 0.0) + pending
+            pending = 0.0
+        done = False
+        if group == "label":
+            kind = _LABEL_KINDS[" ".join(match.group("word").split())]
+            is_explicit = kind in _ALWAYS_EXPLICIT or match.group("explicit") is not None
+        else:
+            kind = None
+
+    found = {
+        name: round(explicit[name] if name in explicit else implicit[name])
+        for name in ("prep", "cook", "rest", "total")
+        if name in explicit or name in implicit
+    }
+    prep, cook, rest = found.get("prep"), found.get("cook"), found.get("rest")
+    total = found.get("total")
+    if total is None and prep is not None and cook is not None:
+        total = prep + cook + (rest or 0)
+    return RecipeTimes(prep=prep, cook=cook, rest=rest, total=total)
+
+
+def extract_times_batch(texts: Iterable[Any]) -> list[RecipeTimes]:
+    """Return :func:`extract_times` for each text, in order.
+
+    Imports repeat the same boilerplate notes often, so identical texts in
+    one batch are parsed once.
+    """
+    seen: dict[str, RecipeTimes] = {}
+    results = []
+    for text in texts:
+        key = text if isinstance(text, str) else str(text or "")
+        times = seen.get(key)
+        if times is None:
+            times = seen[key] = extract_times(key)
+        results.append(times)
+    return results
+
+
+def parse_duration(value: Any) -> Optional[int]:
+    """Return minutes for one duration value: ``PT1H30M``, "1 hr 30 mins", "20–25 min" or 20."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value) if value >= 0 else None
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    if text.isdigit():
+        return int(text)
+    minutes = 0.0
+    found = False
+    for match in _TOKEN_RE.finditer(text.lower()):
+        group = match.lastgroup
+        if group in _DURATIONS:
+            minutes += _token_minutes(match, group)
+            found = True
+    return round(minutes) if found else None
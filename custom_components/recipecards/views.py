@@ -0,0 +1,152 @@
+"""HTTP views for Recipe Cards."""
+from __future__ import annotations
+
+import re
+import time
+import zlib
+from datetime import date, timedelta
+from typing import Optional
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .exporter import EXPORT_FORMATS, async_iter_export
+from .images import IMAGE_SIZES, image_path
+from .importer import FORMAT_NDJSON
+
+# Signed image URLs are reused until half their lifetime is gone so the
+# browser sees the same URL (and its cache entry) across list refreshes
+SIGN_EXPIRATION = timedelta(days=7)
+_SIGNED_URLS = f"{DOMAIN}_signed_image_urls"
+_MAX_SIGNED_URLS = 10000
+
+_IMAGE_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+_CACHE_CONTROL = "private, max-age=31536000, immutable"
+_EXPORT_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "jsonld": "application/ld+json"}
+
+
+@callback
+def async_signed_image_url(
+    hass: HomeAssistant,
+    image_id: str,
+    size: Optional[str] = None,
+    refresh_token_id: Optional[str] = None,
+) -> str:
+    """Return a signed URL for an image so it can be used in ``<img src>``."""
+    cache: dict[tuple[Optional[str], str], tuple[str, float]] = hass.data.setdefault(_SIGNED_URLS, {})
+    path = image_path(image_id, size)
+    key = (refresh_token_id, path)
+    now = time.time()
+    cached = cache.get(key)
+    if cached is not None and cached[1] - now > SIGN_EXPIRATION.total_seconds() / 2:
+        return cached[0]
+    if len(cache) >= _MAX_SIGNED_URLS:
+        cache.clear()
+    url = async_sign_path(hass, path, SIGN_EXPIRATION, refresh_token_id=refresh_token_id)
+    cache[key] = (url, now + SIGN_EXPIRATION.total_seconds())
+    return url
+
+
+class RecipeImageView(HomeAssistantView):
+    """Serve stored recipe images with long-lived, validator-based caching.
+
+    Images are content-addressed, so the id doubles as a strong ETag and the
+    bytes behind a URL never change.
+    """
+
+    url = "/api/recipecards/image/{image_id}"
+    name = "api:recipecards:image"
+    requires_auth = True
+
+    async def get(self, request: web.Request, image_id: str) -> web.StreamResponse:
+        """Return the image bytes, a size variant, or 304 Not Modified."""
+        hass: HomeAssistant = request.app["hass"]
+        images = hass.data.get(DOMAIN, {}).get("images")
+        if images is None or not _IMAGE_ID_RE.match(image_id):
+            return web.Response(status=404)
+
+        size = request.query.get("size")
+        if size is not None and size not in IMAGE_SIZES:
+            return web.Response(status=400, text="Unknown size")
+
+        etag = f'"{image_id}-{size}"' if size else f'"{image_id}"'
+        headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}:
+            return web.Response(status=304, headers=headers)
+
+        if size:
+            result = await images.async_read_variant(image_id, size)
+        else:
+            result = await images.async_read(image_id)
+        if result is None:
+            return web.Response(status=404)
+        raw, content_type = result
+        return web.Response(body=raw, content_type=content_type, headers=headers)
+
+
+class RecipeExportView(HomeAssistantView):
+    """Stream one recipe list, or all of them, as a download.
+
+    Query parameters: ``format`` (``ndjson`` or ``jsonld``), ``entry_id``,
+    ``images=inline`` to embed images as data URLs and ``gzip=1`` to
+    compress. The body is written with chunked encoding as it is produced.
+    """
+
+    url = "/api/recipecards/export"
+    name = "api:recipecards:export"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.StreamResponse:
+        """Stream the export."""
+        hass: HomeAssistant = request.app["hass"]
+        file_format = request.query.get("format", FORMAT_NDJSON)
+        if file_format not in EXPORT_FORMATS:
+            return web.Response(status=400, text="Unknown format")
+        entry_id = request.query.get("entry_id")
+        storages = sorted(
+            (storage_entry_id, entry_data["storage"])
+            for storage_entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+            if isinstance(entry_data, dict)
+            and "storage" in entry_data
+            and entry_id in (None, storage_entry_id)
+        )
+        if entry_id is not None and not storages:
+            return web.Response(status=404)
+        compress = request.query.get("gzip") in ("1", "true")
+
+        filename = f"recipecards-{date.today().isoformat()}.{file_format}"
+        content_type = _EXPORT_CONTENT_TYPES[file_format]
+        if compress:
+            filename += ".gz"
+            content_type = "application/gzip"
+        response = web.StreamResponse(headers={
+            "Content-Type": content_type,
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        })
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        # wbits=31 writes a gzip container
+        encoder = zlib.compressobj(wbits=31) if compress else None
+        async for chunk in async_iter_export(
+            hass, storages, file_format, request.query.get("images") == "inline"
+        ):
+            if encoder is not None:
+                chunk = encoder.compress(chunk)
+            if chunk:
+                await response.write(chunk)
+        if encoder is not None:
+            await response.write(encoder.flush())
+        await response.write_eof()
+        return response
+
+
+@callback
+def register_views(hass: HomeAssistant) -> None:
+    """Register the HTTP views."""
+    hass.http.register_view(RecipeImageView())
+    hass.http.register_view(RecipeExportView())
@@ -0,0 +1,100 @@
+"""Memory held per recipe, and the cost of serializing a collection.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_memory [--recipes 10000]
+
+Recipes are built from JSON the way storage loads them, so no strings are
+shared unless the model shares them. Prints one JSON object.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from homeassistant.helpers.json import json_bytes
+
+from custom_components.recipecards.models import Recipe
+
+from .legacy_models import LegacyRecipe
+
+_COLORS = ("#FFD700", "#FF6347", "#4682B4", "#32CD32")
+
+
+def make_payload(count: int, seed: int = 0) -> str:
+    """Return ``count`` stored recipes as the JSON storage would hold them."""
+    rng = random.Random(seed)
+    recipes = [
+        {
+            "id": f"{i:032x}",
+            "title": f"Recipe {i}",
+            "description": "A weeknight dish",
+            "ingredients": [f"{rng.randint(1, 500)} g ingredient {j}" for j in range(rng.randint(4, 12))],
+            "notes": "",
+            "instructions": [f"Step {j}: stir for {rng.randint(1, 20)} minutes" for j in range(rng.randint(3, 8))],
+            "color": rng.choice(_COLORS),
+            "image": None,
+            "prep_time": rng.choice((None, 10, 15)),
+            "cook_time": rng.choice((None, 20, 45)),
+            "total_time": None,
+        }
+        for i in range(count)
+    ]
+    return json.dumps(recipes)
+
+
+def _measure(model, payload: str) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(payload)
+    recipes = [model.from_dict(d) for d in data]
+    del data
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(3):
+        b"[" + b",".join(json_bytes(r.to_dict()) for r in recipes) + b"]"
+    encode = (time.perf_counter() - start) / 3
+    cache = 0
+    if hasattr(model, "to_json"):
+        tracemalloc.start()
+        for recipe in recipes:
+            recipe.to_json()
+        cache, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.perf_counter()
+        b"[" + b",".join(r.to_json() for r in recipes) + b"]"
+        cached = time.perf_counter() - start
+    else:
+        cached = encode
+    return {
+        "bytes_per_recipe": round(held / len(recipes)),
+        "json_cache_bytes_per_recipe": round(cache / len(recipes)),
+        "encode_ms": round(encode * 1000, 2),
+        "encode_cached_ms": round(cached * 1000, 2),
+    }
+
+
+def run(count: int = 10000) -> dict:
+    payload = make_payload(count)
+    return {
+        "recipes": count,
+        "legacy": _measure(LegacyRecipe, payload),
+        "current": _measure(Recipe, payload),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=10000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.recipes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""How storage, the websocket API, the sensors and time parsing scale.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_suite [--sizes 100,1000,10000,50000]
+        [--text-size 400] [--image-size 0] [--image-ratio 0.5]
+        [--seed 0] [--repeat 5] [--output results.json]
+
+Each size gets a fresh synthetic collection (see ``corpus.py``) in one
+config entry, served by the real ``RecipeStorage``, websocket handlers and
+sensor entities against the stand-ins in ``standins.py``. Prints one JSON
+object (or writes it to ``--output``); latencies are in milliseconds and
+payloads in bytes.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.helpers.json import json_bytes
+
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.api import (
+    async_delete_recipe,
+    async_get_recipe,
+    async_list_recipes,
+    async_search_recipes,
+)
+from custom_components.recipecards.const import DATA_RESPONSE_CACHE, DOMAIN
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.sensor import RecipeCardsCollectionSensor, RecipeSensor
+from custom_components.recipecards.times import extract_times_batch
+
+from .corpus import make_corpus, make_recipe, recipe_text
+from .standins import FakeConnection, FakeHass, FakeStore
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+ENTRY_ID = "bench"
+# Mutations and lookups sampled per size
+SAMPLES = 200
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    """Latency distribution of ``samples`` (seconds) in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "calls": len(ordered),
+        "mean_ms": _ms(statistics.fmean(ordered)),
+        "p50_ms": _ms(ordered[len(ordered) // 2]),
+        "p95_ms": _ms(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]),
+        "max_ms": _ms(ordered[-1]),
+    }
+
+
+async def _sample(func: Callable[[], Awaitable[Any]], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _bench_storage(hass: FakeHass, corpus: list[dict[str, Any]], repeat: int) -> tuple[storage_mod.RecipeStorage, dict]:
+    FakeStore.documents.clear()
+    FakeStore.documents[f"recipecards_{ENTRY_ID}.json"] = json_bytes(corpus)
+    hass.data[DOMAIN] = {}
+
+    gc.collect()
+    start = time.perf_counter()
+    storage = storage_mod.RecipeStorage(hass, ENTRY_ID)
+    await storage.async_load_recipes()
+    loaded = time.perf_counter() - start
+    # Large collections are indexed in the background after the load returns
+    await hass.async_block_till_done()
+    indexed = time.perf_counter() - start
+    hass.data[DOMAIN][ENTRY_ID] = {"storage": storage}
+
+    saves = await _sample(storage.async_save_recipes, repeat)
+
+    rng = random.Random(1)
+    count = len(corpus)
+    new = [Recipe.from_dict(make_recipe(rng, count + i)) for i in range(SAMPLES)]
+    existing = [recipe.id for recipe in rng.sample(storage.recipes, min(SAMPLES, count))]
+    timings: dict[str, list[float]] = {"add": [], "update": [], "delete": []}
+    for recipe in new:
+        start = time.perf_counter()
+        await storage.async_add_recipe(recipe)
+        timings["add"].append(time.perf_counter() - start)
+    for recipe_id in existing:
+        updated = Recipe.from_dict({**storage.get(recipe_id).to_dict(), "title": "Renamed"})
+        start = time.perf_counter()
+        await storage.async_update_recipe(recipe_id, updated)
+        timings["update"].append(time.perf_counter() - start)
+    for recipe in new:
+        start = time.perf_counter()
+        await storage.async_delete_recipe(recipe.id)
+        timings["delete"].append(time.perf_counter() - start)
+    start = time.perf_counter()
+    await storage._backend._store.async_flush_delayed()
+    flushed = time.perf_counter() - start
+
+    return storage, {
+        "load_ms": _ms(loaded),
+        "load_and_index_ms": _ms(indexed),
+        "save": _summary(saves),
+        "saved_bytes": len(FakeStore.documents[f"recipecards_{ENTRY_ID}.json"]),
+        "mutate": {kind: _summary(samples) for kind, samples in timings.items()},
+        "delayed_save_ms": _ms(flushed),
+    }
+
+
+async def _call(handler, hass: FakeHass, **msg: Any) -> FakeConnection:
+    connection = FakeConnection()
+    await handler(hass, connection, {"id": 1, **msg})
+    return connection
+
+
+async def _bench_api(hass: FakeHass, storage: storage_mod.RecipeStorage, repeat: int) -> dict:
+    def _drop_cache() -> None:
+        hass.data[DOMAIN].pop(DATA_RESPONSE_CACHE, None)
+
+    async def _cold(handler, **msg: Any) -> dict:
+        samples, sent = [], 0
+        for _ in range(repeat):
+            _drop_cache()
+            start = time.perf_counter()
+            connection = await _call(handler, hass, **msg)
+            samples.append(time.perf_counter() - start)
+            sent = connection.bytes_sent
+        return {**_summary(samples), "bytes": sent}
+
+    async def _warm(handler, **msg: Any) -> dict:
+        await _call(handler, hass, **msg)
+        samples = await _sample(lambda: _call(handler, hass, **msg), repeat)
+        return _summary(samples)
+
+    rng = random.Random(2)
+    ids = [recipe.id for recipe in storage.recipes]
+    gets, get_bytes = [], 0
+    for recipe_id in rng.sample(ids, min(SAMPLES, len(ids))):
+        start = time.perf_counter()
+        connection = await _call(async_get_recipe, hass, recipe_id=recipe_id)
+        gets.append(time.perf_counter() - start)
+        get_bytes += connection.bytes_sent
+
+    # One registry entry per recipe, as the sensor platform creates them
+    registry = hass.entity_registry
+    for recipe_id in ids:
+        registry.add(ENTRY_ID, recipe_id)
+    deletes = []
+    for recipe_id in rng.sample(ids, min(SAMPLES // 4, len(ids))):
+        start = time.perf_counter()
+        await _call(async_delete_recipe, hass, recipe_id=recipe_id)
+        deletes.append(time.perf_counter() - start)
+    registry.entities.clear()
+
+    return {
+        "recipe_list": await _cold(async_list_recipes),
+        "recipe_list_cached": await _warm(async_list_recipes),
+        "recipe_list_page": await _cold(async_list_recipes, limit=50),
+        "recipe_list_titles": await _cold(async_list_recipes, fields=["title"]),
+        "recipe_search": await _cold(async_search_recipes, query="chicken"),
+        "recipe_search_max_time": await _cold(async_search_recipes, query="soup", max_time=60),
+        "recipe_get": {**_summary(gets), "bytes": get_bytes // max(1, len(gets))},
+        "recipe_delete": _summary(deletes),
+    }
+
+
+async def _bench_sensors(storage: storage_mod.RecipeStorage) -> dict:
+    coordinator = SimpleNamespace(data=storage.snapshot(), last_update_success=True)
+    entry = SimpleNamespace(entry_id=ENTRY_ID, title="Bench")
+    writes = 0
+
+    def _writer(sensor):
+        def _write() -> None:
+            nonlocal writes
+            writes += 1
+            # What a state write reads from the entity
+            sensor.native_value
+            sensor.extra_state_attributes
+        return _write
+
+    start = time.perf_counter()
+    sensors: list[Any] = [RecipeCardsCollectionSensor(coordinator, entry)]
+    sensors += [RecipeSensor(coordinator, entry, recipe.id) for recipe in storage.recipes]
+    created = time.perf_counter() - start
+    for sensor in sensors:
+        sensor.async_write_ha_state = _writer(sensor)
+
+    async def _push() -> dict:
+        nonlocal writes
+        writes = 0
+        start = time.perf_counter()
+        coordinator.data = storage.snapshot()
+        for sensor in sensors:
+            sensor._handle_coordinator_update()
+        return {"ms": _ms(time.perf_counter() - start), "state_writes": writes}
+
+    recipe = storage.recipes[0]
+    await storage.async_update_recipe(recipe.id, Recipe.from_dict({**recipe.to_dict(), "title": "Renamed again"}))
+    one_changed = await _push()
+    await storage.async_load_recipes(force=True)
+    all_changed = await _push()
+    return {
+        "entities": len(sensors),
+        "create_ms": _ms(created),
+        "refresh_one_changed": one_changed,
+        "refresh_all_changed": all_changed,
+    }
+
+
+def _bench_parse_times(corpus: list[dict[str, Any]], repeat: int) -> dict:
+    texts = [recipe_text(data) for data in corpus]
+
+    def _rate(func) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return round(len(texts) / best)
+
+    return {
+        "texts": len(texts),
+        "parse_times_per_second": _rate(lambda: [Recipe.parse_times(t) for t in texts]),
+        "extract_times_batch_per_second": _rate(lambda: extract_times_batch(texts)),
+    }
+
+
+async def _run_size(count: int, args: argparse.Namespace, config_dir: str) -> dict:
+    corpus = make_corpus(count, args.text_size, args.image_size, args.image_ratio, args.seed)
+    hass = FakeHass(config_dir)
+    storage, storage_results = await _bench_storage(hass, corpus, args.repeat)
+    result = {
+        "recipes": count,
+        "storage": storage_results,
+        "api": await _bench_api(hass, storage, args.repeat),
+        "sensors": await _bench_sensors(storage),
+        "parse_times": _bench_parse_times(corpus, args.repeat),
+    }
+    await hass.async_block_till_done()
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict:
+    storage_mod.Store = FakeStore
+    with tempfile.TemporaryDirectory() as config_dir:
+        results = [await _run_size(count, args, config_dir) for count in args.sizes]
+    return {
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "parameters": {
+            "text_size": args.text_size,
+            "image_size": args.image_size,
+            "image_ratio": args.image_ratio,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="comma-separated collection sizes",
+    )
+    parser.add_argument("--text-size", type=int, default=400, help="characters of instructions per recipe")
+    parser.add_argument("--image-size", type=int, default=0, help="base64 characters per inline image")
+    parser.add_argument("--image-ratio", type=float, default=0.5, help="share of recipes with an image")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results here instead of printing them")
+    args = parser.parse_args()
+    results = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(results + "\n")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":
+    main()
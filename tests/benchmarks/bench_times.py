@@ -0,0 +1,84 @@
+"""Throughput of the time extractor against the parser it replaced.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_times [--texts 2000] [--repeat 5]
+
+Prints one JSON object with texts per second for each implementation and
+how many texts each found at least one time in.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from custom_components.recipecards.times import extract_times, extract_times_batch
+
+from .legacy_times import legacy_parse_times
+
+_STEPS = (
+    "Preheat the oven to 200C.",
+    "Whisk the eggs with the sugar until pale.",
+    "Bake for 20–25 min or until golden.",
+    "Simmer for 1½ hours, stirring now and then.",
+    "Rest the dough for 1 hr 30 min.",
+    "Cook the pasta for 10 minutes and drain.",
+    "Chill for half an hour before slicing.",
+    "Serve with a green salad.",
+    "Fold in the flour and the melted butter.",
+    "Season to taste and scatter over the herbs.",
+    "Slice thinly and arrange on a platter.",
+)
+_HEADERS = (
+    "Prep time: 15 min",
+    "Cook time: 1 hour 10 minutes",
+    "Total time: PT1H30M",
+    "Prep: 10 mins | Cook: 40 mins",
+    "",
+)
+
+
+def make_texts(count: int, seed: int = 0) -> list[str]:
+    """Return ``count`` instruction-and-notes texts as storage joins them."""
+    rng = random.Random(seed)
+    return [
+        "\n".join(rng.choices(_STEPS, k=rng.randint(3, 10))) + "\n" + rng.choice(_HEADERS)
+        for _ in range(count)
+    ]
+
+
+def _best_rate(func, texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def run(count: int = 2000, repeat: int = 5) -> dict:
+    texts = make_texts(count)
+    legacy = [legacy_parse_times(t) for t in texts]
+    current = [extract_times(t) for t in texts]
+    return {
+        "texts": count,
+        "legacy_per_second": round(_best_rate(lambda ts: [legacy_parse_times(t) for t in ts], texts, repeat)),
+        "extract_times_per_second": round(_best_rate(lambda ts: [extract_times(t) for t in ts], texts, repeat)),
+        "extract_times_batch_per_second": round(_best_rate(extract_times_batch, texts, repeat)),
+        "legacy_texts_with_times": sum(any(v is not None for v in r.values()) for r in legacy),
+        "texts_with_times": sum(any(v is not None for v in r.as_recipe_fields().values()) for r in current),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.texts, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
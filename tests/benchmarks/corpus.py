@@ -0,0 +1,99 @@
+"""Deterministic synthetic recipe collections for the benchmarks.
+
+The same arguments always give the same recipes, so results from
+different runs and machines can be compared.
+"""
+from __future__ import annotations
+
+import base64
+import random
+from typing import Any
+
+_COLORS = ("#FFD700", "#FF6347", "#4682B4", "#32CD32", "#9370DB")
+_DISHES = (
+    "soup", "stew", "curry", "salad", "pie", "tart", "risotto", "pasta", "bread",
+    "cake", "roast", "gratin", "omelette", "pancakes", "chili", "tagine", "noodles",
+)
+_INGREDIENTS = (
+    "chicken", "beef", "lentils", "chickpeas", "tofu", "salmon", "mushrooms", "spinach",
+    "tomatoes", "onion", "garlic", "carrots", "potatoes", "rice", "flour", "butter",
+    "eggs", "milk", "cream", "cheese", "lemon", "ginger", "coriander", "paprika",
+    "cumin", "olive oil", "sugar", "honey", "apples", "pumpkin", "leeks", "peas",
+)
+_UNITS = ("g", "ml", "tbsp", "tsp", "cups", "")
+_STEPS = (
+    "Preheat the oven to {n}0C.",
+    "Chop the {a} and the {b}.",
+    "Fry the {a} in a little oil for {n} minutes.",
+    "Simmer with the {b} for {n}–{m} min, stirring now and then.",
+    "Bake for {n}0 minutes or until golden.",
+    "Rest the dough for {n} hr before shaping.",
+    "Whisk the {a} with the {b} until smooth.",
+    "Season to taste and scatter over the {a}.",
+    "Serve with {b} on the side.",
+)
+_HEADERS = ("", "Prep time: {n}0 min", "Cook time: {n} hours", "Total time: PT{n}H{m}M")
+
+
+def _image(rng: random.Random, size: int) -> str:
+    """Return a data URL whose base64 payload is ``size`` characters long."""
+    raw = rng.randbytes(size * 3 // 4 + 3)
+    return "data:image/jpeg;base64," + base64.b64encode(raw).decode()[:size]
+
+
+def make_recipe(
+    rng: random.Random,
+    index: int,
+    text_size: int = 400,
+    image_size: int = 0,
+    image_ratio: float = 0.5,
+) -> dict[str, Any]:
+    """Return one stored recipe; instructions and notes total about ``text_size`` characters."""
+    a, b = rng.sample(_INGREDIENTS, 2)
+    title = f"{a.capitalize()} {rng.choice(_DISHES)} {index}"
+    ingredients = [
+        f"{rng.randint(1, 500)} {rng.choice(_UNITS)} {item}".replace("  ", " ")
+        for item in rng.sample(_INGREDIENTS, rng.randint(4, 12))
+    ]
+    instructions: list[str] = []
+    length = 0
+    while length < text_size:
+        step = rng.choice(_STEPS).format(a=a, b=b, n=rng.randint(1, 9), m=rng.randint(10, 59))
+        instructions.append(step)
+        length += len(step) + 1
+    notes = rng.choice(_HEADERS).format(n=rng.randint(1, 9), m=rng.randint(10, 59))
+    image = _image(rng, image_size) if image_size and rng.random() < image_ratio else None
+    return {
+        "id": f"{index:032x}",
+        "title": title,
+        "description": f"A {rng.choice(('quick', 'slow', 'weekend', 'weeknight'))} {title.lower()}",
+        "ingredients": ingredients,
+        "notes": notes,
+        "instructions": instructions,
+        "color": rng.choice(_COLORS),
+        "image": image,
+        "prep_time": rng.choice((None, 10, 15, 20)),
+        "cook_time": rng.choice((None, 20, 45, 90)),
+        "total_time": None,
+    }
+
+
+def make_corpus(
+    count: int,
+    text_size: int = 400,
+    image_size: int = 0,
+    image_ratio: float = 0.5,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Return ``count`` stored recipes.
+
+    ``image_size`` is the length of the base64 payload of inline images
+    (0 for none), given to about ``image_ratio`` of the recipes.
+    """
+    rng = random.Random(seed)
+    return [make_recipe(rng, i, text_size, image_size, image_ratio) for i in range(count)]
+
+
+def recipe_text(data: dict[str, Any]) -> str:
+    """Return the text storage parses times from, as ``_apply_parsed_times`` joins it."""
+    return "\n".join(data["instructions"]) + "\n" + (data["notes"] or "")
@@ -0,0 +1,53 @@
+"""The ``Recipe`` dataclass as it was before slots and tuples.
+
+Kept as the baseline for ``bench_memory``.
+"""
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+
+@dataclass
+class LegacyRecipe:
+    id: str
+    title: str
+    description: Optional[str] = ""
+    ingredients: List[str] = field(default_factory=list)
+    notes: Optional[str] = ""
+    instructions: List[str] = field(default_factory=list)
+    color: str = "#FFD700"
+    image: Optional[str] = None
+    prep_time: Optional[int] = None
+    cook_time: Optional[int] = None
+    total_time: Optional[int] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "ingredients": self.ingredients,
+            "notes": self.notes,
+            "instructions": self.instructions,
+            "color": self.color,
+            "image": self.image,
+            "prep_time": self.prep_time,
+            "cook_time": self.cook_time,
+            "total_time": self.total_time,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LegacyRecipe":
+        import uuid
+        return cls(
+            id=data.get("id", str(uuid.uuid4())),
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            ingredients=data.get("ingredients", []),
+            notes=data.get("notes", ""),
+            instructions=data.get("instructions", []),
+            color=data.get("color", "#FFD700"),
+            image=data.get("image"),
+            prep_time=data.get("prep_time"),
+            cook_time=data.get("cook_time"),
+            total_time=data.get("total_time"),
+        )
@@ -0,0 +1,142 @@
+"""Local stand-ins for the parts of Home Assistant the benchmarks drive.
+
+They do the work the real objects would (encoding documents, holding
+registry entries) without a running instance, and keep as little
+bookkeeping of their own as possible so it does not show in the timings.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from homeassistant.helpers.entity_registry import DATA_REGISTRY
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+
+class FakeStore:
+    """An in-memory ``Store``: documents are kept encoded, as on disk.
+
+    Documents are shared per key so a new RecipeStorage for the same entry
+    reads what the previous one saved.
+    """
+
+    documents: dict[str, bytes] = {}
+
+    def __init__(self, hass: Any, version: int, key: str, *args: Any, **kwargs: Any) -> None:
+        self.key = key
+        self.path = key
+        self.saves = 0
+        self.bytes_written = 0
+        self._delayed: Optional[Callable[[], Any]] = None
+
+    async def async_load(self) -> Any:
+        raw = self.documents.get(self.key)
+        return None if raw is None else json_loads(raw)
+
+    async def async_save(self, data: Any) -> None:
+        raw = json_bytes(data)
+        self.documents[self.key] = raw
+        self.saves += 1
+        self.bytes_written += len(raw)
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        # Written by async_flush_delayed(), standing in for the timer
+        self._delayed = data_func
+
+    async def async_flush_delayed(self) -> None:
+        if self._delayed is not None:
+            data_func, self._delayed = self._delayed, None
+            await self.async_save(data_func())
+
+
+class FakeConnection:
+    """Records what a websocket handler sends and how many bytes."""
+
+    def __init__(self) -> None:
+        self.refresh_token_id: Optional[str] = None
+        self.last: Any = None
+        self.bytes_sent = 0
+        self.errors = 0
+
+    def send_message(self, message: Any) -> None:
+        self.last = message
+        self.bytes_sent += len(message)
+
+    def send_result(self, msg_id: int, result: Any = None) -> None:
+        self.last = result
+        self.bytes_sent += len(json_bytes(result))
+
+    def send_error(self, msg_id: int, code: str, message: str) -> None:
+        self.last = (code, message)
+        self.errors += 1
+
+
+@dataclass
+class FakeRegistryEntry:
+    entity_id: str
+    unique_id: str
+    config_entry_id: str
+    platform: str = "sensor"
+
+
+class FakeEntityRegistry:
+    """The entity registry attributes the integration reads."""
+
+    def __init__(self) -> None:
+        self.entities: dict[str, FakeRegistryEntry] = {}
+
+    def add(self, entry_id: str, recipe_id: str) -> None:
+        entity_id = f"sensor.recipe_{len(self.entities)}"
+        self.entities[entity_id] = FakeRegistryEntry(entity_id, f"{entry_id}_{recipe_id}", entry_id)
+
+    def async_remove(self, entity_id: str) -> None:
+        del self.entities[entity_id]
+
+
+class _FakeConfig:
+    def __init__(self, config_dir: str) -> None:
+        self.config_dir = config_dir
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.config_dir, *parts)
+
+
+class _FakeConfigEntries:
+    def async_get_entry(self, entry_id: str) -> None:
+        return None
+
+
+class FakeHass:
+    """Just enough of ``HomeAssistant`` for storage, the API and the sensors."""
+
+    def __init__(self, config_dir: str) -> None:
+        self.data: dict[str, Any] = {DATA_REGISTRY: FakeEntityRegistry()}
+        self.config = _FakeConfig(config_dir)
+        self.config_entries = _FakeConfigEntries()
+        self.state = None
+        self.loop = asyncio.get_running_loop()
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def entity_registry(self) -> FakeEntityRegistry:
+        return self.data[DATA_REGISTRY]
+
+    async def async_add_executor_job(self, func: Callable, *args: Any) -> Any:
+        return func(*args)
+
+    def async_create_task(self, coro: Any, name: Optional[str] = None) -> asyncio.Task:
+        task = self.loop.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def async_create_background_task(self, coro: Any, name: str, eager_start: bool = False) -> asyncio.Task:
+        return self.async_create_task(coro, name)
+
+    async def async_block_till_done(self) -> None:
+        """Wait for every task started so far, like the test harness does."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
@@ -0,0 +1,105 @@
+"""Fixtures shared by the Recipe Cards tests."""
+import asyncio
+from collections import defaultdict
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from homeassistant.core import CoreState
+
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.const import DOMAIN
+
+
+class DummyStore:
+    """In-memory ``Store``; a delayed save waits for ``fire_delayed``."""
+
+    def __init__(self, data=None):
+        self.data = data
+        self.saves = 0
+        self.loads = 0
+        self.pending = None
+
+    async def async_load(self):
+        self.loads += 1
+        return self.data
+
+    async def async_save(self, data):
+        self.saves += 1
+        self.pending = None
+        self.data = data
+
+    def async_delay_save(self, data_func, delay=0):
+        self.pending = data_func
+
+    async def fire_delayed(self):
+        """Run the pending delayed save, as the Store timer would."""
+        if self.pending is not None:
+            data_func, self.pending = self.pending, None
+            await self.async_save(data_func())
+
+
+@pytest.fixture
+def dummy_stores(monkeypatch):
+    """Patch ``Store`` with one DummyStore per storage key; returns them by key."""
+    stores = defaultdict(DummyStore)
+    monkeypatch.setattr(storage_mod, "Store", lambda hass, version, key, *a, **kw: stores[key])
+    return stores
+
+
+@pytest.fixture
+def dummy_store(dummy_stores):
+    """The DummyStore of the entry with id "e1"."""
+    return dummy_stores["recipecards_e1.json"]
+
+
+@pytest.fixture
+def mock_hass(tmp_path, dummy_stores):
+    """A mocked HomeAssistant with no loaded entries, running executor jobs inline.
+
+    Not named ``hass``: that is the real instance tests like test_api.py
+    get from pytest-homeassistant-custom-component.
+    """
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    hass.config_entries.async_get_entry.return_value = None
+
+    async def _executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _executor
+    return hass
+
+
+class LoopHass:
+    """Just enough of HomeAssistant to run the storage engines on a real loop."""
+
+    def __init__(self, tmp_path):
+        self.loop = asyncio.get_running_loop()
+        self.state = CoreState.running
+        self.data = {}
+        self.config = MagicMock()
+        self.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+        self.tasks = []
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+    def async_create_task(self, coro):
+        task = self.loop.create_task(coro)
+        self.tasks.append(task)
+        return task
+
+    def async_create_background_task(self, coro, name):
+        return self.async_create_task(coro)
+
+    async def async_block_till_done(self):
+        while self.tasks:
+            await self.tasks.pop(0)
+
+
+@pytest_asyncio.fixture
+async def loop_hass(tmp_path, dummy_stores):
+    """A LoopHass on the test's event loop, with ``Store`` patched."""
+    return LoopHass(tmp_path)
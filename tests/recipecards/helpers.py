@@ -0,0 +1,44 @@
+"""Helpers for tests that drive the websocket handlers against RecipeStorage."""
+import asyncio
+import json
+from unittest.mock import MagicMock
+from homeassistant.components.websocket_api.connection import ActiveConnection
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.api import register_api
+from custom_components.recipecards.const import DOMAIN
+from custom_components.recipecards.models import Recipe
+
+
+async def add_entry(hass, entry_id, titles):
+    """Load an entry whose recipes are "<entry_id>-<n>", titled in order."""
+    storage = storage_mod.RecipeStorage(hass, entry_id)
+    for i, title in enumerate(titles):
+        await storage.async_add_recipe(Recipe(id=f"{entry_id}-{i}", title=title, instructions=["step"]))
+    hass.data[DOMAIN][entry_id] = {"storage": storage}
+    return storage
+
+
+async def call_command(handler, hass, **msg):
+    """Run a command; return its result, or the send_error arguments."""
+    connection = MagicMock()
+    connection.refresh_token_id = None
+    await handler(hass, connection, {"id": 1, **msg})
+    if connection.send_error.called:
+        return connection.send_error.call_args[0]
+    if connection.send_message.called:
+        # Pre-encoded replies
+        return json.loads(connection.send_message.call_args[0][0])["result"]
+    return connection.send_result.call_args[0][1]
+
+
+async def handle_command(hass, **msg):
+    """Send a command through a registered websocket connection; return the reply message."""
+    register_api(hass)
+    tasks = []
+    hass.async_create_background_task = lambda coro, name, eager_start=False: tasks.append(asyncio.ensure_future(coro))
+    sent = []
+    connection = ActiveConnection(MagicMock(), hass, sent.append, MagicMock(), MagicMock(id=None))
+    connection.async_handle({"id": 1, **msg})
+    await asyncio.gather(*tasks)
+    reply = sent[-1]
+    return json.loads(reply) if isinstance(reply, (bytes, str)) else reply
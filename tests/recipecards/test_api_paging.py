@@ -0,0 +1,54 @@
+import pytest
+from custom_components.recipecards.api import async_list_recipes, async_search_recipes
+from custom_components.recipecards.models import Recipe
+from .helpers import add_entry, call_command
+
+
+@pytest.mark.asyncio
+async def test_list_pages_are_stable_across_edits(mock_hass):
+    storage_a = await add_entry(mock_hass, "a", ["A0", "A1", "A2"])
+    await add_entry(mock_hass, "b", ["B0"])
+
+    first = await call_command(async_list_recipes, mock_hass, limit=2, fields=["title"])
+    assert [d["id"] for d in first["recipes"]] == ["a-0", "a-1"]
+    assert first["recipes"][0] == {"id": "a-0", "title": "A0", "_entry_id": "a"}
+
+    # Deleting the last recipe sent and adding one does not shift the next page
+    await storage_a.async_delete_recipe("a-1")
+    await storage_a.async_add_recipe(Recipe(id="a-new", title="New"))
+    second = await call_command(async_list_recipes, mock_hass, limit=2, cursor=first["next_cursor"])
+    assert [d["id"] for d in second["recipes"]] == ["a-2", "a-new"]
+    third = await call_command(async_list_recipes, mock_hass, limit=2, cursor=second["next_cursor"])
+    assert [d["id"] for d in third["recipes"]] == ["b-0"]
+    assert third["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_filters_and_legacy_shape(mock_hass):
+    await add_entry(mock_hass, "a", ["A0"])
+    await add_entry(mock_hass, "b", ["B0"])
+    result = await call_command(async_list_recipes, mock_hass, entry_id="b")
+    assert isinstance(result, list) and [d["id"] for d in result] == ["b-0"]
+    assert "instructions" in result[0]
+    assert await call_command(async_list_recipes, mock_hass, cursor="not-a-cursor") == (1, "invalid_cursor", "Invalid cursor")
+
+
+@pytest.mark.asyncio
+async def test_search_pages_by_rank(mock_hass):
+    await add_entry(mock_hass, "a", ["Tomato soup", "Tomato tomato salad", "Bread"])
+    first = await call_command(async_search_recipes, mock_hass, query="tomato", limit=1, fields=["title"])
+    assert [d["id"] for d in first["recipes"]] == ["a-1"]
+    assert set(first["recipes"][0]) == {"id", "title", "_entry_id", "_score", "_hits"}
+    second = await call_command(async_search_recipes, mock_hass, query="tomato", limit=1, cursor=first["next_cursor"])
+    assert [d["id"] for d in second["recipes"]] == ["a-0"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_is_refused_after_changes(mock_hass):
+    storage = await add_entry(mock_hass, "a", ["Tomato soup", "Tomato tomato salad", "Bread"])
+    first = await call_command(async_search_recipes, mock_hass, query="tomato", limit=1)
+    # Any edit reweighs every score, so the old ranking cannot be resumed
+    await storage.async_add_recipe(Recipe(id="n", title="Tomato tart"))
+    stale = await call_command(async_search_recipes, mock_hass, query="tomato", limit=1, cursor=first["next_cursor"])
+    assert stale[1] == "stale_cursor"
@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import AsyncMock
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.api import async_batch_recipes
+from custom_components.recipecards.const import DOMAIN
+from custom_components.recipecards.models import Recipe
+from .helpers import add_entry, call_command, handle_command
+
+
+@pytest.mark.asyncio
+async def test_batch_applies_all_or_nothing(mock_hass):
+    storage_a = await add_entry(mock_hass, "a", ["A0", "A1"])
+    storage_b = await add_entry(mock_hass, "b", ["B0"])
+    refresh_a, refresh_b = AsyncMock(), AsyncMock()
+    storage_a.set_update_callback(refresh_a)
+    storage_b.set_update_callback(refresh_b)
+
+    rejected = await call_command(async_batch_recipes, mock_hass, operations=[
+        {"op": "update", "recipe_id": "a-0", "recipe": {"title": "A0b"}},
+        {"op": "delete", "recipe_id": "missing"},
+    ])
+    assert rejected["applied"] is False
+    assert [r["ok"] for r in rejected["results"]] == [True, False]
+    assert storage_a.get("a-0").title == "A0"
+
+    result = await call_command(async_batch_recipes, mock_hass, operations=[
+        {"op": "add", "recipe": {"id": "n1", "title": "New"}, "entry_id": "b"},
+        {"op": "update", "recipe_id": "a-0", "recipe": {"title": "A0b"}},
+        {"op": "update", "recipe_id": "n1", "recipe": {"title": "Newer"}},
+        {"op": "delete", "recipe_id": "a-1"},
+    ])
+    assert result["applied"] is True
+    assert [(r["entry_id"], r["recipe_id"]) for r in result["results"]] == [
+        ("b", "n1"), ("a", "a-0"), ("b", "n1"), ("a", "a-1"),
+    ]
+    assert [r.title for r in storage_a.recipes] == ["A0b"]
+    assert [r.title for r in storage_b.recipes] == ["B0", "Newer"]
+    # Each touched collection notifies its listeners once
+    assert refresh_a.await_count == 1 and refresh_b.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_stores_images_before_changing_anything(mock_hass):
+    class FailingImages:
+        def __init__(self):
+            self.puts = 0
+            self.collects = 0
+        async def async_put_data_url(self, data_url):
+            self.puts += 1
+            if self.puts == 2:
+                raise OSError("disk full")
+            return f"recipecards-image:img{self.puts}"
+        def async_schedule_collect(self):
+            self.collects += 1
+
+    images = FailingImages()
+    storage = storage_mod.RecipeStorage(mock_hass, "a", images=images)
+    await storage.async_add_recipe(Recipe(id="a-0", title="A0", instructions=["step"]))
+    mock_hass.data[DOMAIN]["a"] = {"storage": storage}
+    image = "data:image/png;base64,AAAA"
+
+    error = await call_command(async_batch_recipes, mock_hass, operations=[
+        {"op": "delete", "recipe_id": "a-0"},
+        {"op": "add", "recipe": {"id": "n1", "title": "One", "image": image}},
+        {"op": "add", "recipe": {"id": "n2", "title": "Two", "image": image}},
+    ])
+    assert error[1] == "storage_error"
+    assert [r.id for r in storage.recipes] == ["a-0"]
+    # The image stored for "n1" is no longer held and is left to the collector
+    assert storage.image_ids() == set() and images.collects == 1
+
+    result = await call_command(async_batch_recipes, mock_hass, operations=[
+        {"op": "add", "recipe": {"id": "n3", "title": "Three", "image": image}},
+    ])
+    assert result["applied"] is True
+    assert storage.get("n3").image == "recipecards-image:img3"
+    assert storage.image_ids() == {"img3"}
+
+
+@pytest.mark.asyncio
+async def test_batch_and_what_can_i_make_run_through_the_connection(mock_hass):
+    storage = await add_entry(mock_hass, "a", ["A0"])
+    reply = await handle_command(mock_hass, type="recipecards/recipe_batch", operations=[
+        {"op": "add", "recipe": {"id": "n1", "title": "Toast", "ingredients": ["bread", "butter"]}},
+    ])
+    assert reply["success"] is True and reply["result"]["applied"] is True
+    assert storage.contains("n1")
+
+    reply = await handle_command(mock_hass, type="recipecards/what_can_i_make", ingredients=["bread", "butter"])
+    assert reply["success"] is True
+    assert [r["id"] for r in reply["result"]] == ["n1"]
@@ -0,0 +1,74 @@
+import base64
+import pytest
+from custom_components.recipecards.images import ImageStore, image_id_from_ref, make_ref
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.storage import RecipeStorage
+
+PNG = b"\x89PNG\r\n\x1a\nfake-png-bytes"
+DATA_URL = "data:image/png;base64," + base64.b64encode(PNG).decode()
+
+
+@pytest.fixture
+def images(mock_hass):
+    return ImageStore(mock_hass)
+
+
+@pytest.mark.asyncio
+async def test_put_is_content_addressed(images):
+    ref = await images.async_put_data_url(DATA_URL)
+    assert ref == await images.async_put_data_url(DATA_URL)
+    image_id = image_id_from_ref(ref)
+    assert len(image_id) == 64
+    assert [p.name for p in images.path.iterdir()] == [f"{image_id}.png"]
+    raw, mime = await images.async_read(image_id)
+    assert raw == PNG
+    assert mime == "image/png"
+    assert await images.async_data_urls([image_id]) == {image_id: DATA_URL}
+
+
+@pytest.mark.asyncio
+async def test_put_rejects_undecodable_payloads(images):
+    assert await images.async_put_data_url("data:image/svg+xml;utf8,<svg/>") is None
+    assert await images.async_put_data_url("data:image/png;base64,!!!") is None
+
+
+@pytest.mark.asyncio
+async def test_collect_garbage_keeps_referenced(images):
+    keep = image_id_from_ref(await images.async_put_data_url(DATA_URL))
+    other = "data:image/jpeg;base64," + base64.b64encode(b"jpeg").decode()
+    drop = image_id_from_ref(await images.async_put_data_url(other))
+    assert await images.async_collect_garbage({keep}) == 1
+    assert await images.async_read(drop) is None
+    assert await images.async_read(keep) is not None
+
+
+@pytest.mark.asyncio
+async def test_storage_migrates_inline_images(mock_hass, dummy_store, images):
+    dummy_store.data = [Recipe(id="1", title="A", image=DATA_URL).to_dict()]
+    storage = RecipeStorage(mock_hass, "e1", images=images)
+    recipes = await storage.async_load_recipes()
+    ref = recipes[0].image
+    assert image_id_from_ref(ref) is not None
+    assert storage.image_ids() == {image_id_from_ref(ref)}
+    await storage.async_flush()
+    assert dummy_store.data[0]["image"] == ref
+
+    # New uploads are stored the same way and URLs are left alone
+    await storage.async_add_recipe(Recipe(id="2", title="B", image=DATA_URL))
+    await storage.async_add_recipe(Recipe(id="3", title="C", image="https://x/y.png"))
+    assert storage.get("2").image == ref
+    assert storage.get("3").image == "https://x/y.png"
+    assert make_ref(image_id_from_ref(ref)) == ref
+
+
+@pytest.mark.asyncio
+async def test_replacing_a_recipe_releases_its_image(mock_hass, images, monkeypatch):
+    collects = []
+    monkeypatch.setattr(images, "async_schedule_collect", lambda: collects.append(True))
+    storage = RecipeStorage(mock_hass, "e1", images=images)
+    await storage.async_add_recipe(Recipe(id="1", title="A", image=DATA_URL))
+    await storage.async_add_recipe(Recipe(id="1", title="A", image=DATA_URL))
+    assert collects == []
+    # Adding over an existing id drops the old image reference like an update
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    assert collects == [True]
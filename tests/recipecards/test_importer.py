@@ -0,0 +1,159 @@
+import gzip
+import json
+import zipfile
+import pytest
+from unittest.mock import MagicMock
+from homeassistant.exceptions import ServiceValidationError
+import custom_components.recipecards.importer as importer
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.const import DOMAIN, EVENT_IMPORT_PROGRESS
+from custom_components.recipecards.importer import iter_import_file, parse_duration, recipe_from_object
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.services import async_import_recipes
+
+SCHEMA_RECIPE = {
+    "@context": "https://schema.org",
+    "@type": "Recipe",
+    "name": "Pancakes",
+    "description": "Fluffy",
+    "recipeIngredient": ["200 g flour", "2 eggs"],
+    "recipeInstructions": [
+        {"@type": "HowToSection", "name": "Batter", "itemListElement": [
+            {"@type": "HowToStep", "text": "Whisk everything"},
+        ]},
+        {"@type": "HowToStep", "text": "Fry"},
+    ],
+    "prepTime": "PT10M",
+    "cookTime": "PT1H5M",
+    "image": {"@type": "ImageObject", "url": "https://example.com/p.jpg"},
+}
+
+
+def test_parse_duration():
+    assert parse_duration("PT1H30M") == 90
+    assert parse_duration("P0DT0H45M") == 45
+    assert parse_duration("PT90S") == 2
+    assert parse_duration("1 hr 15 mins") == 75
+    assert parse_duration("20") == 20
+    assert parse_duration("soon") is None
+    assert parse_duration("P") is None
+
+
+def test_schema_org_mapping():
+    recipe = recipe_from_object(SCHEMA_RECIPE)
+    assert recipe.title == "Pancakes"
+    assert recipe.ingredients == ("200 g flour", "2 eggs")
+    assert recipe.instructions == ("Whisk everything", "Fry")
+    assert (recipe.prep_time, recipe.cook_time, recipe.total_time) == (10, 65, 75)
+    assert recipe.image == "https://example.com/p.jpg"
+    with pytest.raises(ValueError):
+        recipe_from_object({"@type": "Recipe"})
+
+
+def test_streams_json_array_in_small_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "_READ_SIZE", 16)
+    path = tmp_path / "recipes.json"
+    items = [{**SCHEMA_RECIPE, "name": f"R{i}"} for i in range(5)] + [{"@type": "WebPage"}, 7]
+    path.write_text(json.dumps(items, indent=1))
+    parsed = list(iter_import_file(str(path), "jsonld"))
+    assert [i.recipe.title for i in parsed if i.recipe] == ["R0", "R1", "R2", "R3", "R4"]
+    # The WebPage node is skipped silently; the number is reported
+    assert [i.error for i in parsed if i.error] == ["Item 7: Not a JSON object"]
+
+
+def test_bad_or_oversized_array_elements_fail_fast(tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "_READ_SIZE", 16)
+    monkeypatch.setattr(importer, "_MAX_ELEMENT_SIZE", 1024)
+    path = tmp_path / "recipes.json"
+
+    def _items(text):
+        path.write_text(text)
+        return list(iter_import_file(str(path), "jsonld"))
+
+    recipe = json.dumps({**SCHEMA_RECIPE, "name": "R0"})
+    with pytest.raises(ValueError, match="^Item 2: Expecting ',' delimiter"):
+        _items(f"[{recipe}, {{\"name\": \"x\" \"y\": 1}}, {recipe}]" + " " * 10_000)
+    with pytest.raises(ValueError, match="^Item 2: larger than 1024 characters"):
+        _items(f"[{recipe}, {{\"name\": \"{'x' * 10_000}\"}}]")
+    with pytest.raises(ValueError, match="^Item 1: Unterminated string"):
+        _items('[{"name": "never closed')
+
+
+def test_streams_graph_elements_in_small_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "_READ_SIZE", 16)
+    monkeypatch.setattr(importer, "_MAX_ELEMENT_SIZE", 1024)
+    path = tmp_path / "page.jsonld"
+    # Larger than one value may be, but every graph node fits
+    graph = [{"@type": "WebSite"}] + [{**SCHEMA_RECIPE, "name": f"R{i}"} for i in range(20)]
+    path.write_text(json.dumps({"@context": "https://schema.org", "@graph": graph, "name": "Site"}, indent=1))
+    parsed = list(iter_import_file(str(path), "jsonld"))
+    assert [i.recipe.title for i in parsed] == [f"R{i}" for i in range(20)]
+
+    path.write_text(json.dumps({"@context": "https://schema.org", "description": "x" * 2000}))
+    with pytest.raises(ValueError, match="^Member 'description': larger than 1024 characters"):
+        list(iter_import_file(str(path), "jsonld"))
+
+
+def test_jsonld_graph_ndjson_and_paprika(tmp_path):
+    graph = tmp_path / "page.jsonld"
+    graph.write_text(json.dumps({"@graph": [{"@type": "WebSite"}, SCHEMA_RECIPE]}))
+    assert [i.recipe.title for i in iter_import_file(str(graph), "jsonld")] == ["Pancakes"]
+
+    ndjson = tmp_path / "recipes.ndjson"
+    ndjson.write_text(json.dumps(Recipe(id="x", title="Stored").to_dict()) + "\n\n{broken\n")
+    items = list(iter_import_file(str(ndjson), "ndjson"))
+    assert items[0].recipe.title == "Stored" and items[0].recipe.id != "x"
+    assert items[1].error.startswith("Line 3:")
+
+    paprika = tmp_path / "export.paprikarecipes"
+    with zipfile.ZipFile(paprika, "w") as archive:
+        archive.writestr("Soup.paprikarecipe", gzip.compress(json.dumps({
+            "name": "Soup", "ingredients": "1 onion\n\n2 carrots", "directions": "Chop\nSimmer",
+            "prep_time": "10 mins", "cook_time": "1 hr", "photo_data": "aGk=",
+        }).encode()))
+    (item,) = iter_import_file(str(paprika), "paprika")
+    assert item.recipe.ingredients == ("1 onion", "2 carrots")
+    assert item.recipe.instructions == ("Chop", "Simmer")
+    assert item.recipe.total_time == 70
+    assert item.recipe.image == "data:image/jpeg;base64,aGk="
+
+
+@pytest.mark.asyncio
+async def test_import_service_dedupes_in_chunks(tmp_path, mock_hass, dummy_store, monkeypatch):
+    monkeypatch.setattr(importer, "IMPORT_CHUNK_SIZE", 2)
+    dummy_store.data = [
+        Recipe(id="old", title="R0", ingredients=["200 g flour", "2 eggs"], instructions=["Whisk everything", "Fry"]).to_dict()
+    ]
+    mock_hass.config.is_allowed_path = lambda path: path.startswith(str(tmp_path))
+    storage = storage_mod.RecipeStorage(mock_hass, "e1")
+    refreshes = []
+
+    async def _refresh():
+        refreshes.append(True)
+
+    storage.set_update_callback(_refresh)
+    mock_hass.data = {DOMAIN: {"e1": {"storage": storage, "coordinator": MagicMock()}}}
+
+    path = tmp_path / "recipes.ndjson"
+    lines = [{**SCHEMA_RECIPE, "name": f"R{i % 3}"} for i in range(5)]
+    path.write_text("\n".join(json.dumps(line) for line in lines))
+    call = MagicMock()
+    call.hass = mock_hass
+    call.data = {"path": str(path)}
+    # Each progress event follows a save of everything it reports
+    saved = []
+    mock_hass.bus.async_fire.side_effect = lambda *a: saved.append([d["title"] for d in dummy_store.data])
+
+    response = await async_import_recipes(call)
+    assert response == {"config_entry_id": "e1", "imported": 2, "duplicates": 3, "failed": 0, "errors": []}
+    assert [r.title for r in storage.recipes] == ["R0", "R1", "R2"]
+    assert saved == [["R0", "R1"], ["R0", "R1", "R2"], ["R0", "R1", "R2"], ["R0", "R1", "R2"]]
+    # One notification per chunk that added recipes
+    assert refreshes == [True, True]
+    events = [c[0] for c in mock_hass.bus.async_fire.call_args_list]
+    assert all(name == EVENT_IMPORT_PROGRESS for name, _ in events)
+    assert [data["done"] for _, data in events] == [False, False, False, True]
+
+    call.data = {"path": "/etc/passwd", "format": "ndjson"}
+    with pytest.raises(ServiceValidationError):
+        await async_import_recipes(call)
@@ -42,3 +42,33 @@ async def test_config_flow_user_submit_creates_entry_with_initial_recipe():
     assert result["type"] == "create_entry"
     assert result["title"] == "My First"
     assert "initial_recipe" in result["data"]
+
+@pytest.mark.asyncio
+async def test_changes_are_pushed_to_own_coordinator_and_merged(mock_hass, monkeypatch):
+    import asyncio
+    import custom_components.recipecards as integration
+    import custom_components.recipecards.storage as storage_mod
+    from custom_components.recipecards.models import Recipe
+
+    monkeypatch.setattr(integration, "UPDATE_COOLDOWN", 0.01)
+    loop = asyncio.get_running_loop()
+    hass = mock_hass
+    hass.loop = loop
+    hass.async_run_hass_job = lambda job: job.target()
+    hass.async_create_task = lambda coro, *args, **kwargs: loop.create_task(coro)
+
+    storage = storage_mod.RecipeStorage(hass, "e1")
+    coordinator = MagicMock()
+    integration._push_updates(hass, storage, coordinator)
+
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    # The first change is pushed at once, without a refresh
+    assert coordinator.async_set_updated_data.call_count == 1
+    coordinator.async_request_refresh.assert_not_called()
+    for i in range(2, 6):
+        await storage.async_add_recipe(Recipe(id=str(i), title="B"))
+    assert coordinator.async_set_updated_data.call_count == 1
+    await asyncio.sleep(0.05)
+    # The burst is merged into one more update with everything in it
+    assert coordinator.async_set_updated_data.call_count == 2
+    assert len(coordinator.async_set_updated_data.call_args[0][0]) == 5
@@ -0,0 +1,140 @@
+import os
+import pytest
+import custom_components.recipecards.journal_backend as journal_mod
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.const import ENGINE_JOURNAL, ENGINE_JSON, ENGINE_SQLITE
+from custom_components.recipecards.models import Recipe
+
+
+def _journal_lines(hass):
+    path = journal_mod.journal_path(hass, "e1")
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as journal:
+        return journal.read().splitlines()
+
+
+@pytest.mark.asyncio
+async def test_mutations_append_records_without_rewriting_snapshot(loop_hass, dummy_store):
+    storage = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    await storage.async_load_recipes()
+    for rid in ("1", "2", "3"):
+        await storage.async_add_recipe(Recipe(id=rid, title=f"R{rid}"))
+    await storage.async_update_recipe("2", Recipe(id="2", title="R2b"))
+    await storage.async_delete_recipe("1")
+    await storage.async_flush()
+    assert len(_journal_lines(loop_hass)) == 5
+    assert dummy_store.saves == 0
+
+    # A fresh instance replays the journal over the (empty) snapshot
+    reloaded = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    recipes = await reloaded.async_load_recipes()
+    assert [(r.id, r.title) for r in recipes] == [("2", "R2b"), ("3", "R3")]
+
+
+@pytest.mark.asyncio
+async def test_torn_trailing_record_is_dropped(loop_hass, dummy_store):
+    storage = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    await storage.async_load_recipes()
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    await storage.async_flush()
+    with open(journal_mod.journal_path(loop_hass, "e1"), "ab") as journal:
+        journal.write(b'{"op":"put","recipe":{"id":"2"')
+
+    reloaded = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    assert [r.id for r in await reloaded.async_load_recipes()] == ["1"]
+    # The partial line is cut off so later appends start on a clean line
+    await reloaded.async_add_recipe(Recipe(id="3", title="C"))
+    await reloaded.async_flush()
+    again = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    assert [r.id for r in await again.async_load_recipes()] == ["1", "3"]
+
+
+@pytest.mark.asyncio
+async def test_background_compaction(loop_hass, dummy_store, monkeypatch):
+    monkeypatch.setattr(journal_mod, "JOURNAL_COMPACT_BYTES", 1)
+    storage = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    await storage.async_load_recipes()
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    await storage.async_add_recipe(Recipe(id="2", title="B"))
+    await storage.async_flush()
+    await loop_hass.async_block_till_done()
+    assert _journal_lines(loop_hass) == []
+    assert [d["id"] for d in dummy_store.data] == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_matches_journal_if_truncation_never_happens(loop_hass, dummy_store):
+    storage = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    await storage.async_load_recipes()
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    await storage.async_add_recipe(Recipe(id="2", title="B"))
+    run = loop_hass.async_add_executor_job
+    edited = []
+
+    async def _executor(func, *args):
+        if func is journal_mod._append and not edited:
+            # Edits made while the journal append is in flight
+            edited.append(True)
+            await storage.async_update_recipe("1", Recipe(id="1", title="A2"))
+            await storage.async_delete_recipe("2")
+        if func is journal_mod._truncate:
+            # The process dies between the snapshot and the truncation
+            return None
+        return await run(func, *args)
+
+    loop_hass.async_add_executor_job = _executor
+    await storage.async_save_recipes()
+
+    # Nothing written after the snapshot survives the crash
+    loop_hass.async_add_executor_job = run
+    reloaded = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    assert [(r.id, r.title) for r in await reloaded.async_load_recipes()] == [("1", "A2")]
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_compaction(loop_hass, dummy_store, monkeypatch):
+    monkeypatch.setattr(journal_mod, "JOURNAL_COMPACT_BYTES", 1)
+    storage = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    await storage.async_load_recipes()
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    await storage.async_flush()
+    assert loop_hass.tasks
+    await storage.async_close()
+    assert all(task.done() for task in loop_hass.tasks)
+    assert [d["id"] for d in dummy_store.data] == ["1"] and _journal_lines(loop_hass) == []
+
+
+@pytest.mark.asyncio
+async def test_switching_engines_migrates_data(loop_hass, dummy_store):
+    dummy_store.data = [Recipe(id="1", title="From json").to_dict()]
+    journal = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    assert [r.id for r in await journal.async_load_recipes()] == ["1"]
+    await journal.async_add_recipe(Recipe(id="2", title="From journal"))
+    await journal.async_flush()
+
+    # Back to the json engine: the journal is folded into the Store and removed
+    store = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JSON)
+    assert [r.id for r in await store.async_load_recipes()] == ["1", "2"]
+    assert [d["id"] for d in dummy_store.data] == ["1", "2"]
+    assert not os.path.exists(journal_mod.journal_path(loop_hass, "e1"))
+
+
+@pytest.mark.asyncio
+async def test_journal_to_sqlite_to_json_does_not_replay_old_journal(loop_hass, dummy_store):
+    journal = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JOURNAL)
+    await journal.async_load_recipes()
+    await journal.async_add_recipe(Recipe(id="A", title="A"))
+    await journal.async_flush()
+
+    await journal.async_migrate_to(ENGINE_SQLITE)
+    await journal.async_close()
+    assert not os.path.exists(journal_mod.journal_path(loop_hass, "e1"))
+    sqlite = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_SQLITE)
+    assert [r.id for r in await sqlite.async_load_recipes()] == ["A"]
+    await sqlite.async_delete_recipe("A")
+    await sqlite.async_migrate_to(ENGINE_JSON)
+    await sqlite.async_close()
+
+    store = storage_mod.RecipeStorage(loop_hass, "e1", engine=ENGINE_JSON)
+    assert await store.async_load_recipes() == []
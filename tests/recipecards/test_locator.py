@@ -0,0 +1,39 @@
+import pytest
+from custom_components.recipecards.api import async_delete_recipe, async_get_recipe, async_list_recipes
+from custom_components.recipecards.const import DATA_RECIPE_LOCATOR, DOMAIN
+from custom_components.recipecards.models import Recipe
+from .helpers import add_entry, call_command
+
+
+@pytest.mark.asyncio
+async def test_locator_routes_lookups_to_the_owning_entry(mock_hass, monkeypatch):
+    await add_entry(mock_hass, "a", ["A0"])
+    storage_b = await add_entry(mock_hass, "b", ["B0", "B1"])
+    locator = mock_hass.data[DOMAIN][DATA_RECIPE_LOCATOR]
+    assert locator.as_dict() == {"a-0": "a", "b-0": "b", "b-1": "b"}
+
+    monkeypatch.setattr("custom_components.recipecards.api.cleanup_recipe_entities", lambda *a: None)
+    assert (await call_command(async_get_recipe, mock_hass, recipe_id="b-1"))["_entry_id"] == "b"
+    assert await call_command(async_delete_recipe, mock_hass, recipe_id="b-0") is True
+    assert locator.get("b-0") is None
+    assert (await call_command(async_get_recipe, mock_hass, recipe_id="b-0"))[1] == "not_found"
+
+    await storage_b.async_close()
+    assert locator.as_dict() == {"a-0": "a"}
+
+
+@pytest.mark.asyncio
+async def test_locator_survives_odd_and_shared_ids(mock_hass, monkeypatch):
+    monkeypatch.setattr("custom_components.recipecards.api.cleanup_recipe_entities", lambda *a: None)
+    storage_a = await add_entry(mock_hass, "a", ["A0"])
+    storage_b = await add_entry(mock_hass, "b", ["B0"])
+    # An id that matches the key of an entry's data is still just a recipe id
+    await storage_a.async_add_recipe(Recipe(id="storage", title="Odd", instructions=["step"]))
+    assert [r["id"] for r in await call_command(async_list_recipes, mock_hass)] == ["a-0", "storage", "b-0"]
+
+    # Both entries hold "shared"; deleting it from the mapped one falls back to the other
+    await storage_a.async_add_recipe(Recipe(id="shared", title="In A", instructions=["step"]))
+    await storage_b.async_add_recipe(Recipe(id="shared", title="In B", instructions=["step"]))
+    assert await call_command(async_delete_recipe, mock_hass, recipe_id="shared") is True
+    assert storage_b.contains("shared") is False
+    assert (await call_command(async_get_recipe, mock_hass, recipe_id="shared"))["title"] == "In A"
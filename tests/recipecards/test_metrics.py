@@ -0,0 +1,111 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from homeassistant.helpers.json import json_bytes
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards import async_unload_entry
+from custom_components.recipecards.api import _metered, async_get_recipe
+from custom_components.recipecards.const import DATA_METRICS, DATA_PERFORMANCE_SENSOR, DOMAIN
+from custom_components.recipecards.diagnostics import async_get_config_entry_diagnostics
+from custom_components.recipecards.metrics import (
+    PerformanceMetrics,
+    async_disable_metrics,
+    async_enable_metrics,
+    get_metrics,
+    measure,
+)
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.sensor import RecipeCardsPerformanceSensor, async_setup_entry
+from .helpers import handle_command
+
+
+def test_percentiles_over_rolling_window():
+    metrics = PerformanceMetrics(window=100)
+    for ms in range(1, 201):
+        metrics.record("op", ms / 1000, size=ms)
+    stats = metrics.as_dict()["op"]
+    # Counts cover every call; percentiles only the last 100 samples
+    assert stats["calls"] == 200 and stats["bytes_total"] == sum(range(1, 201))
+    assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]) == (151.0, 196.0, 200.0, 200.0)
+    assert stats["bytes_p50"] == 151 and stats["bytes_max"] == 200
+
+    with pytest.raises(ValueError):
+        with metrics.measure("failing"):
+            raise ValueError
+    assert metrics.as_dict()["failing"]["errors"] == 1
+    assert "bytes_total" not in metrics.as_dict()["failing"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_metrics_record_nothing(mock_hass):
+    assert get_metrics(mock_hass) is None
+    with measure(mock_hass, "op") as measurement:
+        measurement.size = 10
+    storage = storage_mod.RecipeStorage(mock_hass, "e1")
+    await storage.async_load_recipes()
+    assert (await handle_command(mock_hass, type="recipecards/recipe_list"))["result"] == []
+    assert DATA_METRICS not in mock_hass.data[DOMAIN]
+
+
+@pytest.mark.asyncio
+async def test_commands_storage_and_diagnostics_are_measured(mock_hass):
+    metrics = async_enable_metrics(mock_hass)
+    storage = storage_mod.RecipeStorage(mock_hass, "e1")
+    await storage.async_add_recipe(Recipe(id="r1", title="Soup", instructions=["Simmer"]))
+    await storage.async_save_recipes()
+    mock_hass.data[DOMAIN]["e1"] = {"storage": storage}
+
+    assert _metered(async_get_recipe)._ws_command == "recipecards/recipe_get"
+    reply = await handle_command(mock_hass, type="recipecards/recipe_get", recipe_id="r1")
+    # The result was encoded to count its bytes and sent as is
+    assert reply["result"]["title"] == "Soup"
+    sent = json_bytes(reply)
+    reply = await handle_command(mock_hass, type="recipecards/recipe_get", recipe_id="missing")
+    assert reply["success"] is False
+
+    operations = metrics.as_dict()
+    assert operations["recipecards/recipe_get"]["calls"] == 2
+    assert operations["recipecards/recipe_get"]["bytes_total"] == len(sent)
+    assert operations["storage_load"]["calls"] == 1
+    assert operations["storage_save"]["calls"] == 1
+
+    entry = MagicMock(entry_id="e1", options={"performance_metrics": True})
+    diagnostics = await async_get_config_entry_diagnostics(mock_hass, entry)
+    assert diagnostics["storage"]["recipes"] == 1 and diagnostics["storage"]["engine"] == "json"
+    assert diagnostics["performance"] == metrics.as_dict()
+
+    sensor = RecipeCardsPerformanceSensor()
+    sensor.hass = mock_hass
+    assert sensor.native_value == max(s["p95_ms"] for s in operations.values())
+    assert sensor.extra_state_attributes["operations"].keys() == operations.keys()
+
+    async_disable_metrics(mock_hass)
+    assert not sensor.available
+    assert (await async_get_config_entry_diagnostics(mock_hass, entry))["performance"] is None
+
+
+@pytest.mark.asyncio
+async def test_one_performance_sensor_for_the_domain(mock_hass):
+    added = {}
+    for entry_id in ("e1", "e2"):
+        mock_hass.data[DOMAIN][entry_id] = {"coordinator": MagicMock(data=[])}
+        entry = MagicMock(entry_id=entry_id, options={"performance_metrics": True})
+        await async_setup_entry(mock_hass, entry, lambda entities, entry_id=entry_id: added.setdefault(entry_id, []).extend(entities))
+    performance = [
+        (entry_id, e.unique_id) for entry_id, entities in added.items()
+        for e in entities if isinstance(e, RecipeCardsPerformanceSensor)
+    ]
+    assert performance == [("e1", "recipecards_performance")]
+    assert mock_hass.data[DOMAIN][DATA_PERFORMANCE_SENSOR] == "e1"
+
+    # Unloading the providing entry hands the sensor to one still collecting
+    mock_hass.data[DOMAIN]["e1"].update(storage=AsyncMock(), performance_metrics=True)
+    mock_hass.data[DOMAIN]["e2"].update(storage=AsyncMock(), performance_metrics=True)
+    mock_hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    await async_unload_entry(mock_hass, MagicMock(entry_id="e1"))
+    assert mock_hass.data[DOMAIN][DATA_PERFORMANCE_SENSOR] == "e2"
+    assert isinstance(added["e2"][-1], RecipeCardsPerformanceSensor)
+    mock_hass.config_entries.async_schedule_reload.assert_not_called()
+
+    # The last collecting entry takes it away with it
+    await async_unload_entry(mock_hass, MagicMock(entry_id="e2"))
+    assert DATA_PERFORMANCE_SENSOR not in mock_hass.data[DOMAIN]
@@ -1,3 +1,4 @@
+import json
 import pytest
 from custom_components.recipecards.models import Recipe
 
@@ -10,13 +11,35 @@ def test_recipe_serialization():
         "notes": "note",
         "instructions": ["step 1", "step 2"],
         "color": "#FF0000",
+        "image": None,
+        "prep_time": None,
+        "cook_time": None,
+        "total_time": None,
     }
     recipe = Recipe.from_dict(data)
     assert recipe.id == "abc123"
     assert recipe.title == "Test Recipe"
     assert recipe.description == "desc"
-    assert recipe.ingredients == ["eggs", "milk"]
+    assert recipe.ingredients == ("eggs", "milk")
     assert recipe.notes == "note"
-    assert recipe.instructions == ["step 1", "step 2"]
+    assert recipe.instructions == ("step 1", "step 2")
     assert recipe.color == "#FF0000"
-    assert recipe.to_dict() == data 
\ No newline at end of file
+    assert recipe.to_dict() == data
+
+def test_recipe_is_compact_and_caches_json():
+    recipe = Recipe.from_dict({"id": "a", "title": "Soup", "ingredients": ["leek"], "color": "".join(["#", "ABCDEF"])})
+    assert not hasattr(recipe, "__dict__")
+    assert recipe.instructions == ()
+    assert recipe.color is Recipe(id="b", title="", color="#ABCDEF").color
+
+    encoded = recipe.to_json()
+    assert recipe.to_json() is encoded
+    assert json.loads(encoded) == recipe.to_dict()
+    # Callers get their own lists; the recipe keeps its tuples
+    recipe.to_dict()["ingredients"].append("salt")
+    assert recipe.ingredients == ("leek",)
+    recipe.ingredients = ["leek", "potato"]
+    assert recipe.ingredients == ("leek", "potato")
+    assert json.loads(recipe.to_json())["ingredients"] == ["leek", "potato"]
+    # The cache is not part of equality
+    assert recipe == Recipe.from_dict(recipe.to_dict())
@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import MagicMock
+from custom_components.recipecards.const import DOMAIN
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.pantry import PantryIndex, normalize_ingredients
+from custom_components.recipecards.services import async_what_can_i_make
+
+RECIPES = [
+    Recipe(id="salad", title="Salad", ingredients=["2 large tomatoes, diced", "1 cucumber", "Salt and pepper"]),
+    Recipe(id="omelette", title="Omelette", ingredients=["3 eggs", "50 ml milk", "salt"]),
+    Recipe(id="pasta", title="Pasta", ingredients=["200g pasta", "1 can chopped tomatoes", "2 cloves garlic"]),
+    Recipe(id="toast", title="Toast", ingredients=["1 slice bread"]),
+]
+
+
+def _index():
+    index = PantryIndex()
+    index.add_all(RECIPES)
+    return index
+
+
+def test_normalize_ingredients():
+    assert normalize_ingredients("2 large tomatoes, diced") == ["tomato"]
+    assert normalize_ingredients("Salt and pepper to taste") == ["salt", "pepper"]
+    assert normalize_ingredients("2 tbsp extra virgin olive oil") == normalize_ingredients("Olive oil")
+    assert normalize_ingredients("½ cup (120 ml) milk") == ["milk"]
+    assert normalize_ingredients("1 1/2 cups cherry tomatoes") == ["cherry tomato"]
+
+
+def test_ranked_by_missing_then_coverage():
+    matches = _index().query(["Tomato", "eggs", "salt", "Milk", "cucumbers"])
+    assert [(m.recipe_id, m.missing_count) for m in matches] == [("omelette", 0), ("salad", 1), ("pasta", 2)]
+    salad = matches[1]
+    assert salad.coverage == 0.75
+    assert salad.missing == ["Salt and pepper"]
+    assert set(salad.matched) == {"2 large tomatoes, diced", "1 cucumber", "Salt and pepper"}
+
+
+def test_max_missing_limit_and_updates():
+    index = _index()
+    assert [m.recipe_id for m in index.query(["tomato", "salt", "pepper"], max_missing=1)] == ["salad"]
+    assert len(index.query(["tomato", "salt"], limit=1)) == 1
+    assert index.query(["caviar"]) == []
+    index.add(Recipe(id="toast", title="Toast", ingredients=["bread", "butter"]))
+    index.remove("salad")
+    assert [m.recipe_id for m in index.query(["butter", "tomato"])] == ["toast", "pasta"]
+    assert "salad" not in index
+
+
+def test_compaction_keeps_results(monkeypatch):
+    index = PantryIndex()
+    for i in range(3000):
+        index.add(Recipe(id=str(i), title=str(i), ingredients=["flour", f"spice{i}"]))
+    for i in range(2500):
+        index.remove(str(i))
+    assert len(index) == 500
+    matches = index.query(["flour", "spice2999"], limit=None)
+    assert len(matches) == 500
+    assert matches[0].recipe_id == "2999" and matches[0].missing_count == 0
+
+
+@pytest.mark.asyncio
+async def test_service_returns_response_across_entries():
+    class Storage:
+        def __init__(self, recipes):
+            self._index = PantryIndex()
+            self._index.add_all(recipes)
+            self._recipes = {r.id: r for r in recipes}
+
+        async def async_what_can_i_make(self, pantry, max_missing, limit):
+            return [(self._recipes[m.recipe_id], m) for m in self._index.query(pantry, max_missing, limit)]
+
+    hass = MagicMock()
+    hass.data = {DOMAIN: {
+        "a": {"storage": Storage(RECIPES[:2])},
+        "b": {"storage": Storage(RECIPES[2:])},
+        "api_registered": True,
+    }}
+    call = MagicMock()
+    call.hass = hass
+    call.data = {"ingredients": ["bread", "tomatoes"], "limit": 2}
+    response = await async_what_can_i_make(call)
+    assert [(r["recipe_id"], r["config_entry_id"], r["missing_count"]) for r in response["recipes"]] == [
+        ("toast", "b", 0),
+        ("pasta", "b", 2),
+    ]
@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import MagicMock
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.api import async_list_recipes, async_search_recipes
+from custom_components.recipecards.const import DOMAIN
+from custom_components.recipecards.models import Recipe
+from .helpers import add_entry, call_command
+
+
+@pytest.mark.asyncio
+async def test_list_replies_are_spliced_and_cached_per_revision(mock_hass, monkeypatch):
+    monkeypatch.setattr(
+        "custom_components.recipecards.api.async_signed_image_url",
+        lambda hass, image_id, size=None, refresh_token_id=None: f"/signed/{image_id}/{size}",
+    )
+    storage = await add_entry(mock_hass, "a", ["A0"])
+    await storage.async_add_recipe(Recipe(id="pic", title="Pic", image="recipecards-image:abc"))
+    fragments = MagicMock(wraps=storage.recipe_json)
+    monkeypatch.setattr(storage, "recipe_json", fragments)
+
+    result = await call_command(async_list_recipes, mock_hass)
+    assert [(d["id"], d["_entry_id"]) for d in result] == [("a-0", "a"), ("pic", "a")]
+    assert result[1]["image"] == "/signed/abc/None" and result[1]["image_thumb"] == "/signed/abc/thumb"
+    assert result[0]["instructions"] == ["step"] and result[0]["image"] is None
+    assert fragments.call_count == 2
+
+    # Unchanged collection: the whole reply comes from the cache
+    assert await call_command(async_list_recipes, mock_hass) == result
+    assert fragments.call_count == 2
+    # Other parameters are cached separately
+    page = await call_command(async_list_recipes, mock_hass, limit=1)
+    assert [d["id"] for d in page["recipes"]] == ["a-0"] and page["next_cursor"]
+
+    await storage.async_update_recipe("a-0", Recipe(id="a-0", title="A0b"))
+    fragments.reset_mock()
+    assert [d["title"] for d in await call_command(async_list_recipes, mock_hass)] == ["A0b", "Pic"]
+    assert fragments.call_count == 2
+    assert storage.recipe_json("pic") is storage.recipe_json("pic")
+    assert b"recipecards-image" not in storage.recipe_json("pic")
+
+
+@pytest.mark.asyncio
+async def test_search_replies_are_not_reused_once_the_index_is_built(mock_hass, dummy_stores, monkeypatch):
+    monkeypatch.setattr(storage_mod, "INDEX_SYNC_LIMIT", 1)
+    recipes = [Recipe(id="1", title="Soup", ingredients=["tomato"]), Recipe(id="2", title="Tomato pie")]
+    dummy_stores["recipecards_a.json"].data = [r.to_dict() for r in recipes]
+    builds = []
+    mock_hass.async_create_background_task = lambda coro, name: builds.append(coro)
+    storage = storage_mod.RecipeStorage(mock_hass, "a")
+    await storage.async_load_recipes()
+    mock_hass.data[DOMAIN]["a"] = {"storage": storage}
+
+    # Linear fallback while the index is built: collection order, no score
+    unranked = await call_command(async_search_recipes, mock_hass, query="tomato")
+    assert [d["id"] for d in unranked] == ["1", "2"] and unranked[0]["_score"] is None
+    await builds[0]
+    ranked = await call_command(async_search_recipes, mock_hass, query="tomato")
+    assert ranked[0]["id"] == "2" and ranked[0]["_score"] > 0
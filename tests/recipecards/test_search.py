@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.search import SearchIndex, match_recipe, stem
+
+
+RECIPES = [
+    Recipe(id="1", title="Tomato soup", description="Rich and quick", ingredients=["4 tomatoes", "1 onion"]),
+    Recipe(id="2", title="Bread", ingredients=["flour", "water"], instructions=["Bake for 40 minutes"]),
+    Recipe(id="3", title="Pasta", ingredients=["pasta", "tomato sauce"], notes="Baked version in the oven"),
+]
+
+
+def _index():
+    index = SearchIndex()
+    index.add_all(RECIPES)
+    return index
+
+
+def test_stemming_lite():
+    assert stem("tomatoes") == stem("tomato")
+    assert stem("baked") == stem("baking") == stem("bake")
+    assert stem("chopped") == "chop"
+    assert stem("berries") == "berry"
+    assert stem("spring") == "spring"
+
+
+def test_and_query_ranking_and_hits():
+    index = _index()
+    results = index.search("Tomato")
+    ids = [recipe_id for recipe_id, _, _ in results]
+    # A title hit outranks an ingredient-only hit
+    assert ids == ["1", "3"]
+    assert results[0][2] == {"title": ["tomato"], "ingredients": ["tomato"]}
+    assert [r[0] for r in index.search("tomato baking")] == ["3"]
+    assert index.search("tomato flour") == []
+    assert index.search("  ") is None
+
+
+def test_partial_words_match_as_prefix():
+    index = _index()
+    assert [r[0] for r in index.search("tom")] == ["1", "3"]
+    assert [r[0] for r in index.search("pas sau")] == ["3"]
+
+
+def test_incremental_updates():
+    index = _index()
+    index.add(Recipe(id="2", title="Tomato bread"))
+    assert {r[0] for r in index.search("tomato")} == {"1", "2", "3"}
+    assert index.search("flour") == []
+    index.remove("1")
+    index.remove("missing")
+    assert {r[0] for r in index.search("tomato")} == {"2", "3"}
+    assert "1" not in index and len(index) == 2
+    # Terms that disappeared no longer match as prefixes
+    assert index.search("oni") == []
+
+
+def test_linear_fallback_agrees_with_index():
+    index = _index()
+    for query in ("tomato", "tom", "bake", "tomato oven", "water tomato"):
+        expected = {r[0] for r in index.search(query)}
+        assert {r.id for r in RECIPES if match_recipe(r, query) is not None} == expected
+
+
+@pytest.mark.asyncio
+async def test_storage_builds_large_index_in_background(mock_hass, dummy_store, monkeypatch):
+    monkeypatch.setattr(storage_mod, "INDEX_SYNC_LIMIT", 1)
+    monkeypatch.setattr(storage_mod, "INDEX_BATCH_SIZE", 1)
+    dummy_store.data = [r.to_dict() for r in RECIPES]
+    tasks = []
+    mock_hass.async_create_background_task = lambda coro, name: tasks.append(asyncio.ensure_future(coro))
+
+    storage = storage_mod.RecipeStorage(mock_hass, "e1")
+    await storage.async_load_recipes()
+    assert tasks and not storage._index_ready
+    # Linear fallback while the index is built
+    assert [r.recipe.id for r in await storage.async_search("tomato")] == ["1", "3"]
+    # A change during the build is indexed and not overwritten by it
+    await storage.async_update_recipe("3", Recipe(id="3", title="Pasta", ingredients=["cream"]))
+    await asyncio.gather(*tasks)
+    assert storage._index_ready
+    results = await storage.async_search("tomato")
+    assert [r.recipe.id for r in results] == ["1"]
+    assert results[0].score > 0 and "title" in results[0].hits
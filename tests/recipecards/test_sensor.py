@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.sensor import RecipeCardsCollectionSensor, RecipeSensor, collection_stats
+from custom_components.recipecards.storage import RecipeSnapshot
+
+
+def _coordinator(recipes, fingerprints=None, revision=7):
+    coordinator = MagicMock()
+    coordinator.last_update_success = True
+    by_id = {r.id: r for r in recipes}
+    coordinator.data = RecipeSnapshot(revision, by_id, fingerprints or dict.fromkeys(by_id, revision))
+    return coordinator
+
+
+def test_collection_stats():
+    recipes = [
+        Recipe(id="1", title="A", prep_time=10, total_time=40),
+        Recipe(id="2", title="B", prep_time=20, color="#FF0000"),
+        Recipe(id="3", title="C"),
+    ]
+    stats = collection_stats(recipes)
+    assert (stats["avg_prep_time"], stats["min_prep_time"], stats["max_prep_time"]) == (15.0, 10, 20)
+    assert stats["avg_total_time"] == 40 and stats["avg_cook_time"] is None
+    assert stats["color_counts"] == {"#FFD700": 2, "#FF0000": 1}
+    assert collection_stats([])["max_total_time"] is None
+
+
+def test_collection_sensor_keeps_recipes_out_of_attributes():
+    coordinator = _coordinator([Recipe(id="1", title="A", image="data:image/png;base64," + "A" * 1000)])
+    sensor = RecipeCardsCollectionSensor(coordinator, MagicMock(entry_id="e1"))
+    attributes = sensor.extra_state_attributes
+    assert "recipes" not in attributes
+    assert attributes["recipe_count"] == 1 and attributes["revision"] == 7
+    assert "color_counts" in RecipeCardsCollectionSensor._unrecorded_attributes
+    assert "ingredients" in RecipeSensor._unrecorded_attributes
+
+
+def test_recipe_sensor_writes_only_when_its_recipe_changes():
+    recipes = [Recipe(id="1", title="Soup"), Recipe(id="2", title="Cake")]
+    coordinator = _coordinator(recipes, {"1": 1, "2": 1})
+    sensor = RecipeSensor(coordinator, MagicMock(entry_id="e1"), "1")
+    sensor.async_write_ha_state = MagicMock()
+    assert sensor.name == "Recipe Soup"
+
+    # Another recipe changed
+    coordinator.data = _coordinator(recipes, {"1": 1, "2": 2}).data
+    sensor._handle_coordinator_update()
+    sensor.async_write_ha_state.assert_not_called()
+
+    coordinator.data = _coordinator([Recipe(id="1", title="Stew"), recipes[1]], {"1": 3, "2": 2}).data
+    sensor._handle_coordinator_update()
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.name == "Recipe Stew"
@@ -0,0 +1,79 @@
+import os
+import pytest
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.const import ENGINE_JSON, ENGINE_SQLITE
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.sqlite_backend import database_path, fts_query
+
+
+async def _sqlite_storage(hass):
+    storage = storage_mod.RecipeStorage(hass, "e1", engine=ENGINE_SQLITE)
+    await storage.async_load_recipes()
+    return storage
+
+
+def test_fts_query_quotes_terms():
+    assert fts_query('Tomato "soup" OR') == '"tomato"* AND "soup"* AND "or"*'
+    assert fts_query("  ") == ""
+
+
+@pytest.mark.asyncio
+async def test_persists_rows_in_order(loop_hass, dummy_store):
+    storage = await _sqlite_storage(loop_hass)
+    for rid in ("1", "2", "3"):
+        await storage.async_add_recipe(Recipe(id=rid, title=f"R{rid}"))
+    await storage.async_update_recipe("1", Recipe(id="1", title="R1b"))
+    await storage.async_delete_recipe("2")
+    await storage.async_close()
+
+    reloaded = await _sqlite_storage(loop_hass)
+    assert [(r.id, r.title) for r in reloaded.recipes] == [("1", "R1b"), ("3", "R3")]
+    await reloaded.async_close()
+
+
+@pytest.mark.asyncio
+async def test_search_is_ranked_and_filtered(loop_hass, dummy_store):
+    # Imported as stored, so the time columns keep these values
+    dummy_store.data = [
+        Recipe(id="1", title="Bread", ingredients=["tomato"], total_time=90).to_dict(),
+        Recipe(id="2", title="Tomato soup", description="Tomato tomato", total_time=20).to_dict(),
+    ]
+    storage = await _sqlite_storage(loop_hass)
+    await storage.async_add_recipe(Recipe(id="3", title="Pancakes", notes="Serve with tomatoes"))
+
+    # Unflushed edits are visible: search flushes first
+    found = [r.recipe.id for r in await storage.async_search("tomato")]
+    assert found[0] == "2" and sorted(found) == ["1", "2", "3"]
+    assert [r.recipe.id for r in await storage.async_search("tomato", max_time=30)] == ["2", "3"]
+    assert [r.recipe.id for r in await storage.async_search("tom sou")] == ["2"]
+    assert [r.recipe.id for r in await storage.async_search("")] == ["1", "2", "3"]
+    await storage.async_close()
+
+
+@pytest.mark.asyncio
+async def test_one_shot_import_and_migration_back(loop_hass, dummy_store):
+    dummy_store.data = [Recipe(id="1", title="From json").to_dict()]
+    storage = await _sqlite_storage(loop_hass)
+    assert [r.id for r in storage.recipes] == ["1"]
+    assert os.path.exists(database_path(loop_hass, "e1"))
+
+    await storage.async_add_recipe(Recipe(id="2", title="From sqlite"))
+    # The JSON store is not written by the sqlite engine...
+    assert [d["id"] for d in dummy_store.data] == ["1"]
+    # ...until the options flow hands the collection back to it
+    await storage.async_migrate_to(ENGINE_JSON)
+    assert [d["id"] for d in dummy_store.data] == ["1", "2"]
+    await storage.async_close()
+
+
+@pytest.mark.asyncio
+async def test_search_on_json_engine(loop_hass, dummy_store):
+    dummy_store.data = [
+        Recipe(id="1", title="Soup", description="Tomato", total_time=5).to_dict(),
+        Recipe(id="2", title="Cake").to_dict(),
+        Recipe(id="3", title="Stew", total_time=120).to_dict(),
+    ]
+    storage = storage_mod.RecipeStorage(loop_hass, "e1")
+    assert [r.recipe.id for r in await storage.async_search("tomato")] == ["1"]
+    # Recipes without a total time are not filtered out
+    assert [r.recipe.id for r in await storage.async_search("", max_time=10)] == ["1", "2"]
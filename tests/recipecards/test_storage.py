@@ -1,25 +1,11 @@
 import pytest
-from unittest.mock import MagicMock
+from custom_components.recipecards.backend import StorageBackend
 from custom_components.recipecards.storage import RecipeStorage
 from custom_components.recipecards.models import Recipe
 
-class DummyStore:
-    def __init__(self):
-        self.data = None
-    async def async_load(self):
-        return self.data
-    async def async_save(self, data):
-        self.data = data
-
 @pytest.fixture
-def storage():
-    hass = MagicMock()
-    dummy_store = DummyStore()
-    hass.data = {}
-    # Patch Store to use DummyStore
-    import custom_components.recipecards.storage as storage_mod
-    storage_mod.Store = lambda *a, **kw: dummy_store
-    return RecipeStorage(hass, "test_entry")
+def storage(mock_hass):
+    return RecipeStorage(mock_hass, "e1")
 
 @pytest.mark.asyncio
 async def test_crud(storage):
@@ -105,9 +91,9 @@ async def test_recipe_with_all_fields(storage):
     assert recipe.id == "complete-recipe"
     assert recipe.title == "Complete Recipe"
     assert recipe.description == "A complete recipe with all fields"
-    assert recipe.ingredients == ["ingredient 1", "ingredient 2", "ingredient 3"]
+    assert recipe.ingredients == ("ingredient 1", "ingredient 2", "ingredient 3")
     assert recipe.notes == "Important cooking notes"
-    assert recipe.instructions == ["step 1", "step 2", "step 3"]
+    assert recipe.instructions == ("step 1", "step 2", "step 3")
     assert recipe.color == "#FFD700"
 
 @pytest.mark.asyncio
@@ -138,4 +124,148 @@ async def test_multiple_operations_sequence(storage):
     final = await storage.async_load_recipes()
     assert len(final) == 2
     assert final[0].id == "2" and final[0].title == "Updated Recipe 2"
-    assert final[1].id == "3" 
+    assert final[1].id == "3"
+
+@pytest.mark.asyncio
+async def test_repeated_reads_load_store_once(storage, dummy_store):
+    dummy_store.data = [Recipe(id="1", title="A").to_dict()]
+    for _ in range(10):
+        recipes = await storage.async_load_recipes()
+        assert [r.id for r in recipes] == ["1"]
+    assert dummy_store.loads == 1
+
+@pytest.mark.asyncio
+async def test_mutations_use_cache_and_bump_revision(storage, dummy_store):
+    dummy_store.data = []
+    await storage.async_load_recipes()
+    rev = storage.revision
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    await storage.async_update_recipe("1", Recipe(id="1", title="A2"))
+    await storage.async_delete_recipe("1")
+    assert storage.revision == rev + 3
+    assert dummy_store.loads == 1
+    # Written through to the store
+    await storage.async_flush()
+    assert dummy_store.data == []
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_reload(storage, dummy_store):
+    dummy_store.data = [Recipe(id="1", title="A").to_dict()]
+    await storage.async_load_recipes()
+    dummy_store.data = [Recipe(id="2", title="B").to_dict()]
+    assert [r.id for r in await storage.async_load_recipes()] == ["1"]
+    storage.invalidate()
+    assert [r.id for r in await storage.async_load_recipes()] == ["2"]
+    assert dummy_store.loads == 2
+
+@pytest.mark.asyncio
+async def test_index_lookup_keeps_insertion_order(storage):
+    for rid in ("1", "2", "3"):
+        await storage.async_add_recipe(Recipe(id=rid, title=f"R{rid}"))
+    assert storage.contains("2")
+    assert storage.get("2").title == "R2"
+    assert storage.get("missing") is None
+    # Replace keeps position and forces the key's id onto the replacement
+    assert storage.replace("2", Recipe(id="other", title="R2b"))
+    assert [r.id for r in storage.recipes] == ["1", "2", "3"]
+    assert storage.get("2").title == "R2b"
+    assert not storage.replace("missing", Recipe(id="x", title="X"))
+    # Remove returns the dropped recipe
+    assert storage.remove("1").title == "R1"
+    assert storage.remove("1") is None
+    assert not storage.contains("1")
+    assert [r.id for r in storage.recipes] == ["2", "3"]
+
+@pytest.mark.asyncio
+async def test_mutations_coalesce_into_one_write(storage, dummy_store):
+    dummy_store.data = []
+    for rid in ("1", "2", "3"):
+        await storage.async_add_recipe(Recipe(id=rid, title=f"R{rid}"))
+    await storage.async_update_recipe("2", Recipe(id="2", title="R2b"))
+    await storage.async_delete_recipe("3")
+    assert dummy_store.saves == 0
+    assert storage.dirty
+    await dummy_store.fire_delayed()
+    assert dummy_store.saves == 1
+    assert [d["title"] for d in dummy_store.data] == ["R1", "R2b"]
+    assert not storage.dirty
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_changes_once(storage, dummy_store):
+    dummy_store.data = []
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    await storage.async_flush()
+    await storage.async_flush()
+    assert dummy_store.saves == 1
+    assert dummy_store.data[0]["id"] == "1"
+    # The superseded delayed write does not fire again
+    await dummy_store.fire_delayed()
+    assert dummy_store.saves == 1
+
+@pytest.mark.asyncio
+async def test_snapshot_fingerprints_track_changed_recipes(storage):
+    await storage.async_add_recipe(Recipe(id="1", title="A"))
+    await storage.async_add_recipe(Recipe(id="2", title="B"))
+    before = storage.snapshot()
+    await storage.async_update_recipe("2", Recipe(id="2", title="B2"))
+    after = storage.snapshot()
+    assert after.fingerprint("1") == before.fingerprint("1")
+    assert after.fingerprint("2") > before.fingerprint("2")
+    # Snapshots are not affected by later changes
+    assert before.get("2").title == "B" and [r.id for r in after] == ["1", "2"]
+    await storage.async_delete_recipe("1")
+    assert storage.snapshot().fingerprint("1") is None and len(storage.snapshot()) == 1
+
+
+@pytest.mark.asyncio
+async def test_edits_recompute_times_from_the_text(storage):
+    await storage.async_add_recipe(Recipe(id="1", title="Cake", instructions=["Prep 10 min", "Bake 30 minutes"]))
+    recipe = storage.get("1")
+    assert (recipe.prep_time, recipe.cook_time, recipe.total_time) == (10, 30, 40)
+
+    # Clients send the old times back with the edited text
+    edited = Recipe.from_dict({**recipe.to_dict(), "instructions": ["Prep 10 min", "Bake 20 minutes"]})
+    await storage.async_update_recipe("1", edited)
+    recipe = storage.get("1")
+    assert (recipe.prep_time, recipe.cook_time, recipe.total_time) == (10, 20, 30)
+
+    cleared = Recipe.from_dict({**recipe.to_dict(), "instructions": ["Mix", "Bake"]})
+    await storage.async_update_recipe("1", cleared)
+    recipe = storage.get("1")
+    assert (recipe.prep_time, recipe.cook_time, recipe.total_time) == (None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_imports_keep_given_times_over_the_text(storage):
+    # Structured durations win over times guessed from the instructions
+    imported = Recipe(id="1", title="Noodles", instructions=["Boil the noodles 8 minutes"], prep_time=10, cook_time=60, total_time=75)
+    await storage.async_add_recipe(imported, keep_times=True)
+    recipe = storage.get("1")
+    assert (recipe.prep_time, recipe.cook_time, recipe.total_time) == (10, 60, 75)
+
+    # The text only fills what the source left empty; a missing total is prep + cook
+    await storage.async_add_recipe(Recipe(id="2", title="Soup", instructions=["Simmer 20 minutes"], prep_time=5), keep_times=True)
+    recipe = storage.get("2")
+    assert (recipe.prep_time, recipe.cook_time, recipe.total_time) == (5, 20, 25)
+
+    await storage.async_add_recipe(Recipe(id="3", title="Salad", prep_time=5, total_time=5), keep_times=True)
+    recipe = storage.get("3")
+    assert (recipe.prep_time, recipe.cook_time, recipe.total_time) == (5, None, 5)
+
+
+def test_backend_missing_a_method_cannot_be_created():
+    class NoImport(StorageBackend):
+        dirty = False
+        async def async_load(self):
+            return None
+        def record_upsert(self, recipe):
+            pass
+        def record_delete(self, recipe_id):
+            pass
+        async def async_flush(self):
+            pass
+        async def async_save_all(self):
+            pass
+
+    with pytest.raises(TypeError, match="async_import"):
+        NoImport(list)
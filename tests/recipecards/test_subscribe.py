@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import MagicMock
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.api import async_subscribe_recipes
+from custom_components.recipecards.const import DOMAIN
+from custom_components.recipecards.models import Recipe
+
+
+@pytest.fixture
+def mock_hass(mock_hass, dummy_stores):
+    for entry_id in ("e1", "a", "b"):
+        dummy_stores[f"recipecards_{entry_id}.json"].data = [Recipe(id="1", title="Soup").to_dict()]
+    # Run dispatcher targets inline, as the event loop would
+    mock_hass.async_run_hass_job = lambda job, *args: job.target(*args)
+    return mock_hass
+
+
+def _connection():
+    connection = MagicMock()
+    connection.refresh_token_id = None
+    connection.subscriptions = {}
+    return connection
+
+
+def _events(connection):
+    return [call[0][0]["event"] for call in connection.send_message.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_then_deltas(mock_hass):
+    storage = storage_mod.RecipeStorage(mock_hass, "e1")
+    await storage.async_load_recipes()
+    mock_hass.data[DOMAIN]["e1"] = {"storage": storage}
+
+    connection = _connection()
+    async_subscribe_recipes(mock_hass, connection, {"id": 5, "type": "recipecards/subscribe", "fields": ["title"]})
+    connection.send_result.assert_called_once_with(5)
+    snapshot = _events(connection)[0]
+    assert snapshot == {
+        "type": "snapshot",
+        "recipes": [{"id": "1", "title": "Soup", "_entry_id": "e1"}],
+        "revisions": {"e1": storage.revision},
+    }
+
+    await storage.async_add_recipe(Recipe(id="2", title="Cake", instructions=["Bake"]))
+    await storage.async_update_recipe("2", Recipe(id="2", title="Cheesecake"))
+    await storage.async_delete_recipe("1")
+    added, updated, removed = _events(connection)[1:]
+    assert added == {"type": "added", "entry_id": "e1", "revision": snapshot["revisions"]["e1"] + 1,
+                     "recipe": {"id": "2", "title": "Cake", "_entry_id": "e1"}}
+    assert updated["type"] == "updated" and updated["recipe"]["title"] == "Cheesecake"
+    assert removed == {"type": "removed", "entry_id": "e1", "recipe_id": "1", "revision": added["revision"] + 2}
+
+    # Reloading the entry re-sends its recipes; unsubscribing stops events
+    await storage.async_load_recipes(force=True)
+    assert _events(connection)[-1]["type"] == "reset"
+    connection.subscriptions[5]()
+    await storage.async_add_recipe(Recipe(id="3", title="Pie"))
+    assert len(_events(connection)) == 5
+
+
+@pytest.mark.asyncio
+async def test_entry_filter(mock_hass):
+    storages = {}
+    for entry_id in ("a", "b"):
+        storages[entry_id] = storage_mod.RecipeStorage(mock_hass, entry_id)
+        await storages[entry_id].async_load_recipes()
+        mock_hass.data[DOMAIN][entry_id] = {"storage": storages[entry_id]}
+
+    connection = _connection()
+    async_subscribe_recipes(mock_hass, connection, {"id": 1, "type": "recipecards/subscribe", "entry_id": "b"})
+    assert _events(connection)[0]["revisions"] == {"b": storages["b"].revision}
+    await storages["a"].async_add_recipe(Recipe(id="x", title="X"))
+    await storages["b"].async_add_recipe(Recipe(id="y", title="Y"))
+    assert [e.get("recipe", {}).get("id") for e in _events(connection)[1:]] == ["y"]
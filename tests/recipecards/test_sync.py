@@ -0,0 +1,35 @@
+import pytest
+import custom_components.recipecards.storage as storage_mod
+from custom_components.recipecards.api import async_list_recipes
+from custom_components.recipecards.models import Recipe
+from .helpers import add_entry, call_command
+
+
+@pytest.mark.asyncio
+async def test_since_revision_unchanged_delta_and_snapshot(mock_hass, monkeypatch):
+    monkeypatch.setattr(storage_mod, "CHANGELOG_SIZE", 3)
+    storage_a = await add_entry(mock_hass, "a", ["A0", "A1"])
+    await add_entry(mock_hass, "b", ["B0"])
+
+    first = await call_command(async_list_recipes, mock_hass, since_revision=0, fields=["title"])
+    assert first["status"] == "snapshot"
+    assert [d["id"] for d in first["recipes"]] == ["a-0", "a-1", "b-0"]
+    revision = first["revision"]
+    assert await call_command(async_list_recipes, mock_hass, since_revision=revision) == {"status": "unchanged", "revision": revision}
+
+    await storage_a.async_update_recipe("a-0", Recipe(id="a-0", title="A0b"))
+    await storage_a.async_delete_recipe("a-1")
+    delta = await call_command(async_list_recipes, mock_hass, since_revision=revision, fields=["title"])
+    assert delta["status"] == "delta" and delta["revision"] > revision
+    assert delta["recipes"] == [{"id": "a-0", "title": "A0b", "_entry_id": "a"}]
+    assert delta["removed"] == ["a-1"]
+
+    # Older than what the bounded changelog remembers
+    for i in range(3):
+        await storage_a.async_add_recipe(Recipe(id=f"new-{i}", title="New"))
+    assert (await call_command(async_list_recipes, mock_hass, since_revision=revision))["status"] == "snapshot"
+    # Reloading a collection also forces a snapshot
+    latest = (await call_command(async_list_recipes, mock_hass, since_revision=0))["revision"]
+    await storage_a.async_load_recipes(force=True)
+    assert (await call_command(async_list_recipes, mock_hass, since_revision=latest))["status"] == "snapshot"
+    assert (await call_command(async_list_recipes, mock_hass, since_revision=0, limit=5))[1] == "invalid_format"
@@ -0,0 +1,62 @@
+import pytest
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.times import RecipeTimes, extract_times, extract_times_batch, parse_duration
+
+# text -> (prep, cook, rest, total)
+GOLDEN = [
+    ("Prep time: 15 min\nCook time: 1 hr 30 min", (15, 90, None, 105)),
+    ("Prep: 10 mins | Cook: 1h30", (10, 90, None, 100)),
+    ("Preparation 20 minutes. Cooking 40 minutes.", (20, 40, None, 60)),
+    ("Total time: PT1H30M", (None, None, None, 90)),
+    ("Ready in 45 minutes", (None, None, None, 45)),
+    ("Overall 2 hours", (None, None, None, 120)),
+    ("Bake for 20–25 min or until golden, about 30 min.", (None, 25, None, None)),
+    ("Bake for 20-25 minutes", (None, 25, None, None)),
+    ("Roast 1 to 2 hours", (None, 120, None, None)),
+    ("Simmer for 1½ hours", (None, 90, None, None)),
+    ("Simmer for 1 ½ hours", (None, 90, None, None)),
+    ("Rest the dough for 1 1/2 hours", (None, None, 90, None)),
+    ("Chill for half an hour", (None, None, 30, None)),
+    ("Boil for ¾ hour", (None, 45, None, None)),
+    ("Let it stand for five minutes", (None, None, 5, None)),
+    ("Fry for 90 seconds", (None, 2, None, None)),
+    ("Cook 1 hour and 15 minutes", (None, 75, None, None)),
+    ("Cook 1 hr. 30 min", (None, 90, None, None)),
+    ("Grill 2.5 hrs", (None, 150, None, None)),
+    ("Cook pasta 10 minutes, drain.\nThen bake 25 minutes.", (None, 35, None, None)),
+    ("Cook time: 40 min\nBake for 25 minutes", (None, 40, None, None)),
+    ("Prep 10 mins. Cook 20 minutes. Rest 5 minutes.", (10, 20, 5, 35)),
+    ("Prep 10 mins. Cook 20 minutes. Total time 45 minutes", (10, 20, None, 45)),
+    ("Whisk for 2 minutes. Bake 30 minutes.", (None, 30, None, None)),
+    ("Preheat the oven to 200C. Mix 2 cups flour.", (None, None, None, None)),
+    ("Add 500 g precooked rice and 2 cookies", (None, None, None, None)),
+    ("Marinate overnight", (None, None, None, None)),
+    ("", (None, None, None, None)),
+]
+
+
+@pytest.mark.parametrize("text,expected", GOLDEN)
+def test_golden_phrases(text, expected):
+    times = extract_times(text)
+    assert (times.prep, times.cook, times.rest, times.total) == expected
+
+
+def test_batch_matches_single_calls():
+    texts = [text for text, _ in GOLDEN] * 2 + [None]
+    assert extract_times_batch(texts) == [extract_times(t) for t in texts]
+    assert extract_times_batch([]) == []
+
+
+def test_recipe_parse_times_keeps_its_keys():
+    assert Recipe.parse_times("Prep 5 min. Bake 20 min") == {"prep_time": 5, "cook_time": 20, "total_time": 25}
+    assert Recipe.parse_times("Serve warm") == {"prep_time": None, "cook_time": None, "total_time": None}
+    assert RecipeTimes().as_recipe_fields() == Recipe.parse_times("")
+
+
+def test_parse_duration_values():
+    assert parse_duration("20–25 min") == 25
+    assert parse_duration("1h30") == 90
+    assert parse_duration("½ hour") == 30
+    assert parse_duration(15.0) == 15
+    assert parse_duration(-1) is None
+    assert parse_duration(True) is None
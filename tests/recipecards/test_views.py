@@ -0,0 +1,128 @@
+import base64
+import gzip
+import json
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from custom_components.recipecards.const import DOMAIN
+from custom_components.recipecards.images import (
+    ImageStore,
+    display_image,
+    image_id_from_ref,
+    make_ref,
+    ref_from_image_url,
+)
+from custom_components.recipecards.importer import recipe_from_object
+from custom_components.recipecards.models import Recipe
+from custom_components.recipecards.storage import RecipeStorage
+from custom_components.recipecards.views import RecipeExportView, RecipeImageView
+
+PNG = b"\x89PNG\r\n\x1a\nfake-png-bytes"
+DATA_URL = "data:image/png;base64," + base64.b64encode(PNG).decode()
+
+
+@pytest.fixture
+def images(mock_hass):
+    images = mock_hass.data[DOMAIN]["images"] = ImageStore(mock_hass)
+    return images
+
+
+def _request(hass, path, headers=None):
+    return make_mocked_request("GET", path, headers=headers or {}, app={"hass": hass})
+
+
+async def _store_image(hass):
+    ref = await hass.data[DOMAIN]["images"].async_put_data_url(DATA_URL)
+    return image_id_from_ref(ref)
+
+
+@pytest.mark.asyncio
+async def test_serves_bytes_with_cache_headers(mock_hass, images):
+    image_id = await _store_image(mock_hass)
+    resp = await RecipeImageView().get(_request(mock_hass, f"/api/recipecards/image/{image_id}"), image_id)
+    assert resp.status == 200
+    assert resp.body == PNG
+    assert resp.content_type == "image/png"
+    assert resp.headers["ETag"] == f'"{image_id}"'
+    assert "immutable" in resp.headers["Cache-Control"]
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_returns_304(mock_hass, images):
+    image_id = await _store_image(mock_hass)
+    req = _request(mock_hass, f"/api/recipecards/image/{image_id}", {"If-None-Match": f'W/"{image_id}"'})
+    resp = await RecipeImageView().get(req, image_id)
+    assert resp.status == 304
+    assert resp.body is None
+
+
+@pytest.mark.asyncio
+async def test_variants_and_errors(mock_hass, images):
+    image_id = await _store_image(mock_hass)
+    view = RecipeImageView()
+    # Undecodable by Pillow (or Pillow missing): the original bytes are served
+    resp = await view.get(_request(mock_hass, f"/api/recipecards/image/{image_id}?size=thumb"), image_id)
+    assert resp.status == 200
+    assert resp.headers["ETag"] == f'"{image_id}-thumb"'
+    resp = await view.get(_request(mock_hass, f"/api/recipecards/image/{image_id}?size=huge"), image_id)
+    assert resp.status == 400
+    resp = await view.get(_request(mock_hass, "/api/recipecards/image/nope"), "nope")
+    assert resp.status == 404
+    missing = "0" * 64
+    resp = await view.get(_request(mock_hass, f"/api/recipecards/image/{missing}"), missing)
+    assert resp.status == 404
+
+
+def test_image_url_round_trip():
+    ref = make_ref("ab" * 32)
+    url = display_image(ref)
+    assert url == "/api/recipecards/image/" + "ab" * 32
+    assert ref_from_image_url(url + "?authSig=xyz") == ref
+    assert ref_from_image_url("https://ha.local:8123" + url) == ref
+    assert ref_from_image_url("https://example.com/cake.png") is None
+    assert display_image("https://example.com/cake.png") == "https://example.com/cake.png"
+
+
+async def _export(hass, query):
+    # Streaming responses need a real application for its prepare signal
+    app = web.Application()
+    app["hass"] = hass
+    app.on_response_prepare.freeze()
+    req = make_mocked_request("GET", f"/api/recipecards/export?{query}", app=app)
+    resp = await RecipeExportView().get(req)
+    writes = [c[0][0] for c in req._payload_writer.write.call_args_list]
+    return resp, writes
+
+
+@pytest.mark.asyncio
+async def test_export_streams_chunks(mock_hass, images, monkeypatch):
+    import custom_components.recipecards.exporter as exporter
+
+    monkeypatch.setattr(exporter, "EXPORT_CHUNK_SIZE", 2)
+    storage = RecipeStorage(mock_hass, "e1", images=images)
+    await storage.async_add_recipe(Recipe(id="1", title="Cake", image=DATA_URL, notes="Prep time: 1 hr 30 min", instructions=["Cool first"]))
+    for i in (2, 3):
+        await storage.async_add_recipe(Recipe(id=str(i), title=f"R{i}", instructions=["Mix"]))
+    mock_hass.data[DOMAIN]["e1"] = {"storage": storage}
+
+    resp, writes = await _export(mock_hass, "format=ndjson")
+    assert resp.headers["Content-Type"] == "application/x-ndjson"
+    # One write per chunk of recipes
+    assert len(writes) == 2
+    lines = [json.loads(line) for line in b"".join(writes).splitlines()]
+    assert [d["id"] for d in lines] == ["1", "2", "3"]
+    assert lines[0]["image"].startswith("/api/recipecards/image/") and lines[0]["_entry_id"] == "e1"
+
+    resp, writes = await _export(mock_hass, "format=jsonld&images=inline&gzip=1")
+    assert resp.headers["Content-Type"] == "application/gzip"
+    nodes = json.loads(gzip.decompress(b"".join(writes)))
+    assert nodes[0]["image"] == DATA_URL and nodes[0]["prepTime"] == "PT1H30M"
+    # JSON-LD exports import back
+    recipe = recipe_from_object(nodes[0])
+    assert (recipe.title, recipe.instructions, recipe.prep_time) == ("Cake", ("Cool first",), 90)
+    assert recipe_from_object(nodes[1]).instructions == ("Mix",)
+
+    resp, _ = await _export(mock_hass, "entry_id=missing")
+    assert resp.status == 404
+    resp, _ = await _export(mock_hass, "format=csv")
+    assert resp.status == 400